@@ -32,6 +32,14 @@ a = Analysis(
         ('src/vagiletta_programmer_class.py', '.'),
         ('src/exceptions_logger.py', '.'),
         ('src/utils.py', '.'),
+        ('src/rx_ring_buffer.py', '.'),
+        ('src/replay_bus.py', '.'),
+        ('src/tx_scheduler.py', '.'),
+        ('src/rx_table_model.py', '.'),
+        ('src/rx_statistics.py', '.'),
+        ('src/rx_timeout.py', '.'),
+        ('src/rx_logger.py', '.'),
+        ('src/rx_capture.py', '.'),
         ('src/PCANBasic.py', '.'),
         ('VERSION', '.'),
         ('resources/figures/dii_logo.png', 'resources/figures'),
@@ -39,7 +47,7 @@ a = Analysis(
         ('resources/figures/CANinoApp_banner_background.png', 'resources/figures'),
         ('resources/figures/arduino_uno.png', 'resources/figures'),
     ],
-    hiddenimports=['can.interfaces.pcan'],
+    hiddenimports=['can.interfaces.pcan', 'can.interfaces.virtual'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
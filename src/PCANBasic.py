@@ -32,11 +32,13 @@ from ctypes import (
     byref,
     sizeof,
     create_string_buffer,
-    windll,
     cdll,
 )
 import platform
 
+if platform.system() == "Windows":
+    from ctypes import windll
+
 # ///////////////////////////////////////////////////////////
 # Type definitions
 # ///////////////////////////////////////////////////////////
@@ -22,25 +22,129 @@ import can
 import threading
 import sys
 from typing import Callable, Optional
-from src.PCANBasic import PCANBasic, PCAN_ERROR_OK, PCAN_ATTACHED_CHANNELS, PCAN_NONEBUS
 from src.exceptions_logger import log_exception
+from src.utils import bus_time
+
+# Numero massimo di frame consegnati in un singolo batch RX
+RX_BATCH_MAX_FRAMES = 1024
+# Scarto massimo da bus_time() di un clock hardware già su base epoca; oltre
+# viene ribasato (es. PCAN senza uptime: secondi dall'avvio del PC)
+HW_CLOCK_EPOCH_TOLERANCE_S = 60.0
+
+# Backend selezionabili: chiave -> etichetta mostrata nella GUI
+BUS_BACKENDS = {
+    "pcan": "PCAN-USB",
+    "virtual": "Virtual",
+    "socketcan": "SocketCAN",
+    "replay": "Replay",
+}
+DEFAULT_BUS_BACKEND = "pcan"
+
+CAN_SFF_MASK = 0x7FF  # ID standard 11 bit
+CAN_EFF_MASK = 0x1FFFFFFF  # ID esteso 29 bit
+
+_ZERO_PAD = bytes(64)  # padding dei payload TX più corti del DLC
+
+# Canali del bus virtuale in-process (python-can "virtual")
+VIRTUAL_CHANNEL_COUNT = 4
+VIRTUAL_CHANNEL_PREFIX = "canino_virtual_"
+
+
+def merge_acceptance_filters(filters: list[dict], extended: bool, full_mask: int):
+    """
+    Merges the filters of one ID type into a single (code, care_mask) pair that
+    accepts at least every frame accepted by the filters. Without filters of
+    that type, only the highest ID is let through.
+    """
+    selected = [
+        f
+        for f in filters
+        if bool(f.get("extended", f["can_id"] > CAN_SFF_MASK)) == extended
+    ]
+    if not filters:
+        return 0, 0  # nessun filtro: tutto accettato
+    if not selected:
+        return full_mask, full_mask
+    care = full_mask
+    first_id = selected[0]["can_id"]
+    for f in selected:
+        care &= f["can_mask"]
+        care &= ~(f["can_id"] ^ first_id)  # bit su cui i filtri non concordano
+    return first_id & care, care
+
+
+def parse_filter_text(text: str) -> list[dict]:
+    """
+    Parses a filter list such as "100, 200/7F0, 18FEF100x" (hex IDs, optional
+    /mask, 'x' suffix or ID above 0x7FF for extended IDs) into python-can filters.
+    """
+    filters = []
+    for token in text.replace(";", ",").replace(" ", ",").split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        id_part, _, mask_part = token.partition("/")
+        extended = id_part.endswith("x")
+        id_part = id_part.rstrip("x")
+        can_id = int(id_part, 16)
+        extended = extended or can_id > CAN_SFF_MASK
+        full_mask = CAN_EFF_MASK if extended else CAN_SFF_MASK
+        can_mask = int(mask_part, 16) if mask_part else full_mask
+        if can_id > full_mask or can_mask > full_mask:
+            raise ValueError(f"Invalid filter: {token}")
+        filters.append({"can_id": can_id, "can_mask": can_mask, "extended": extended})
+    return filters
+
+
+def format_filter_text(filters: list[dict]) -> str:
+    parts = []
+    for f in filters:
+        extended = f.get("extended", False)
+        full_mask = CAN_EFF_MASK if extended else CAN_SFF_MASK
+        text = f"{f['can_id']:X}" + ("x" if extended else "")
+        if f["can_mask"] != full_mask:
+            text += f"/{f['can_mask']:X}"
+        parts.append(text)
+    return ", ".join(parts)
 
 
 class CANInterface:
-    def __init__(self, channel: str, timing: "500000", is_fd=False):
+    def __init__(
+        self,
+        channel: str,
+        timing: "500000",
+        is_fd=False,
+        backend: str = DEFAULT_BUS_BACKEND,
+    ):
+        if backend not in BUS_BACKENDS:
+            raise ValueError(f"Unknown CAN backend: {backend}")
         self.channel = channel
         self.timing = timing  # must be valid both if CAN or CANFD
         self.is_fd = is_fd
+        self.backend = backend
+        # Filtri di accettazione in formato python-can (can_id, can_mask, extended)
+        self.can_filters: list[dict] = []
+        self._filter_exact_ids: frozenset = frozenset()  # (id, extended) a maschera piena
+        self._filter_masks: list[tuple[int, int, bool]] = []  # filtri a maschera parziale
+        self._software_filter = False  # True se il receive loop deve filtrare
+        # Messaggi TX già validati, riusati ad ogni invio: (id, dlc, fd, ext) -> Message
+        self._prepared_frames: dict[tuple, can.Message] = {}
+        # Task ciclici python-can per gli ID a payload statico: id -> (task, Message)
+        self._cyclic_tasks: dict[int, tuple] = {}
         self.bus = None
         self.receive_thread = None
         self.running = False
+        self._hw_clock_offset = None  # clock hardware -> bus_time(), per connessione
         self.receive_callback: Optional[Callable[[int, bytes], None]] = None
+        self.receive_batch_callback: Optional[
+            Callable[[list[can.Message]], None]
+        ] = None
 
         self.open_bus()
 
-    def open_bus(self):
-        try:
-            self.bus = can.Bus(
+    def _create_bus(self) -> can.BusABC:
+        if self.backend == "pcan":
+            return can.Bus(
                 channel=self.channel,
                 interface="pcan",
                 timing=self.timing,
@@ -48,6 +152,30 @@ class CANInterface:
                 auto_reset=True,
                 receive_own_messages=False,
             )
+        if self.backend == "virtual":
+            return can.Bus(
+                channel=self.channel,
+                interface="virtual",
+                receive_own_messages=False,
+            )
+        if self.backend == "socketcan":
+            # Il bitrate di SocketCAN è configurato dal sistema (ip link)
+            return can.Bus(
+                channel=self.channel,
+                interface="socketcan",
+                fd=self.is_fd,
+                receive_own_messages=False,
+            )
+        # replay: il canale è il percorso del file di log
+        from src.replay_bus import ReplayBus
+
+        return ReplayBus(channel=self.channel)
+
+    def open_bus(self):
+        try:
+            self.bus = self._create_bus()
+            self._apply_filters()
+            self._hw_clock_offset = None
 
             self.running = True
             self.receive_thread = threading.Thread(
@@ -57,7 +185,51 @@ class CANInterface:
         except Exception as e:
             log_exception(__file__, sys._getframe().f_lineno, e)
 
+    def prepare_frame(
+        self, frame_id: int, dlc: int, is_fd: bool = False, is_extended: bool = False
+    ) -> can.Message:
+        """
+        Validates and builds once a reusable TX message for an ID. The returned
+        message owns a fixed-size bytearray payload, updated in place by
+        send_prepared() on every transmission.
+        """
+        key = (frame_id, dlc, is_fd, is_extended)
+        msg = self._prepared_frames.get(key)
+        if msg is None:
+            msg = can.Message(
+                arbitration_id=frame_id,
+                data=bytearray(dlc),
+                is_extended_id=is_extended,
+                dlc=dlc,
+                is_fd=is_fd,
+                bitrate_switch=is_fd,
+                check=True,
+            )
+            self._prepared_frames[key] = msg
+        return msg
+
+    def send_prepared(self, msg: can.Message, data=None):
+        """
+        Sends a message built by prepare_frame(), copying data (if given) into
+        its payload: shorter payloads are zero padded, longer ones truncated.
+        """
+        if data is not None:
+            payload = msg.data
+            dlc = len(payload)
+            size = len(data)
+            if size >= dlc:
+                payload[:] = data[:dlc] if size > dlc else data
+            else:
+                payload[:size] = data
+                payload[size:] = _ZERO_PAD[: dlc - size]
+        self.bus.send(msg)
+
     def send_frame(self, frame_id, data, dlc=None, is_fd=False):
+        """
+        One-off send: looks the prepared message up on every call. Periodic
+        senders (the TX scheduler jobs) keep the message returned by
+        prepare_frame() and call send_prepared() directly.
+        """
         try:
             if self.bus is None:
                 print("[ERROR] CAN bus not initialized. Cannot send frame.")
@@ -66,23 +238,10 @@ class CANInterface:
             # CAN-FD: dlc può essere fino a 64, CAN classico fino a 8
             if dlc is None:
                 dlc = len(data)
-            if not isinstance(data, (bytes, bytearray)):
-                data = bytes(data)
-            if len(data) < dlc:
-                data = data + bytes([0x00] * (dlc - len(data)))
-            elif len(data) > dlc:
-                data = data[:dlc]
-
-            msg = can.Message(
-                arbitration_id=frame_id,
-                data=data,
-                is_extended_id=False,
-                dlc=dlc,
-                is_fd=is_fd,
-                bitrate_switch=is_fd,
-                check=True,
-            )
-            self.bus.send(msg)
+            msg = self._prepared_frames.get((frame_id, dlc, is_fd, False))
+            if msg is None:
+                msg = self.prepare_frame(frame_id, dlc, is_fd)
+            self.send_prepared(msg, data)
 
         except Exception as e:
             log_exception(__file__, sys._getframe().f_lineno, e)
@@ -91,23 +250,210 @@ class CANInterface:
         while self.running:
             try:
                 if self.bus is not None:
+                    # Attende il primo frame, poi drena senza bloccare tutti quelli già in coda
                     msg = self.bus.recv(1.0)
-                    if msg and self.receive_callback:
-                        self.receive_callback(
-                            msg.arbitration_id, msg.data, msg.dlc, msg.is_fd
-                        )
+                    if msg is None:
+                        continue
+                    batch = [msg]
+                    while len(batch) < RX_BATCH_MAX_FRAMES:
+                        msg = self.bus.recv(0)
+                        if msg is None:
+                            break
+                        batch.append(msg)
+                    if self._software_filter:
+                        batch = [m for m in batch if self._accepts(m)]
+                        if not batch:
+                            continue
+                    self._stamp_batch(batch)
+                    self._dispatch_batch(batch)
             except Exception as e:
                 log_exception(__file__, sys._getframe().f_lineno, e)
 
+    def set_filters(self, filters: Optional[list[dict]]):
+        """
+        Sets the RX acceptance filters (python-can format: can_id, can_mask,
+        extended). An empty list accepts every frame.
+        """
+        self.can_filters = list(filters or [])
+        exact = set()
+        masks = []
+        for f in self.can_filters:
+            extended = bool(f.get("extended", f["can_id"] > CAN_SFF_MASK))
+            full_mask = CAN_EFF_MASK if extended else CAN_SFF_MASK
+            if f["can_mask"] & full_mask == full_mask:
+                exact.add((f["can_id"] & full_mask, extended))
+            else:
+                masks.append((f["can_id"] & f["can_mask"], f["can_mask"], extended))
+        self._filter_exact_ids = frozenset(exact)
+        self._filter_masks = masks
+        if self.bus is not None:
+            self._apply_filters()
+
+    def _apply_filters(self):
+        filters = self.can_filters or None
+        try:
+            if self.backend == "socketcan":
+                # Filtri applicati nel kernel (CAN_RAW_FILTER): nessun residuo in Python
+                self.bus.set_filters(filters)
+                self._software_filter = False
+                return
+            if self.backend == "pcan":
+                self._apply_pcan_acceptance_filter()
+        except Exception as e:
+            log_exception(__file__, sys._getframe().f_lineno, e)
+        # Filtro esatto residuo nel receive loop (lookup su set per gli ID esatti)
+        self._software_filter = bool(self.can_filters)
+
+    def _apply_pcan_acceptance_filter(self):
+        # Il filtro hardware PCAN accetta un solo codice/maschera per tipo di ID:
+        # si programma il più stretto superset dei filtri richiesti, il resto
+        # viene scartato dal filtro esatto nel receive loop.
+        from can.interfaces.pcan.basic import (
+            PCAN_ACCEPTANCE_FILTER_11BIT,
+            PCAN_ACCEPTANCE_FILTER_29BIT,
+        )
+
+        pcan = self.bus.m_objPCANBasic
+        handle = self.bus.m_PcanHandle
+        for extended, parameter, full_mask in (
+            (False, PCAN_ACCEPTANCE_FILTER_11BIT, CAN_SFF_MASK),
+            (True, PCAN_ACCEPTANCE_FILTER_29BIT, CAN_EFF_MASK),
+        ):
+            code, care = merge_acceptance_filters(
+                self.can_filters, extended, full_mask
+            )
+            # PCAN: 32 bit alti = codice, 32 bit bassi = maschera (bit a 1 = don't care)
+            pcan.SetValue(handle, parameter, (code << 32) | (~care & full_mask))
+
+    def _accepts(self, msg: can.Message) -> bool:
+        key = (msg.arbitration_id, msg.is_extended_id)
+        if key in self._filter_exact_ids:
+            return True
+        for can_id, can_mask, extended in self._filter_masks:
+            if (
+                extended == msg.is_extended_id
+                and msg.arbitration_id & can_mask == can_id
+            ):
+                return True
+        return False
+
+    def _stamp_batch(self, batch: list[can.Message]):
+        # I timestamp hardware vengono portati sulla base di bus_time() con un
+        # offset fissato al primo frame della connessione: i periodi restano
+        # quelli del clock hardware. PCAN è su base epoca solo se è installato
+        # il pacchetto opzionale uptime, altrimenti conta dall'avvio del PC.
+        # I driver senza timestamp ricevono un unico istante per tutto il batch
+        offset = self._hw_clock_offset
+        fallback = None
+        for msg in batch:
+            if not msg.timestamp:
+                if fallback is None:
+                    fallback = bus_time()
+                msg.timestamp = fallback
+                continue
+            if offset is None:
+                offset = bus_time() - msg.timestamp
+                if abs(offset) < HW_CLOCK_EPOCH_TOLERANCE_S:
+                    offset = 0.0  # clock già su base epoca (virtual, socketcan)
+                self._hw_clock_offset = offset
+            if offset:
+                msg.timestamp += offset
+
+    def _dispatch_batch(self, batch: list[can.Message]):
+        batch_callback = self.receive_batch_callback
+        if batch_callback is not None:
+            batch_callback(batch)
+            return
+
+        # Compatibility shim: consegna frame per frame
+        callback = self.receive_callback
+        if callback is not None:
+            for msg in batch:
+                callback(msg.arbitration_id, msg.data, msg.dlc, msg.is_fd)
+
     def set_receive_callback(self, callback: Optional[Callable[[int, bytes], None]]):
+        """Per-frame callback(frame_id, data, dlc, is_fd), used when no batch callback is set."""
         self.receive_callback = callback
-        self.receive_callback = callback
+
+    def set_receive_batch_callback(
+        self, callback: Optional[Callable[[list[can.Message]], None]]
+    ):
+        """Batch callback receiving every frame drained from the bus on each wakeup."""
+        self.receive_batch_callback = callback
+
+    def start_cyclic(self, frame_id, data, dlc, period_ms, is_fd=False):
+        """
+        Hands a fixed-payload ID to a python-can cyclic task (kernel BCM on
+        SocketCAN, python-can's own timing thread otherwise), replacing any
+        task already running for the same ID.
+        """
+        self.stop_cyclic(frame_id)
+        msg = can.Message(
+            arbitration_id=frame_id,
+            data=self._padded(data, dlc),
+            is_extended_id=False,
+            dlc=dlc,
+            is_fd=is_fd,
+            bitrate_switch=is_fd,
+            check=True,
+        )
+        task = self.bus.send_periodic(msg, period_ms / 1000.0)
+        self._cyclic_tasks[frame_id] = (task, msg)
+        return task
+
+    def modify_cyclic(self, frame_id, data) -> bool:
+        """Updates the payload of a running cyclic task, returns False if none."""
+        entry = self._cyclic_tasks.get(frame_id)
+        if entry is None:
+            return False
+        task, msg = entry
+        new_msg = can.Message(
+            arbitration_id=msg.arbitration_id,
+            data=self._padded(data, msg.dlc),
+            is_extended_id=msg.is_extended_id,
+            dlc=msg.dlc,
+            is_fd=msg.is_fd,
+            bitrate_switch=msg.bitrate_switch,
+        )
+        task.modify_data(new_msg)
+        self._cyclic_tasks[frame_id] = (task, new_msg)
+        return True
+
+    def set_cyclic_period(self, frame_id, period_ms) -> bool:
+        """Restarts a cyclic task with a new period, returns False if none."""
+        entry = self._cyclic_tasks.get(frame_id)
+        if entry is None:
+            return False
+        _, msg = entry
+        self.start_cyclic(frame_id, msg.data, msg.dlc, period_ms, msg.is_fd)
+        return True
+
+    def is_cyclic(self, frame_id) -> bool:
+        return frame_id in self._cyclic_tasks
+
+    def stop_cyclic(self, frame_id):
+        entry = self._cyclic_tasks.pop(frame_id, None)
+        if entry is not None:
+            try:
+                entry[0].stop()
+            except Exception as e:
+                log_exception(__file__, sys._getframe().f_lineno, e)
+
+    def stop_all_cyclic(self):
+        for frame_id in list(self._cyclic_tasks):
+            self.stop_cyclic(frame_id)
+
+    @staticmethod
+    def _padded(data, dlc) -> bytes:
+        data = bytes(data[:dlc])
+        return data + _ZERO_PAD[: dlc - len(data)]
 
     def close(self):
         self.running = False
         if self.receive_thread:
             self.receive_thread.join(timeout=2)
         if self.bus:
+            self.stop_all_cyclic()
             self.bus.shutdown()
             self.bus = None
 
@@ -115,10 +461,47 @@ class CANInterface:
         self.close()
 
     @staticmethod
-    def get_available_channels() -> list[tuple[str, int]]:
+    def get_available_channels(
+        backend: str = DEFAULT_BUS_BACKEND,
+    ) -> list[tuple[str, object]]:
+        if backend == "pcan":
+            return CANInterface._get_pcan_channels()
+        if backend == "virtual":
+            return [
+                (f"Virtual {i}", f"{VIRTUAL_CHANNEL_PREFIX}{i}")
+                for i in range(VIRTUAL_CHANNEL_COUNT)
+            ]
+        if backend == "socketcan":
+            try:
+                configs = can.detect_available_configs(interfaces=["socketcan"])
+            except Exception as e:
+                log_exception(__file__, sys._getframe().f_lineno, e)
+                return []
+            return [(cfg["channel"], cfg["channel"]) for cfg in configs]
+        if backend == "replay":
+            # Il file da riprodurre viene scelto alla connessione
+            return [("Log file (select on Connect)", "")]
+        return []
+
+    @staticmethod
+    def _get_pcan_channels() -> list[tuple[str, int]]:
+        # Import locale: la DLL PCAN serve solo per questo backend
+        from src.PCANBasic import (
+            PCANBasic,
+            PCAN_ERROR_OK,
+            PCAN_ATTACHED_CHANNELS,
+            PCAN_NONEBUS,
+        )
+
         pcan = PCANBasic()
         available = []
-        status, channels_info = pcan.GetValue(PCAN_NONEBUS, PCAN_ATTACHED_CHANNELS)
+        try:
+            status, channels_info = pcan.GetValue(
+                PCAN_NONEBUS, PCAN_ATTACHED_CHANNELS
+            )
+        except Exception as e:  # DLL/driver PCAN non disponibile
+            log_exception(__file__, sys._getframe().f_lineno, e)
+            return available
         if status == PCAN_ERROR_OK:
             for ch in channels_info:
                 if ch.device_type == 0x05:  # PCAN_USB
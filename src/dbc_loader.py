@@ -22,7 +22,10 @@ import cantools
 import cantools.database
 from cantools.database.can.message import Message
 
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Optional
+
+from src.rx_statistics import rx_key
 
 
 class DBCSignal:
@@ -59,12 +62,51 @@ class DBCMessage:
         cycle_time: int | None,
         signals: list["DBCSignal"],
         payload_length: int,
+        is_extended_frame: bool = False,
     ):
         self.frame_id = frame_id
         self.name = name
         self.cycle_time = cycle_time
         self.signals = signals
         self.payload_length = payload_length  # lunghezza in byte del payload
+        self.is_extended_frame = is_extended_frame  # ID a 29 bit
+
+
+class DBCMessageInfo(NamedTuple):
+    """Immutable per-ID metadata read by the RX table and the loggers."""
+
+    name: str
+    length: int
+    signals: tuple
+    is_extended_frame: bool
+    cycle_time: Optional[int] = None  # periodo di invio atteso in ms
+
+
+# Indice vuoto condiviso, usato quando non è caricata nessuna DBC
+EMPTY_MESSAGE_INDEX: Mapping[int, DBCMessageInfo] = MappingProxyType({})
+
+
+def build_message_index(dbc) -> Mapping[int, DBCMessageInfo]:
+    """
+    Builds the read-only ID key -> DBCMessageInfo lookup of a loaded DBC,
+    keyed like the RX store (rx_key()), so a standard and an extended frame
+    with the same numeric ID stay distinct. Unknown IDs are a plain dict miss
+    instead of a cantools exception.
+    """
+    if not dbc or not getattr(dbc, "messages", None):
+        return EMPTY_MESSAGE_INDEX
+    return MappingProxyType(
+        {
+            rx_key(msg.frame_id, msg.is_extended_frame): DBCMessageInfo(
+                msg.name,
+                msg.payload_length,
+                tuple(msg.signals),
+                msg.is_extended_frame,
+                getattr(msg, "cycle_time", None),
+            )
+            for msg in dbc.messages
+        }
+    )
 
 
 class DBCLoader:
@@ -106,7 +148,14 @@ class DBCLoader:
 
             payload_len = msg.length  # <-- Ecco la lunghezza del payload
             self.messages.append(
-                DBCMessage(msg.frame_id, msg.name, cycle, signals, payload_len)
+                DBCMessage(
+                    msg.frame_id,
+                    msg.name,
+                    cycle,
+                    signals,
+                    payload_len,
+                    msg.is_extended_frame,
+                )
             )
 
 
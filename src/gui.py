@@ -32,7 +32,7 @@ from PySide6.QtWidgets import (
     QGroupBox,
     QTreeWidget,
     QTreeWidgetItem,
-    QSpinBox,
+    QDoubleSpinBox,
     QFileDialog,
     QMessageBox,
     QInputDialog,
@@ -49,17 +49,32 @@ from PySide6.QtCore import Qt, QTimer
 import json
 import os
 import sys
+import threading
 import time
 import re
 import can
 
 from src.dbc_loader import load_dbc
-from src.can_interface import CANInterface
+from src.can_interface import (
+    CANInterface,
+    BUS_BACKENDS,
+    parse_filter_text,
+    format_filter_text,
+)
 from src.exceptions_logger import log_exception, __version__
 from src.xmetro_class import XMetroWindow
 from src.vagiletta_programmer_class import VagilettaWindow
-from src.received_frames_class import ReceivedFramesWindow
+from src.received_frames_class import ReceivedFramesWindow, frame_bits
+from src.rx_timeout import RX_TIMEOUT_FACTOR
+from src.rx_logger import RX_LOG_SEGMENT_MB, RX_LOG_SEGMENT_MIN
+from src.rx_statistics import (
+    RX_STATS_WINDOW,
+    RX_STATS_SKIP,
+    RX_STORE_MAX_IDS,
+    RX_STALE_ID_S,
+)
 from src.utils import resource_path
+from src.tx_scheduler import TxScheduler, TxJob
 from src.PCANBasic import (
     PCAN_BAUD_1M,
     PCAN_BAUD_800K,
@@ -91,6 +106,9 @@ PCAN_BAUD_FD_2M = can.BitTimingFd(
 )
 
 BUSLOAD_refresh_rate_ms = 1000
+TX_refresh_rate_ms = 200  # aggiornamento dei payload mostrati nella tabella TX
+TX_PERIOD_MAX_MS = 10000
+TX_HIRES_MIN_PERIOD_MS = 0.1  # periodo minimo degli ID ad alta risoluzione
 
 # Tx column definition
 TX_COL_0_del = 0
@@ -101,6 +119,8 @@ TX_COL_4_name = 4
 TX_COL_5_period = 5
 TX_COL_6_payload = 6
 TX_COL_7_script = 7
+TX_COL_8_achieved = 8
+TX_COL_9_jitter = 9
 
 TX_COL_DATA = TX_COL_2_id
 TX_COL_DATA_ROLE_script = Qt.ItemDataRole.UserRole
@@ -109,6 +129,7 @@ TX_COL_DATA_ROLE_is_fd = Qt.ItemDataRole.UserRole + 2
 
 TX_COL_PERIODDATA = TX_COL_5_period
 TX_COL_PERIODDATA_period = Qt.ItemDataRole.DisplayRole
+TX_COL_PERIODDATA_hires = Qt.ItemDataRole.UserRole
 
 TX_COL_SCRIPTDATA = TX_COL_7_script
 TX_COL_SCRIPTDATA_path = Qt.ItemDataRole.UserRole
@@ -168,7 +189,10 @@ class MainWindow(QMainWindow):
         # Class Attributes
         self.dbc = None
         self.can_if = None
-        self.timers = []
+        self.tx_scheduler = None  # thread TX con heap delle deadline
+        self._tx_slider_connections = []  # (slider, slot) collegati ai job TX
+        self._tx_period_connections = []  # (spinbox periodo, slot) collegati al TX
+        self._tx_table_refreshing = False
         self.tx_running = False
         self.global_script_path = None
         self.global_script_cache = {}
@@ -176,6 +200,10 @@ class MainWindow(QMainWindow):
 
         self.busload_tx_arbitration_bits = 0
         self.busload_tx_data_bits = 0
+        # I contatori sono incrementati dal thread TX e azzerati dalla GUI
+        self._busload_tx_lock = threading.Lock()
+        # Bit stimati per gli ID inviati dai task ciclici: id -> (arb, data, periodo ms)
+        self.tx_cyclic_bits = {}
 
         # --- MENU ---
         menubar = QMenuBar(self)
@@ -253,6 +281,17 @@ class MainWindow(QMainWindow):
         self.btn_load_dbc.clicked.connect(self.load_dbc_file)
         top_layout.addWidget(self.btn_load_dbc)
 
+        ## ComboBox per selezionare il backend del bus (PCAN, virtuale, SocketCAN, replay)
+        self.cb_backend = QComboBox()
+        self.cb_backend.setToolTip(
+            "Select the CAN backend: PCAN-USB hardware, in-process virtual bus, SocketCAN or replay of a log file."
+        )
+        for backend, label in BUS_BACKENDS.items():
+            self.cb_backend.addItem(label, backend)
+        self.cb_backend.setFixedSize(100, 30)
+        self.cb_backend.currentIndexChanged.connect(lambda _: self.refresh_bus_list())
+        top_layout.addWidget(self.cb_backend)
+
         ## ComboBox per selezionare il canale CAN
         self.lbl_bus_tx = QLabel("Channel:")
         self.lbl_bus_tx.setToolTip(
@@ -276,6 +315,10 @@ class MainWindow(QMainWindow):
         self.btn_refresh_bus.clicked.connect(self.refresh_bus_list)
         top_layout.addWidget(self.btn_refresh_bus)
 
+        # Timer per aggiornare i payload inviati dal thread TX nella tabella
+        self.timer_tx_refresh = QTimer(self)
+        self.timer_tx_refresh.timeout.connect(self.refresh_tx_table)
+
         # Timer per aggiornare il busload
         self.timer_busload = QTimer(self)
         self.timer_busload.timeout.connect(self.timer_busload_elapsed)
@@ -424,6 +467,8 @@ class MainWindow(QMainWindow):
                 "Period (ms)",
                 "Payload (0 - 7)",
                 "Script for Specific ID",
+                "Achieved (ms)",
+                "Jitter P99 (ms)",
             ]
         )
         self.signal_tree.setColumnWidth(TX_COL_0_del, 40)  # old: 50
@@ -434,12 +479,18 @@ class MainWindow(QMainWindow):
         self.signal_tree.setColumnWidth(TX_COL_5_period, 80)
         self.signal_tree.setColumnWidth(TX_COL_6_payload, 200)  # old: 190
         self.signal_tree.setColumnWidth(TX_COL_7_script, 70)
+        self.signal_tree.setColumnWidth(TX_COL_8_achieved, 90)
+        self.signal_tree.setColumnWidth(TX_COL_9_jitter, 90)
         self.signal_tree.itemChanged.connect(self.on_signal_tree_item_changed)
 
         self.signal_tree.setSortingEnabled(True)
         self.signal_tree.setItemDelegate(PayloadEditDelegate(self.signal_tree))
         self.signal_tree.header().sectionClicked.connect(self.handle_signal_tree_sort)
         self.signal_tree.header().setDefaultAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.signal_tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.signal_tree.customContextMenuRequested.connect(
+            self.show_signal_tree_menu
+        )
 
         # Groupbox per i controlli di trasmissione
         tx_group = QGroupBox()
@@ -458,6 +509,7 @@ class MainWindow(QMainWindow):
 
         # Aggiungi il layout dei controlli di ricezione al layout principale
         self.rx_window = ReceivedFramesWindow(self.dbc)
+        self.rx_window.filters_changed.connect(self.apply_rx_filters)
         rx_group = QGroupBox()
         rx_group.setStyleSheet(
             "QGroupBox { border: 2px solid #2196F3; border-radius: 5px; }"
@@ -796,11 +848,6 @@ class MainWindow(QMainWindow):
             # Ferma la trasmissione se è attiva
             if self.tx_running:
                 self.stop_tx()
-            else:
-                # Assicurati che i timer siano puliti anche se non in "running"
-                for t in self.timers:
-                    t.stop()
-                self.timers.clear()
 
             # Pulisci la tabella
             self.signal_tree.clear()
@@ -810,8 +857,17 @@ class MainWindow(QMainWindow):
             self.btn_delete_all_ids.setEnabled(False)
 
     def clear_busload_stats(self):
-        self.busload_tx_arbitration_bits = 0
-        self.busload_tx_data_bits = 0
+        with self._busload_tx_lock:
+            self.busload_tx_arbitration_bits = 0
+            self.busload_tx_data_bits = 0
+
+    def take_busload_tx_bits(self):
+        """Returns the TX (arbitration, data) bits counted so far and resets them."""
+        with self._busload_tx_lock:
+            bits = (self.busload_tx_arbitration_bits, self.busload_tx_data_bits)
+            self.busload_tx_arbitration_bits = 0
+            self.busload_tx_data_bits = 0
+        return bits
 
     def get_busload_tx_arbitration_bits(self):
         return self.busload_tx_arbitration_bits
@@ -845,6 +901,16 @@ class MainWindow(QMainWindow):
             "global_script": (
                 self.global_script_path if self.global_script_path else None
             ),
+            "bus_backend": self.cb_backend.currentData(),
+            "rx_filters": format_filter_text(self.rx_window.acceptance_filters),
+            "rx_stats_window": self.rx_window.stats_window,
+            "rx_stats_skip": self.rx_window.stats_skip,
+            "rx_max_ids": self.rx_window.max_ids,
+            "rx_stale_id_s": self.rx_window.stale_id_s,
+            "rx_timeout_factor": self.rx_window.timeout_factor,
+            "rx_log_segment_mb": self.rx_window.log_segment_mb,
+            "rx_log_segment_min": self.rx_window.log_segment_min,
+            "rx_log_compression": self.rx_window.log_compression,
         }
 
         for widget in getattr(self, "slider_widgets", []):
@@ -872,6 +938,9 @@ class MainWindow(QMainWindow):
                     if self.signal_tree.itemWidget(item, TX_COL_5_period)
                     else 100
                 ),
+                "high_resolution": bool(
+                    item.data(TX_COL_PERIODDATA, TX_COL_PERIODDATA_hires)
+                ),
                 "payload": item.text(TX_COL_6_payload),
                 "dlc": item.data(TX_COL_DATA, TX_COL_DATA_ROLE_dlc) or 8,
                 "script_path": item.data(
@@ -928,6 +997,35 @@ class MainWindow(QMainWindow):
                         f"Cannot find DBC file:\n{absolute_path}",
                     )
 
+            # Restores the bus backend (channel list follows the selection)
+            backend_idx = self.cb_backend.findData(config.get("bus_backend"))
+            if backend_idx >= 0 and self.cb_backend.isEnabled():
+                self.cb_backend.setCurrentIndex(backend_idx)
+
+            # Restores the RX acceptance filters
+            try:
+                self.rx_window.set_acceptance_filters(
+                    parse_filter_text(config.get("rx_filters") or "")
+                )
+            except ValueError as e:
+                log_exception(__file__, sys._getframe().f_lineno, e)
+            self.rx_window.set_statistics_settings(
+                config.get("rx_stats_window", RX_STATS_WINDOW),
+                config.get("rx_stats_skip", RX_STATS_SKIP),
+            )
+            self.rx_window.set_store_settings(
+                config.get("rx_max_ids", RX_STORE_MAX_IDS),
+                config.get("rx_stale_id_s", RX_STALE_ID_S),
+            )
+            self.rx_window.set_timeout_factor(
+                config.get("rx_timeout_factor", RX_TIMEOUT_FACTOR)
+            )
+            self.rx_window.set_log_settings(
+                config.get("rx_log_segment_mb", RX_LOG_SEGMENT_MB),
+                config.get("rx_log_segment_min", RX_LOG_SEGMENT_MIN),
+                config.get("rx_log_compression"),
+            )
+
             # Restores global script
             global_script = config.get("global_script")
             if global_script:
@@ -1054,11 +1152,10 @@ class MainWindow(QMainWindow):
                         msg_item.setText(TX_COL_3_fd, sig.get("fd", "n"))
                         msg_item.setText(TX_COL_4_name, sig.get("name", ""))
 
-                        period_spin = QSpinBox()
-                        period_spin.setRange(1, 10000)
-                        period_spin.setValue(sig.get("period", 100))
-                        self.signal_tree.setItemWidget(
-                            msg_item, TX_COL_5_period, period_spin
+                        period_spin = self._make_period_spin(
+                            msg_item,
+                            sig.get("period", 100),
+                            sig.get("high_resolution", False),
                         )
                         msg_item.setText(TX_COL_5_period, str(period_spin.value()))
                         msg_item.setData(
@@ -1318,12 +1415,24 @@ class MainWindow(QMainWindow):
 
     def refresh_bus_list(self):
         self.cb_bus_tx.clear()
-        for display, handle in CANInterface.get_available_channels():
+        backend = self.cb_backend.currentData()
+        for display, handle in CANInterface.get_available_channels(backend):
             self.cb_bus_tx.addItem(display, handle)
 
     def toggle_connection(self):
         if self.btn_connect.isChecked():  # Connect button is checked
+            backend = self.cb_backend.currentData()
             channel = self.cb_bus_tx.currentData()  # Get the selected channel
+            if backend == "replay":  # Il canale del replay è il file di log
+                channel, _ = QFileDialog.getOpenFileName(
+                    self,
+                    "Select log file to replay",
+                    "",
+                    "CAN logs (*.blf *.asc *.csv *.trc *.log *.mf4)",
+                )
+                if not channel:
+                    self.btn_connect.setChecked(False)
+                    return
             if channel is None:
                 QMessageBox.warning(self, "Warning", "No CAN channel selected")
                 self.btn_connect.setChecked(False)
@@ -1331,9 +1440,9 @@ class MainWindow(QMainWindow):
 
             # --- Check if the selected channel is still available ---
             available_channels = [
-                handle for _, handle in CANInterface.get_available_channels()
+                handle for _, handle in CANInterface.get_available_channels(backend)
             ]
-            if channel not in available_channels:
+            if backend != "replay" and channel not in available_channels:
                 QMessageBox.critical(
                     self,
                     "Error",
@@ -1347,13 +1456,17 @@ class MainWindow(QMainWindow):
                 bitrate_lbl = self.cb_baudrate.currentText()
                 print(f"[DEBUG] selected timing: {bitrate_lbl}")
                 self.can_if = CANInterface(
-                    channel, timing=bitrate_lbl, is_fd=("f_clock=" in bitrate_lbl)
+                    channel,
+                    timing=bitrate_lbl,
+                    is_fd=("f_clock=" in bitrate_lbl),
+                    backend=backend,
                 )
-                self.can_if.set_receive_callback(self.process_received_frame)
+                self.can_if.set_filters(self.rx_window.acceptance_filters)
+                self.can_if.set_receive_batch_callback(self.process_received_batch)
                 QMessageBox.information(
                     self,
                     "Info",
-                    f"Connected to: \n    > {self.cb_bus_tx.currentText()}\n    > Baudrate: {bitrate_lbl}",
+                    f"Connected to: \n    > {channel if backend == 'replay' else self.cb_bus_tx.currentText()}\n    > Baudrate: {bitrate_lbl}",
                 )
 
                 self.btn_connect.setText("Disconnect")
@@ -1365,6 +1478,7 @@ class MainWindow(QMainWindow):
                 )
 
                 self.cb_baudrate.setEnabled(False)
+                self.cb_backend.setEnabled(False)
                 self.cb_bus_tx.setEnabled(False)
                 self.btn_refresh_bus.setEnabled(False)
                 self.btn_add_id.setEnabled(True)
@@ -1377,6 +1491,8 @@ class MainWindow(QMainWindow):
                 self.btn_start_tx.setEnabled(False)  # <--- Disable if error
 
         else:  # Disconnect
+            if self.tx_running:
+                self.stop_tx()  # <--- Ferma la trasmissione prima di chiudere il bus
             if self.can_if:
                 self.can_if.close()
                 self.can_if = None
@@ -1389,12 +1505,15 @@ class MainWindow(QMainWindow):
             )
 
             self.cb_baudrate.setEnabled(True)
+            self.cb_backend.setEnabled(True)
             self.cb_bus_tx.setEnabled(True)
             self.btn_refresh_bus.setEnabled(True)
             self.btn_add_id.setEnabled(True)
             self.btn_start_tx.setEnabled(False)  # <--- Disabilita dopo disconnessione
-            if self.tx_running:
-                self.stop_tx()  # <--- Ferma la trasmissione se attiva
+
+    def apply_rx_filters(self, filters):
+        if self.can_if:
+            self.can_if.set_filters(filters)
 
     def load_dbc_file(self):
         filename, _ = QFileDialog.getOpenFileName(
@@ -1426,11 +1545,9 @@ class MainWindow(QMainWindow):
             msg_item.setText(TX_COL_3_fd, "Y" if is_fd else "n")
             msg_item.setText(TX_COL_4_name, msg.name)
 
-            period_spin = QSpinBox()
-            period_spin.setRange(1, 10000)
-            period_spin.setValue(msg.cycle_time if msg.cycle_time else 100)
-
-            self.signal_tree.setItemWidget(msg_item, TX_COL_5_period, period_spin)
+            period_spin = self._make_period_spin(
+                msg_item, msg.cycle_time if msg.cycle_time else 100
+            )
             msg_item.setText(TX_COL_5_period, str(period_spin.value()))
             msg_item.setData(
                 TX_COL_5_period, Qt.ItemDataRole.DisplayRole, period_spin.value()
@@ -1525,10 +1642,7 @@ class MainWindow(QMainWindow):
         msg_item.setData(TX_COL_DATA, TX_COL_DATA_ROLE_dlc, dlc)
         msg_item.setData(TX_COL_DATA, TX_COL_DATA_ROLE_is_fd, is_fd)
 
-        period_spin = QSpinBox()
-        period_spin.setRange(1, 10000)
-        period_spin.setValue(period)
-        self.signal_tree.setItemWidget(msg_item, TX_COL_5_period, period_spin)
+        period_spin = self._make_period_spin(msg_item, period)
         msg_item.setText(TX_COL_5_period, str(period_spin.value()))
         msg_item.setData(
             TX_COL_PERIODDATA, Qt.ItemDataRole.DisplayRole, period_spin.value()
@@ -1577,13 +1691,11 @@ class MainWindow(QMainWindow):
             if self.tx_running:
                 try:
                     frame_id = int(item.text(TX_COL_2_id), 16)
-                    timers_to_remove = []
-                    for t in self.timers:
-                        if hasattr(t, "frame_id") and t.frame_id == frame_id:
-                            t.stop()
-                            timers_to_remove.append(t)
-                    for t in timers_to_remove:
-                        self.timers.remove(t)
+                    if self.tx_scheduler is not None:
+                        self.tx_scheduler.remove_job(frame_id)
+                    if self.can_if:
+                        self.can_if.stop_cyclic(frame_id)
+                    self.tx_cyclic_bits.pop(frame_id, None)
                     if hasattr(self, "tx_periods") and frame_id in self.tx_periods:
                         del self.tx_periods[frame_id]
                 except Exception:
@@ -1612,27 +1724,13 @@ class MainWindow(QMainWindow):
                         )
 
         elif column == TX_COL_5_period:  # Periodo (ms) column changed
-            # Update the timer for this item if TX is running
-            if self.tx_running:
-                frame_id = None
-                try:
-                    frame_id = int(item.text(TX_COL_2_id), 16)
-                except Exception:
-                    return
-                # Find and update the timer for this frame_id
-                for t in getattr(self, "timers", []):
-                    if hasattr(t, "frame_id") and t.frame_id == frame_id:
-                        period_spin = self.signal_tree.itemWidget(item, TX_COL_5_period)
-                        new_period = period_spin.value() if period_spin else 1000
-                        item.setText(TX_COL_5_period, str(new_period))
-
-                        t.stop()
-                        t.start(new_period)
-                        if hasattr(self, "tx_periods") and frame_id in self.tx_periods:
-                            self.tx_periods[frame_id]["nominal"] = new_period
-                        break
+            # Durante la trasmissione il nuovo periodo è applicato solo
+            # dall'handler valueChanged dello spinbox (vedi start_tx)
+            return
 
         elif column == TX_COL_6_payload:  # Payload
+            if self._tx_table_refreshing:
+                return  # payload scritto da refresh_tx_table(), già valido
             text = item.text(TX_COL_6_payload).strip()
             parti = text.split()
             dlc = item.data(TX_COL_DATA, TX_COL_DATA_ROLE_dlc) or None
@@ -1645,6 +1743,22 @@ class MainWindow(QMainWindow):
                     f"Payload must contain exactly {dlc} bytes in hexadecimal (00-FF), e.g. {' '.join(['00'] * dlc)}",
                 )
                 item.setText(TX_COL_6_payload, " ".join(["00"] * dlc))
+            elif self.tx_running and self.can_if:
+                # Payload modificato: aggiorna il task ciclico o il job TX senza riavviarli
+                try:
+                    frame_id = int(item.text(TX_COL_2_id), 16)
+                    payload = bytes(int(p, 16) for p in parti)
+                    job = (
+                        self.tx_scheduler.get_job(frame_id)
+                        if self.tx_scheduler is not None
+                        else None
+                    )
+                    if job is not None:
+                        job.manual_payload = payload
+                    else:
+                        self.can_if.modify_cyclic(frame_id, payload)
+                except Exception as e:
+                    log_exception(__file__, sys._getframe().f_lineno, e)
 
     def select_global_payload_script(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -1809,6 +1923,52 @@ class MainWindow(QMainWindow):
         decoded[signal_name] = value
         return bytes(message.encode(decoded))
 
+    def _make_period_spin(self, item, period, high_resolution=False):
+        period_spin = QDoubleSpinBox()
+        self._set_period_resolution(item, period_spin, high_resolution)
+        period_spin.setValue(period)
+        self.signal_tree.setItemWidget(item, TX_COL_5_period, period_spin)
+        return period_spin
+
+    def _set_period_resolution(self, item, period_spin, high_resolution):
+        # Gli ID ad alta risoluzione accettano periodi sub-ms (sleep + spin nel thread TX)
+        item.setData(TX_COL_PERIODDATA, TX_COL_PERIODDATA_hires, high_resolution)
+        if high_resolution:
+            period_spin.setDecimals(2)
+            period_spin.setRange(TX_HIRES_MIN_PERIOD_MS, TX_PERIOD_MAX_MS)
+            period_spin.setSingleStep(0.05)
+            period_spin.setToolTip(
+                "High-resolution period: sent by the TX thread with sleep + spin timing (sub-ms allowed)."
+            )
+        else:
+            period_spin.setDecimals(0)
+            period_spin.setRange(1, TX_PERIOD_MAX_MS)
+            period_spin.setSingleStep(1)
+            period_spin.setToolTip("")
+
+    def show_signal_tree_menu(self, pos):
+        item = self.signal_tree.itemAt(pos)
+        if item is None:
+            return
+        period_spin = self.signal_tree.itemWidget(item, TX_COL_5_period)
+        if period_spin is None:
+            return
+        menu = QMenu(self)
+        act_hires = menu.addAction("High-resolution period (sub-ms)")
+        act_hires.setCheckable(True)
+        act_hires.setChecked(
+            bool(item.data(TX_COL_PERIODDATA, TX_COL_PERIODDATA_hires))
+        )
+        act_hires.setToolTip(
+            "Send this ID from the TX thread with sleep + spin timing. Uses more CPU."
+        )
+        if menu.exec(self.signal_tree.viewport().mapToGlobal(pos)) is act_hires:
+            self._set_period_resolution(item, period_spin, act_hires.isChecked())
+            # Riavvia la trasmissione: l'ID può passare da task ciclico a thread TX
+            if self.tx_running:
+                self.stop_tx()
+                self.start_tx()
+
     def start_stop_transmission(self) -> None:
         if not self.tx_running:
             if not self.can_if:
@@ -1824,10 +1984,7 @@ class MainWindow(QMainWindow):
 
     def start_tx(self):
         """Starts the periodic transmission of enabled CAN messages in ascending order of ID."""
-        self.timers.clear()
-        self.tx_periods = (
-            {}
-        )  # frame_id: {'nominal': period, 'offset': 0, 'samples': [], 'last_time': None}
+        self.tx_periods = {}  # frame_id: {'nominal': period} (tempi misurati in job.timing)
         items_to_send = []
         for i in range(self.signal_tree.topLevelItemCount()):  # Itera su tutti gli ID
             item = self.signal_tree.topLevelItem(i)
@@ -1841,246 +1998,97 @@ class MainWindow(QMainWindow):
 
         # Prepara gli slider per i frame
         slider_overrides = {}
-        if hasattr(
-            self, "slider_widgets"
-        ):  # Controlla se gli slider sono stati aggiunti
-            for w in self.slider_widgets:
-                fid = w.frame_id
-                sig = w.signal
-                if fid not in slider_overrides:
-                    slider_overrides[fid] = []
-                slider_overrides[fid].append((sig, w.slider))
-
-        # Inizializza i timer ed il dizionario per la cache degli script
+        for w in getattr(self, "slider_widgets", []):
+            slider_overrides.setdefault(w.frame_id, []).append(w)
+
+        # Thread TX: tutti i job partono dalla stessa deadline, in ordine di ID
+        self.tx_scheduler = TxScheduler(self._send_tx_job)
+        first_deadline = time.perf_counter()
+
         for frame_id, item in items_to_send:
             period_spin = self.signal_tree.itemWidget(item, TX_COL_5_period)
             period = period_spin.value() if period_spin else 1000
-            self.tx_periods[frame_id] = {
-                "nominal": period,
-                "offset": 0,
-                "samples": [],
-                "last_time": None,
-            }
-            # Connect live update for period spinbox
+            self.tx_periods[frame_id] = {"nominal": period}
+            for col in (TX_COL_8_achieved, TX_COL_9_jitter):
+                item.setText(col, "")
+                item.setToolTip(col, "")
+            # Connect live update for period spinbox (scollegato in stop_tx)
             if period_spin is not None:
 
-                def make_period_handler(fid=frame_id, spin=period_spin, tree_item=item):
+                def make_period_handler(fid=frame_id):
                     def handler(new_period):
                         if self.tx_running:
-                            # Update timer and tx_periods
-                            for t in self.timers:
-                                if hasattr(t, "frame_id") and t.frame_id == fid:
-                                    t.stop()
-                                    t.start(new_period)
-                                    self.tx_periods[fid]["nominal"] = new_period
-                                    break
+                            # Task ciclico: riavvialo con il nuovo periodo
+                            if self._set_cyclic_tx_period(fid, new_period):
+                                return
+                            # Job del thread TX: aggiorna la prossima deadline
+                            if self.tx_scheduler is not None and (
+                                self.tx_scheduler.set_period(fid, new_period)
+                            ):
+                                self.tx_periods[fid]["nominal"] = new_period
 
                     return handler
 
-                period_spin.valueChanged.connect(make_period_handler())
+                period_handler = make_period_handler()
+                period_spin.valueChanged.connect(period_handler)
+                self._tx_period_connections.append((period_spin, period_handler))
 
             script_path = item.data(TX_COL_SCRIPTDATA, TX_COL_SCRIPTDATA_path)
-            script_cache = {}
-
-            def make_callback(frame_id=frame_id, item=item, script_path=script_path):
-                def callback():
-                    now_time = time.time() * 1000  # ms
-                    txp = self.tx_periods[frame_id]
-
-                    # FIXME: riabilitare controllo adattivo del periodo correggendo il conflitto con metodo timer_busload_elapsed()
-                    # Monitor period
-                    # if txp["last_time"] is not None:
-                    #    real_period = now_time - txp["last_time"]
-                    #    txp["samples"].append(real_period)
-                    #    # if len(txp["samples"]) > 10:
-                    #    #     txp["samples"].pop(0)
-
-                    #    # Calculate mean and check hysteresis
-                    #    if len(txp["samples"]) == 10:
-                    #        # Calcola la media attuale dei periodi e poi ripulisce la lista
-                    #        real_mean_period = sum(txp["samples"]) / 10
-                    #        txp["samples"].pop(0)
-
-                    #        ref_period = txp["nominal"]
-                    #        p_factor = 0.0  # Fattore di proporzione
-                    #        i_factor = 0.002  # Fattore di integrazione
-
-                    #        error_period = float(ref_period) - real_mean_period
-
-                    #        # --- INTEGRALE: accumula l'errore nel tempo ---
-                    #        if "integral" not in txp:
-                    #            txp["integral"] = 0.0
-                    #        txp["integral"] += error_period
-
-                    #        # --- PI controller ---
-                    #        new_period = (
-                    #            int(
-                    #                error_period * p_factor + txp["integral"] * i_factor
-                    #            )
-                    #            + ref_period
-                    #        )
-
-                    #        # Aggiorna il periodo del timer se necessario
-                    #        if new_period != ref_period + txp["offset"]:
-                    #            txp["offset"] = new_period - ref_period
-                    #            print(
-                    #                f"[DEBUG] Update of period for ID 0x{frame_id:03X}: (Ierr: {txp['integral']:02f} ms, corr: {new_period - ref_period:02f} ms) ref:{ref_period} -> new:{new_period} ms"
-                    #            )
-
-                    #            for t in self.timers:
-                    #                if (
-                    #                    hasattr(t, "frame_id")
-                    #                    and t.frame_id == frame_id
-                    #                ):
-                    #                    t.stop()
-                    #                    t.start(max(5, new_period))
-                    #                    break
-
-                    txp["last_time"] = (
-                        now_time  # Aggiorna l'ultimo tempo di trasmissione
-                    )
-
-                    dlc = (
-                        item.data(TX_COL_DATA, TX_COL_DATA_ROLE_dlc) or 8
-                    )  # se il payload viene da testo manuale
-                    if not isinstance(dlc, int) or not (1 <= dlc <= 64):
-                        dlc = 8
-
-                    is_fd = (
-                        item.data(TX_COL_DATA, TX_COL_DATA_ROLE_is_fd) or 0
-                    )  # 0 se CAN, 1 se CAN-FD
-                    if not isinstance(is_fd, int) or not (0 <= is_fd <= 1):
-                        is_fd = 0
-
-                    # Se il payload è stato specificato come script, lo esegue
-                    try:
-                        # 1. Per-ID script has priority
-                        if script_path and os.path.exists(script_path):
-                            if script_path not in script_cache:
-                                script_globals = {}
-                                with open(script_path, "r", encoding="utf-8") as f:
-                                    exec(f.read(), script_globals)
-                                get_payload_fn = script_globals.get("get_payload")
-                                if not callable(get_payload_fn):
-                                    raise RuntimeError(
-                                        "Selected script file does not contain a function get_payload()"
-                                    )
-                                script_cache[script_path] = get_payload_fn
-                            else:
-                                get_payload_fn = script_cache[script_path]
-
-                            payload = get_payload_fn(dlc, frame_id)
-                            if not isinstance(payload, bytes) or len(payload) != dlc:
-                                raise ValueError(
-                                    f"get_payload(dlc) must return exactly {dlc} bytes"
-                                )
-
-                        # 2. Otherwise, use global script if set
-                        elif self.global_script_path and os.path.exists(
-                            self.global_script_path
-                        ):
-                            if self.global_script_path not in self.global_script_cache:
-                                script_globals = {}
-                                with open(
-                                    self.global_script_path, "r", encoding="utf-8"
-                                ) as f:
-                                    exec(f.read(), script_globals)
-                                get_payload_fn = script_globals.get("get_payload")
-                                if not callable(get_payload_fn):
-                                    raise RuntimeError(
-                                        "Global script file does not contain a function get_payload()"
-                                    )
-                                self.global_script_cache[self.global_script_path] = (
-                                    get_payload_fn
-                                )
-                            else:
-                                get_payload_fn = self.global_script_cache[
-                                    self.global_script_path
-                                ]
-
-                            payload = get_payload_fn(dlc, frame_id)
-                            if not isinstance(payload, bytes) or len(payload) != dlc:
-                                raise ValueError(
-                                    f"get_payload(dlc) must return exactly {dlc} bytes"
-                                )
-
-                        # 3. Otherwise, use manual payload
-                        else:
-                            payload_text = item.text(TX_COL_6_payload).strip()
-
-                            if payload_text:
-                                payload_parts = payload_text.split()
-                                payload = bytes(int(b, 16) for b in payload_parts[:dlc])
-                            else:
-                                payload = bytes([0x00] * dlc)
 
-                            # Se lo script restituisce un payload, usa solo i primi DLC byte
-                            if isinstance(payload, bytes):
-                                payload = payload[:dlc] + bytes(
-                                    [0x00] * max(0, dlc - len(payload))
-                                )
-
-                        # Apply slider overrides
-                        payload_list = list(payload)
-                        if frame_id in slider_overrides:
-                            for sig, slider in slider_overrides[frame_id]:
-                                val_index = slider.value()
-                                real_value = (
-                                    slider.parent().min_val
-                                    + val_index * slider.parent().step
-                                )
-                                result = self.insert_value_in_payload(
-                                    frame_id, sig.name, real_value, bytes(payload_list)
-                                )
-                                if isinstance(result, int):
-                                    result = bytes([result])
-                                payload_list = list(result)
-
-                        # Apply padding
-                        final_payload = bytes(payload_list)
-                        if len(final_payload) != dlc:
-                            final_payload = final_payload[:dlc] + bytes(
-                                [0x00] * max(0, dlc - len(final_payload))
-                            )
-                        # print(f"[DEBUG] final_payload type: {type(final_payload)}, value: {final_payload}")
+            # ID a payload statico (nessuno script né slider): task ciclico python-can,
+            # indipendente dall'event loop della GUI
+            has_script = bool(script_path and os.path.exists(script_path)) or bool(
+                self.global_script_path and os.path.exists(self.global_script_path)
+            )
+            high_resolution = bool(
+                item.data(TX_COL_PERIODDATA, TX_COL_PERIODDATA_hires)
+            )
+            if (
+                not has_script
+                and frame_id not in slider_overrides
+                and not high_resolution
+            ):
+                if self._start_cyclic_tx(frame_id, item, period):
+                    continue
 
-                        # Invia il frame e aggiorna il payload nella finestra TX
-                        self.send_can_message(frame_id, final_payload, dlc, is_fd)
-                        item.setText(
-                            TX_COL_6_payload,
-                            " ".join(f"{b:02X}" for b in final_payload),
-                        )
+            dlc = (
+                item.data(TX_COL_DATA, TX_COL_DATA_ROLE_dlc) or 8
+            )  # se il payload viene da testo manuale
+            if not isinstance(dlc, int) or not (1 <= dlc <= 64):
+                dlc = 8
+
+            is_fd = (
+                item.data(TX_COL_DATA, TX_COL_DATA_ROLE_is_fd) or 0
+            )  # 0 se CAN, 1 se CAN-FD
+            if not isinstance(is_fd, int) or not (0 <= is_fd <= 1):
+                is_fd = 0
+
+            try:
+                job = TxJob(
+                    frame_id,
+                    period,
+                    dlc,
+                    bool(is_fd),
+                    self._make_payload_builder(script_path),
+                    high_resolution,
+                )
+                payload_text = item.text(TX_COL_6_payload).strip()
+                job.manual_payload = bytes(
+                    int(b, 16) for b in payload_text.split()[:dlc]
+                )
+                for slider_widget in slider_overrides.get(frame_id, []):
+                    self._bind_slider_to_job(slider_widget, job)
+                job.message = self.can_if.prepare_frame(frame_id, dlc, bool(is_fd))
+                job.busload_bits = frame_bits(
+                    dlc, bool(is_fd), job.message.is_extended_id
+                )
+                self.tx_scheduler.add_job(job, first_deadline)
+            except Exception as e:
+                print(f"[Error TX ID {frame_id:03X}]: {e}")
+                log_exception(__file__, sys._getframe().f_lineno, e)
 
-                        # Update live gauges (XMetro)
-                        # for gauge in getattr(self, "xmetro_windows", []):
-                        #     if gauge.cb_messages.currentData() == frame_id:
-                        #         if not isinstance(
-                        #             final_payload, bytes
-                        #         ):  # Converti in bytes se necessario
-                        #             try:
-                        #                 final_payload = bytes(final_payload)
-                        #             except Exception:
-                        #                 print(
-                        #                     f"[XMetro] Payload not convertible: {type(final_payload)}, value {final_payload}"
-                        #                 )
-                        #                 continue
-                        #         # Update the gauge with the final payload
-                        #         gauge.update_gauge(final_payload)
-                        #         # print(f"[XMetro] Payload passed to gauge: {type(final_payload)}, value {final_payload}")
-
-                    except Exception as e:
-                        print(f"[Error TX ID {frame_id:03X}]: {e}")
-                        log_exception(__file__, sys._getframe().f_lineno, e)
-
-                return callback
-
-            timer = QTimer(self)
-            timer.frame_id = frame_id  # Custom attribute for lookup
-            timer.timeout.connect(
-                make_callback(frame_id=frame_id, item=item, script_path=script_path)
-            )
-            timer.start(period)
-            self.timers.append(timer)
+        self.tx_scheduler.start()
+        self.timer_tx_refresh.start(TX_refresh_rate_ms)
 
         self.tx_running = True
         self.btn_start_tx.setText("Stop TX")
@@ -2091,10 +2099,213 @@ class MainWindow(QMainWindow):
             self.style().standardIcon(QStyle.StandardPixmap.SP_DialogNoButton)
         )
 
+    def _make_payload_builder(self, script_path):
+        """
+        Returns the payload function of a TX job. It runs on the TX thread, so it
+        only reads the job inputs pushed by the GUI, never the Qt widgets.
+        """
+        script_cache = {}
+
+        def build_payload(job):
+            frame_id = job.frame_id
+            dlc = job.dlc
+
+            # 1. Per-ID script has priority
+            if script_path and os.path.exists(script_path):
+                if script_path not in script_cache:
+                    script_globals = {}
+                    with open(script_path, "r", encoding="utf-8") as f:
+                        exec(f.read(), script_globals)
+                    get_payload_fn = script_globals.get("get_payload")
+                    if not callable(get_payload_fn):
+                        raise RuntimeError(
+                            "Selected script file does not contain a function get_payload()"
+                        )
+                    script_cache[script_path] = get_payload_fn
+                else:
+                    get_payload_fn = script_cache[script_path]
+
+                payload = get_payload_fn(dlc, frame_id)
+                if not isinstance(payload, bytes) or len(payload) != dlc:
+                    raise ValueError(f"get_payload(dlc) must return exactly {dlc} bytes")
+
+            # 2. Otherwise, use global script if set
+            elif self.global_script_path and os.path.exists(self.global_script_path):
+                global_script_path = self.global_script_path
+                if global_script_path not in self.global_script_cache:
+                    script_globals = {}
+                    with open(global_script_path, "r", encoding="utf-8") as f:
+                        exec(f.read(), script_globals)
+                    get_payload_fn = script_globals.get("get_payload")
+                    if not callable(get_payload_fn):
+                        raise RuntimeError(
+                            "Global script file does not contain a function get_payload()"
+                        )
+                    self.global_script_cache[global_script_path] = get_payload_fn
+                else:
+                    get_payload_fn = self.global_script_cache[global_script_path]
+
+                payload = get_payload_fn(dlc, frame_id)
+                if not isinstance(payload, bytes) or len(payload) != dlc:
+                    raise ValueError(f"get_payload(dlc) must return exactly {dlc} bytes")
+
+            # 3. Otherwise, use manual payload
+            else:
+                payload = job.manual_payload
+
+            # Apply slider overrides
+            for signal_name, real_value in list(job.slider_values.items()):
+                result = self.insert_value_in_payload(
+                    frame_id, signal_name, real_value, payload
+                )
+                if isinstance(result, int):
+                    result = bytes([result])
+                payload = bytes(result)
+
+            # Apply padding
+            if len(payload) != dlc:
+                payload = payload[:dlc] + bytes(max(0, dlc - len(payload)))
+            return payload
+
+        return build_payload
+
+    def _bind_slider_to_job(self, slider_widget, job):
+        # Copia il valore dello slider nel job ad ogni modifica (thread GUI)
+        signal_name = slider_widget.signal.name
+
+        def on_slider_value(step_index, w=slider_widget):
+            job.slider_values[signal_name] = w.min_val + step_index * w.step
+
+        on_slider_value(slider_widget.slider.value())
+        slider_widget.slider.valueChanged.connect(on_slider_value)
+        self._tx_slider_connections.append((slider_widget.slider, on_slider_value))
+
+    def _send_tx_job(self, job, payload):
+        # Thread TX: conteggio busload e invio con il messaggio preparato
+        arbitration_bits, data_bits = job.busload_bits
+        with self._busload_tx_lock:
+            self.busload_tx_arbitration_bits += arbitration_bits
+            self.busload_tx_data_bits += data_bits
+        self.can_if.send_prepared(job.message, payload)
+
+    def refresh_tx_table(self):
+        # Mostra nella tabella TX l'ultimo payload inviato dal thread TX e i tempi misurati
+        if self.tx_scheduler is None:
+            return
+        self._tx_table_refreshing = True
+        try:
+            for i in range(self.signal_tree.topLevelItemCount()):
+                item = self.signal_tree.topLevelItem(i)
+                try:
+                    frame_id = int(item.text(TX_COL_2_id), 16)
+                except ValueError:
+                    continue
+                if frame_id in self.tx_cyclic_bits:
+                    self._set_tx_timing_text(
+                        item,
+                        "cyclic",
+                        "cyclic",
+                        "Sent by the driver cyclic task: achieved timing is not measured.",
+                    )
+                    continue
+                job = self.tx_scheduler.get_job(frame_id)
+                if job is None or job.last_payload is None:
+                    continue
+                text = " ".join(f"{b:02X}" for b in job.last_payload)
+                if item.text(TX_COL_6_payload) != text:
+                    item.setText(TX_COL_6_payload, text)
+
+                stats = job.timing.summary(job.period)
+                if stats is None:
+                    continue
+                tooltip = (
+                    f"Nominal period: {job.period * 1000.0:.3f} ms\n"
+                    f"Mean period: {stats['mean_ms']:.3f} ms\n"
+                    f"Std deviation: {stats['std_ms']:.3f} ms\n"
+                    f"Jitter P99: {stats['p99_jitter_ms']:.3f} ms\n"
+                    f"Jitter max: {stats['max_jitter_ms']:.3f} ms\n"
+                    f"Missed deadlines: {stats['missed']}\n"
+                    f"Samples: {stats['samples']}"
+                )
+                notes = []
+                if stats["missed"]:
+                    notes.append(f"{stats['missed']} missed")
+                if stats["throttled"]:
+                    # Spin sospeso per il budget CPU: l'ID è stato inviato con sleep
+                    notes.append("throttled")
+                    tooltip += (
+                        f"\nSpin throttled: {stats['throttled']} waits fell back to "
+                        "sleep timing (CPU budget of the high-resolution mode)"
+                    )
+                self._set_tx_timing_text(
+                    item,
+                    f"{stats['mean_ms']:.3f}",
+                    f"{stats['p99_jitter_ms']:.3f}"
+                    + (f" ({', '.join(notes)})" if notes else ""),
+                    tooltip,
+                )
+        finally:
+            self._tx_table_refreshing = False
+
+    def _set_tx_timing_text(self, item, achieved, jitter, tooltip):
+        if item.text(TX_COL_8_achieved) != achieved:
+            item.setText(TX_COL_8_achieved, achieved)
+        if item.text(TX_COL_9_jitter) != jitter:
+            item.setText(TX_COL_9_jitter, jitter)
+        item.setToolTip(TX_COL_8_achieved, tooltip)
+        item.setToolTip(TX_COL_9_jitter, tooltip)
+
+    def _start_cyclic_tx(self, frame_id, item, period):
+        try:
+            dlc = item.data(TX_COL_DATA, TX_COL_DATA_ROLE_dlc) or 8
+            if not isinstance(dlc, int) or not (1 <= dlc <= 64):
+                dlc = 8
+            is_fd = item.data(TX_COL_DATA, TX_COL_DATA_ROLE_is_fd) or 0
+            if not isinstance(is_fd, int) or not (0 <= is_fd <= 1):
+                is_fd = 0
+            payload_text = item.text(TX_COL_6_payload).strip()
+            payload = bytes(int(b, 16) for b in payload_text.split()[:dlc])
+
+            self.can_if.start_cyclic(frame_id, payload, dlc, period, bool(is_fd))
+            # i task ciclici inviano ID standard (vedi CANInterface.start_cyclic)
+            arbitration_bits, data_bits = frame_bits(dlc, bool(is_fd), False)
+            self.tx_cyclic_bits[frame_id] = (arbitration_bits, data_bits, period)
+            return True
+        except Exception as e:
+            # fallback sul thread TX
+            log_exception(__file__, sys._getframe().f_lineno, e)
+            return False
+
+    def _set_cyclic_tx_period(self, frame_id, period):
+        if not self.can_if or not self.can_if.set_cyclic_period(frame_id, period):
+            return False
+        arbitration_bits, data_bits, _ = self.tx_cyclic_bits[frame_id]
+        self.tx_cyclic_bits[frame_id] = (arbitration_bits, data_bits, period)
+        if hasattr(self, "tx_periods") and frame_id in self.tx_periods:
+            self.tx_periods[frame_id]["nominal"] = period
+        return True
+
     def stop_tx(self):
-        for t in self.timers:
-            t.stop()
-        self.timers.clear()
+        if self.tx_scheduler is not None:
+            self.tx_scheduler.stop()
+            self.refresh_tx_table()
+            self.tx_scheduler = None
+        self.timer_tx_refresh.stop()
+        for slider, slot in self._tx_slider_connections:
+            try:
+                slider.valueChanged.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass  # slider già rimosso
+        self._tx_slider_connections.clear()
+        for period_spin, slot in self._tx_period_connections:
+            try:
+                period_spin.valueChanged.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass  # riga già rimossa
+        self._tx_period_connections.clear()
+        if self.can_if:
+            self.can_if.stop_all_cyclic()
+        self.tx_cyclic_bits.clear()
         self.tx_running = False
         self.btn_start_tx.setText("Start TX")
         self.btn_start_tx.setToolTip(
@@ -2104,56 +2315,14 @@ class MainWindow(QMainWindow):
             self.style().standardIcon(QStyle.StandardPixmap.SP_DialogYesButton)
         )
 
-    def make_timer_callback(self, frame_id, data, dlc, is_fd, item=None):
-        def callback():
-            self.send_can_message(frame_id, data, dlc, is_fd)
-            if item:
-                item.setText(TX_COL_6_payload, " ".join(f"{b:02X}" for b in data))
-
-        return callback
-
-    def send_can_message(self, frame_id, data, dlc=None, is_fd=False):
-        if not self.can_if:
-            return
-        try:
-            # determine DLC
-            if dlc is None:
-                dlc = len(data) if data else 0
-            dlc = max(0, min(int(dlc), 64))
-
-            # extended ID heuristic
-            is_ext = isinstance(frame_id, int) and frame_id > 0x7FF
-
-            # Compact bit counting:
-            # arbitration = SOF(1) + ID(11|29) + RTR/IDE/RES(≈3) + DLC(4)
-            # data_phase = data(8*dlc) + CRC(+delim)
-            # NOTE: ACK/EOF/IFS are transmitted at nominal bitrate in CAN-FD -> count them in arbitration_bits for is_fd
-            arbitration_bits = 1 + (29 if is_ext else 11) + 3 + 4
-            if not is_fd:
-                crc_total = 15 + 1
-                data_phase_bits = (
-                    8 * dlc + crc_total + 2 + 7 + 3
-                )  # ACK+EOF+IFS at same bitrate
-            else:
-                crc_total = (17 + 1) if dlc <= 16 else (21 + 1)
-                data_phase_bits = 8 * dlc + crc_total  # only data+CRC at data-rate
-                arbitration_bits += (
-                    2 + 7 + 3
-                )  # ACK + EOF + IFS are at nominal (arbitration) bitrate
-
-            # update counters (arbitration at nominal rate, data phase at data rate for FD)
-            self.busload_tx_arbitration_bits += arbitration_bits
-            self.busload_tx_data_bits += data_phase_bits
-
-            # send
-            self.can_if.send_frame(frame_id, data, dlc, is_fd)
-        except Exception as e:
-            log_exception(__file__, sys._getframe().f_lineno, e)
-
-    def process_received_frame(self, frame_id, data, dlc=None, is_fd=False):
+    def process_received_frame(
+        self, frame_id, data, dlc=None, is_fd=False, is_extended=False
+    ):
         try:
             # aggiorna il buffer/tabella RX
-            self.rx_window.update_frame(frame_id, data, dlc, is_fd)
+            self.rx_window.update_frame(
+                frame_id, data, dlc, is_fd, is_extended=is_extended
+            )
 
             # Aggiorna i gauge che mostrano questo frame ID
             for gauge in getattr(self, "gauges", []):
@@ -2165,6 +2334,22 @@ class MainWindow(QMainWindow):
         except Exception as e:
             log_exception(__file__, sys._getframe().f_lineno, e)
 
+    def process_received_batch(self, messages):
+        try:
+            # aggiorna il buffer/tabella RX con l'intero batch
+            self.rx_window.update_frames(messages)
+
+            # Aggiorna i gauge che mostrano i frame ID del batch
+            gauges = getattr(self, "gauges", [])
+            if gauges:
+                for msg in messages:
+                    for gauge in gauges:
+                        if gauge.cb_messages.currentData() == msg.arbitration_id:
+                            gauge.update_gauge(bytes(msg.data))
+
+        except Exception as e:
+            log_exception(__file__, sys._getframe().f_lineno, e)
+
     def open_xmetro_window(self):
         print("Opening XMetro window...")
 
@@ -2202,11 +2387,11 @@ class MainWindow(QMainWindow):
                 item = self.signal_tree.topLevelItem(i)
                 period_spin = self.signal_tree.itemWidget(item, TX_COL_5_period)
                 if period_spin is not None:
-                    period_value = int(period_spin.value())
+                    period_value = period_spin.value()
                 else:
                     try:
                         # Come fallback, leggi il dato salvato nell'item
-                        period_value = int(
+                        period_value = float(
                             item.data(TX_COL_PERIODDATA, TX_COL_PERIODDATA_period)
                         )
                     except Exception:
@@ -2220,6 +2405,9 @@ class MainWindow(QMainWindow):
                     "payload": item.text(TX_COL_6_payload),
                     "script_path": item.data(TX_COL_SCRIPTDATA, TX_COL_SCRIPTDATA_path),
                     "period": period_value,
+                    "high_resolution": bool(
+                        item.data(TX_COL_PERIODDATA, TX_COL_PERIODDATA_hires)
+                    ),
                 }
                 items.append((period_value, item_data))
 
@@ -2258,10 +2446,9 @@ class MainWindow(QMainWindow):
                         TX_COL_SCRIPTDATA, TX_COL_SCRIPTDATA_path, script_path
                     )
 
-                period_spin = QSpinBox()
-                period_spin.setRange(1, 10000)
-                period_spin.setValue(period_val)
-                self.signal_tree.setItemWidget(msg_item, TX_COL_5_period, period_spin)
+                period_spin = self._make_period_spin(
+                    msg_item, period_val, item_data["high_resolution"]
+                )
                 # Imposta solo il valore numerico come DisplayRole, non il testo
                 msg_item.setData(
                     TX_COL_PERIODDATA, TX_COL_PERIODDATA_period, period_spin.value()
@@ -2337,18 +2524,22 @@ class MainWindow(QMainWindow):
             )
 
     def timer_busload_elapsed(self):
-        # Sums of TX bits in arbitration phase and data phase (for CAN-FD)
+        # Sums of TX bits in arbitration phase and data phase (for CAN-FD);
+        # i bit TX sono letti e azzerati insieme, sotto lock
+        tx_arbitration_bits, tx_data_bits = self.take_busload_tx_bits()
         tot_arbitration_bits = (
-            self.rx_window.get_busload_rx_arbitration_bits()
-            + self.get_busload_tx_arbitration_bits()
-        )
-        tot_data_bits = (
-            self.rx_window.get_busload_rx_data_bits() + self.get_busload_tx_data_bits()
+            self.rx_window.get_busload_rx_arbitration_bits() + tx_arbitration_bits
         )
+        tot_data_bits = self.rx_window.get_busload_rx_data_bits() + tx_data_bits
+
+        # Stima dei bit inviati dai task ciclici nell'intervallo di refresh
+        for arbitration_bits, data_bits, period in self.tx_cyclic_bits.values():
+            frames = BUSLOAD_refresh_rate_ms / max(period, 1)
+            tot_arbitration_bits += arbitration_bits * frames
+            tot_data_bits += data_bits * frames
 
         # Stats reset
         self.rx_window.clear_busload_stats()
-        self.clear_busload_stats()
 
         # Extraction of values from selected baudrate
         label, pcan_val, real_data_val, real_arb_val = self.baudrate_values[
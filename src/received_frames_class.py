@@ -19,42 +19,110 @@
 # -----------------------------------------------------------------------------
 
 # TODO: controllare perché in RX non si ha la decodifica dei nomi facendo il LOAD di un .json nel quale era stato collegato un DBC
-# FIXME: in certi casi la tabella RX non si aggiorna correttamente (es. dopo aver fatto sorting) ed il nome è come fosse invertito rispetto a DLC, payload, count, ...
 
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHBoxLayout,
     QPushButton,
     QFileDialog,
     QStyle,
     QStyledItemDelegate,
+    QLabel,
+    QLineEdit,
+    QMenu,
+    QInputDialog,
+    QMessageBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
 )
-from PySide6.QtGui import QFont
-from PySide6.QtCore import Qt, QTimer, QDateTime
-import time
+from PySide6.QtGui import QActionGroup, QFont
+from PySide6.QtCore import QCoreApplication, QTimer, Signal
 import csv
+import os
 import sys
-import statistics
+import time
 from datetime import datetime
 
-from src.exceptions_logger import log_exception
-
-RX_refresh_rate_ms = 500
+import numpy as np
 
-# Rx column definition (see also setHorizontalHeaderLabels)
-RX_COL_0_id = 0
-RX_COL_1_name = 1
-RX_COL_2_dlc = 2
-RX_COL_3_payload = 3
-RX_COL_4_count = 4
-RX_COL_5_period = 5
-RX_COL_6_min = 6
-RX_COL_7_max = 7
-RX_COL_8_dev_std = 8
-RX_COL_9_last_received = 9
+from src.exceptions_logger import log_exception
+from src.dbc_loader import build_message_index
+from src.can_interface import (
+    CAN_SFF_MASK,
+    CAN_EFF_MASK,
+    parse_filter_text,
+    format_filter_text,
+)
+from src.rx_ring_buffer import RxRingBuffer, FRAME_FLAG_EXTENDED, FRAME_FLAG_FD
+from src.rx_statistics import (
+    RxStatsEngine,
+    RX_STATS_WINDOW,
+    RX_STATS_SKIP,
+    RX_STORE_MAX_IDS,
+    RX_STALE_ID_S,
+    format_rx_id,
+    histogram_bin_edges,
+    rx_keys,
+)
+from src.rx_timeout import RxTimeoutMonitor, RX_TIMEOUT_FACTOR
+from src.rx_logger import (
+    RX_LOG_COMPRESSIONS,
+    RX_LOG_SEGMENT_MB,
+    RX_LOG_SEGMENT_MIN,
+    RX_LOG_SUFFIXES,
+    RxLogBatch,
+    RxLogWriter,
+    rx_log_format,
+)
+from src.rx_table_model import (
+    RxSortFilterProxyModel,
+    RxTableModel,
+    RX_COL_0_id,
+    RX_COL_1_name,
+    RX_COL_2_dlc,
+    RX_COL_3_payload,
+    RX_COL_4_count,
+    RX_COL_5_period,
+    RX_COL_6_min,
+    RX_COL_7_max,
+    RX_COL_8_dev_std,
+    RX_COL_9_p50,
+    RX_COL_10_p95,
+    RX_COL_11_p99,
+    RX_COL_12_last_received,
+)
+from src.utils import bus_time
+
+RX_refresh_rate_ms = 500  # cadenza iniziale del refresh della tabella
+# Cadenza adattiva: il refresh occupa al più 1/RX_REFRESH_COST_FACTOR del
+# thread GUI, senza traffico rallenta, con la tabella nascosta si svuota solo il ring
+RX_REFRESH_MIN_MS = 200
+RX_REFRESH_MAX_MS = 1000
+RX_REFRESH_IDLE_MS = 1000
+RX_REFRESH_COST_FACTOR = 10
+RX_HIDDEN_DRAIN_MS = 250
+RX_PERCENTILES = (0.5, 0.95, 0.99)  # percentili dei periodi mostrati in tabella
+RX_TIMEOUT_CHECK_MS = 50  # cadenza del controllo delle deadline degli ID
+
+
+def frame_bits(dlc: int, is_fd: bool, is_extended: bool):
+    """Returns the (arbitration, data phase) bit count of a frame for the busload."""
+    # Conteggio compatto dei bit:
+    # arbitration = SOF(1) + ID(11|29) + RTR/IDE/RES(≈3) + DLC(4)
+    # data_phase = data(8*dlc) + CRC(+delim)
+    # NOTE: ACK/EOF/IFS sono trasmessi al nominale in CAN-FD -> spostarli in arbitration_bits per is_fd
+    arbitration_bits = 1 + (29 if is_extended else 11) + 3 + 4
+    if not is_fd:
+        crc_total = 15 + 1
+        data_phase_bits = 8 * dlc + crc_total + 2 + 7 + 3
+    else:
+        crc_total = (17 + 1) if dlc <= 16 else (21 + 1)
+        data_phase_bits = 8 * dlc + crc_total
+        arbitration_bits += 2 + 7 + 3
+    return arbitration_bits, data_phase_bits
 
 
 class PayloadEditDelegate(QStyledItemDelegate):
@@ -73,13 +141,84 @@ class PayloadEditDelegate(QStyledItemDelegate):
             option.font = font
 
 
+class RxTimeoutEventsWindow(QWidget):
+    """List of the RX IDs gone missing (deadline expired) and recovered."""
+
+    def __init__(self, rx_window):
+        super().__init__()
+        self.rx_window = rx_window
+        self.setWindowTitle("RX Timeouts")
+        self.resize(620, 400)
+        layout = QVBoxLayout()
+
+        self.table = QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels(
+            ["Time", "ID", "Name", "Event", "Expected (ms)", "Silence (ms)"]
+        )
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Stretch
+        )
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        self.btn_clear = QPushButton("Clear events")
+        self.btn_clear.setFixedSize(120, 30)
+        self.btn_clear.clicked.connect(self.clear_events)
+        btn_layout.addStretch(0)
+        btn_layout.addWidget(self.btn_clear)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def clear_events(self):
+        self.rx_window._rx_timeouts.events.clear()
+        self.refresh()
+
+    def refresh(self):
+        events = list(self.rx_window._rx_timeouts.events)
+        self.table.setRowCount(len(events))
+        # Eventi più recenti in alto
+        for row, event in enumerate(reversed(events)):
+            when = datetime.fromtimestamp(event.time).strftime("%H:%M:%S.%f")[:-3]
+            values = [
+                when,
+                format_rx_id(event.key),
+                self.rx_window._message_name(event.key),
+                "Missing" if event.missing else "Recovered",
+                f"{event.period_ms:.1f}",
+                f"{event.silence_ms:.1f}",
+            ]
+            for col, text in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(text))
+
+
 class ReceivedFramesWindow(QWidget):
+    # Emesso quando cambiano i filtri di accettazione RX (formato python-can)
+    filters_changed = Signal(list)
+
     def __init__(self, dbc=None):
         super().__init__()
         self.dbc = dbc
+        # ID -> (nome, lunghezza, segnali): sostituito in blocco da set_dbc()
+        self._dbc_index = build_message_index(dbc)
+        self.acceptance_filters = []
+        self.stats_window = RX_STATS_WINDOW  # periodi per media e dev. std
+        self.stats_skip = RX_STATS_SKIP  # primi periodi ignorati per ID
+        self.max_ids = RX_STORE_MAX_IDS  # ID tenuti in tabella e statistiche
+        self.stale_id_s = RX_STALE_ID_S  # rimozione degli ID fermi (0 = mai)
+        self._rx_stats = RxStatsEngine(  # <--- statistiche per ID, solo thread GUI
+            self.stats_window, self.stats_skip
+        )
+        self._rx_stats.set_cycle_times(self._dbc_cycle_times())
+        self._rx_timeouts = RxTimeoutMonitor(self._rx_stats, RX_TIMEOUT_FACTOR)
+        self._timeout_window = None  # RxTimeoutEventsWindow, creata al bisogno
+        self._frame_clock = None  # (timestamp dell'ultimo frame drenato, bus_time())
         self.csv_path = None
-        self.csv_file = None
-        self.csv_writer = None
+        self.log_raw = False  # CSV: trace grezza invece delle righe con statistiche
+        self.log_segment_mb = RX_LOG_SEGMENT_MB  # rotazione per dimensione (0 = no)
+        self.log_segment_min = RX_LOG_SEGMENT_MIN  # rotazione per durata (0 = no)
+        self.log_compression = None  # chiave di RX_LOG_COMPRESSIONS
+        self._log_writer = None  # RxLogWriter: formatta e scrive su un suo thread
         self.log_active = False
         self.log_paused = False
 
@@ -92,13 +231,39 @@ class ReceivedFramesWindow(QWidget):
         log_btn_layout = QHBoxLayout()
         # Pulsante per collegare il file CSV
         self.btn_link_csv = QPushButton("Link CSV")
-        self.btn_link_csv.setToolTip("Link a CSV file for logging")
+        self.btn_link_csv.setToolTip(
+            "Link a log file: CSV with statistics, raw CSV trace, BLF/ASC/MF4 trace\n"
+            "or CANino capture (.rxcap, fixed records with a time index)"
+        )
         self.btn_link_csv.setIcon(
             self.style().standardIcon(QStyle.StandardPixmap.SP_DriveFDIcon)
         )
         self.btn_link_csv.setFixedSize(120, 30)
         self.btn_link_csv.setCheckable(True)
 
+        # Pulsante per rotazione e compressione del log
+        self.btn_log_options = QPushButton("Options")
+        self.btn_log_options.setIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogDetailedView)
+        )
+        self.btn_log_options.setFixedSize(80, 30)
+        log_menu = QMenu(self.btn_log_options)
+        log_menu.addAction("Split by size...", self.edit_log_segment_size)
+        log_menu.addAction("Split by time...", self.edit_log_segment_time)
+        compression_menu = log_menu.addMenu("Compression")
+        self._log_compression_actions = QActionGroup(self)
+        for name in [None] + list(RX_LOG_COMPRESSIONS):
+            action = compression_menu.addAction(name or "None")
+            action.setCheckable(True)
+            action.setData(name)
+            self._log_compression_actions.addAction(action)
+        self._log_compression_actions.triggered.connect(
+            lambda action: self.set_log_settings(
+                self.log_segment_mb, self.log_segment_min, action.data()
+            )
+        )
+        self.btn_log_options.setMenu(log_menu)
+
         # Pulsante per avviare il log
         self.btn_start_log = QPushButton("Start LOG")
         self.btn_start_log.setToolTip("Start logging to CSV")
@@ -176,8 +341,71 @@ class ReceivedFramesWindow(QWidget):
         self.btn_pause_log.setEnabled(False)
         self.btn_stop_log.setEnabled(False)
 
+        # Pulsante per i filtri di accettazione (applicati nel driver)
+        self.btn_rx_filter = QPushButton("Filter")
+        self.btn_rx_filter.setIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogListView)
+        )
+        self.btn_rx_filter.setToolTip("RX acceptance filter: all frames accepted")
+        self.btn_rx_filter.setFixedSize(80, 30)
+        filter_menu = QMenu(self.btn_rx_filter)
+        filter_menu.addAction("Edit filter...", self.edit_acceptance_filters)
+        filter_menu.addAction("Only DBC IDs", self.set_dbc_acceptance_filters)
+        filter_menu.addAction("Accept all", lambda: self.set_acceptance_filters([]))
+        self.btn_rx_filter.setMenu(filter_menu)
+
+        # Pulsante per le impostazioni delle statistiche dei periodi
+        self.btn_rx_stats = QPushButton("Stats")
+        self.btn_rx_stats.setIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogInfoView)
+        )
+        self.btn_rx_stats.setFixedSize(80, 30)
+        stats_menu = QMenu(self.btn_rx_stats)
+        stats_menu.addAction("Statistics window...", self.edit_stats_window)
+        stats_menu.addAction("Ignore first periods...", self.edit_stats_skip)
+        stats_menu.addAction("Maximum IDs...", self.edit_max_ids)
+        stats_menu.addAction("Remove silent IDs...", self.edit_stale_id_timeout)
+        stats_menu.addAction("Timeout detection...", self.edit_timeout_factor)
+        stats_menu.addSeparator()
+        stats_menu.addAction("Export statistics...", self.export_statistics)
+        self.btn_rx_stats.setMenu(stats_menu)
+        self._update_stats_tooltip()
+
+        # ID in timeout ed elenco degli eventi di timeout/ritorno
+        self.btn_rx_timeouts = QPushButton("Timeouts")
+        self.btn_rx_timeouts.setIcon(
+            self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxWarning)
+        )
+        self.btn_rx_timeouts.setFixedSize(110, 30)
+        self.btn_rx_timeouts.clicked.connect(self.show_timeout_events)
+        self._update_timeout_button()
+
+        # Filtro di visualizzazione della tabella (non tocca i frame ricevuti)
+        self.rx_view_filter = QLineEdit()
+        self.rx_view_filter.setPlaceholderText("Search ID / name / 100-1FF")
+        self.rx_view_filter.setToolTip(
+            "Show only the rows whose ID or DBC name contains the text, "
+            "or whose ID is in the hex range lo-hi"
+        )
+        self.rx_view_filter.setClearButtonEnabled(True)
+        self.rx_view_filter.setFixedSize(200, 30)
+
+        # Stato del writer del log (dati scritti, coda, frame scartati)
+        self.lbl_log_stats = QLabel("")
+
+        # Contatore dei frame persi per overflow del ring RX
+        self.lbl_rx_overflow = QLabel("")
+        self.lbl_rx_overflow.setStyleSheet("color: #E57373;")
+
         log_btn_layout.addWidget(self.btn_clear_table)
+        log_btn_layout.addWidget(self.btn_rx_filter)
+        log_btn_layout.addWidget(self.btn_rx_stats)
+        log_btn_layout.addWidget(self.btn_rx_timeouts)
+        log_btn_layout.addWidget(self.rx_view_filter)
+        log_btn_layout.addWidget(self.lbl_rx_overflow)
         log_btn_layout.addStretch(0)
+        log_btn_layout.addWidget(self.lbl_log_stats)
+        log_btn_layout.addWidget(self.btn_log_options)
         log_btn_layout.addWidget(self.btn_link_csv)
         log_btn_layout.addWidget(self.btn_start_log)
         log_btn_layout.addWidget(self.btn_pause_log)
@@ -192,21 +420,12 @@ class ReceivedFramesWindow(QWidget):
         self.btn_stop_log.clicked.connect(self.stop_log)
 
         # --- Tabella RX ---
-        self.table = QTableWidget(0, 10)  # 10 colonne
-        self.table.setHorizontalHeaderLabels(
-            [
-                "ID",
-                "Name",
-                "DLC",
-                "Payload (0 - 7)",
-                "Count",
-                "Period (ms)",
-                "Min (ms)",
-                "Max (ms)",
-                "Dev. Std (ms)",
-                "Last Received",
-            ]
-        )
+        self.rx_model = RxTableModel(self)  # una riga per ID, indicizzata per ID
+        self.rx_proxy = RxSortFilterProxyModel(self)  # ordinamento e filtro
+        self.rx_proxy.setSourceModel(self.rx_model)
+        self.rx_view_filter.textChanged.connect(self.rx_proxy.set_filter_text)
+        self.table = QTableView()
+        self.table.setModel(self.rx_proxy)
         # Imposta larghezza colonne
         self.table.setColumnWidth(RX_COL_0_id, 50)
         self.table.setColumnWidth(RX_COL_1_name, 100)
@@ -217,29 +436,39 @@ class ReceivedFramesWindow(QWidget):
         self.table.setColumnWidth(RX_COL_6_min, 80)
         self.table.setColumnWidth(RX_COL_7_max, 80)
         self.table.setColumnWidth(RX_COL_8_dev_std, 100)
-        self.table.setColumnWidth(RX_COL_9_last_received, 140)
+        self.table.setColumnWidth(RX_COL_9_p50, 70)
+        self.table.setColumnWidth(RX_COL_10_p95, 70)
+        self.table.setColumnWidth(RX_COL_11_p99, 70)
+        self.table.setColumnWidth(RX_COL_12_last_received, 140)
 
         self.table.setItemDelegate(PayloadEditDelegate(self.table))
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
 
-        # Abilita l'ordinamento delle colonne
+        # Abilita l'ordinamento delle colonne (nel proxy, il modello resta com'è)
         self.table.setSortingEnabled(True)
-        self.table.horizontalHeader().sectionClicked.connect(
-            lambda _: self.frames.clear()
-        )  # Pulisci il mapping quando si riordinano le righe della tabella
-        # self.table.sortItems(0, Qt.SortOrder.AscendingOrder)
 
-        # Aggiungi un menu contestuale per rimuovere le righe
         layout.addWidget(self.table)
         self.setLayout(layout)
-        self.frames = {}
-        self._rx_buffer = {}  # <--- buffer temporaneo
+        self._rx_ring = RxRingBuffer()  # <--- frame dal thread RX al thread GUI
 
-        # Timer per aggiornare la tabella ogni secondo
+        # Timer di refresh della tabella: intervallo adattivo tra RX_REFRESH_MIN_MS
+        # e RX_REFRESH_MAX_MS secondo traffico, costo del refresh e visibilità
+        self.refresh_cost_ms = 0.0  # durata dell'ultimo refresh della tabella
         self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self.refresh_table)
-        self.refresh_timer.start(RX_refresh_rate_ms)  # ogni 500 ms
+        self.refresh_timer.timeout.connect(self._on_refresh_timer)
+        self.refresh_timer.start(RX_refresh_rate_ms)
+
+        # Timer per le deadline degli ID (timeout), indipendente dal refresh
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.timeout.connect(self._process_rx_ring)
+        self._update_timeout_timer()
+        self._update_log_options()
+
+        # Alla chiusura dell'app il writer scrive su disco quanto ha in coda
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._on_about_to_quit)
 
     def clear_busload_stats(self):
         self.busload_rx_arbitration_bits = 0
@@ -251,177 +480,533 @@ class ReceivedFramesWindow(QWidget):
     def get_busload_rx_data_bits(self):
         return self.busload_rx_data_bits
 
+    def set_acceptance_filters(self, filters):
+        self.acceptance_filters = list(filters)
+        if self.acceptance_filters:
+            self.btn_rx_filter.setStyleSheet("background-color: #1565C0; color: white;")
+            self.btn_rx_filter.setToolTip(
+                f"RX acceptance filter: {format_filter_text(self.acceptance_filters)}"
+            )
+        else:
+            self.btn_rx_filter.setStyleSheet("")
+            self.btn_rx_filter.setToolTip("RX acceptance filter: all frames accepted")
+        self.filters_changed.emit(self.acceptance_filters)
+
+    def edit_acceptance_filters(self):
+        text, ok = QInputDialog.getText(
+            self,
+            "RX Filter",
+            "Hex IDs to receive, comma separated, optional /mask\n"
+            "and 'x' suffix for 29-bit IDs (e.g. 100, 200/7F0, 18FEF100x).\n"
+            "Leave empty to accept all frames:",
+            text=format_filter_text(self.acceptance_filters),
+        )
+        if not ok:
+            return
+        try:
+            filters = parse_filter_text(text)
+        except ValueError as e:
+            QMessageBox.warning(self, "RX Filter", f"Invalid filter: {e}")
+            return
+        self.set_acceptance_filters(filters)
+
+    def set_dbc_acceptance_filters(self):
+        if not self.dbc or not getattr(self.dbc, "messages", None):
+            QMessageBox.warning(self, "DBC", "Load a DBC file first!")
+            return
+        filters = []
+        for msg in self.dbc.messages:
+            extended = bool(getattr(msg, "is_extended_frame", False))
+            filters.append(
+                {
+                    "can_id": msg.frame_id,
+                    "can_mask": CAN_EFF_MASK if extended else CAN_SFF_MASK,
+                    "extended": extended,
+                }
+            )
+        self.set_acceptance_filters(filters)
+
+    def set_statistics_settings(self, window, skip):
+        self.stats_window = max(1, int(window))
+        self.stats_skip = max(0, int(skip))
+        self._rx_stats.reconfigure(self.stats_window, self.stats_skip)
+        self._update_stats_tooltip()
+
+    def edit_stats_window(self):
+        window, ok = QInputDialog.getInt(
+            self,
+            "RX Statistics",
+            "Number of periods used for the standard deviation:",
+            self.stats_window,
+            1,
+            10000,
+        )
+        if ok:
+            self.set_statistics_settings(window, self.stats_skip)
+
+    def edit_stats_skip(self):
+        skip, ok = QInputDialog.getInt(
+            self,
+            "RX Statistics",
+            "Number of initial periods of each ID ignored by the standard deviation:",
+            self.stats_skip,
+            0,
+            10000,
+        )
+        if ok:
+            self.set_statistics_settings(self.stats_window, skip)
+
+    def set_store_settings(self, max_ids, stale_id_s):
+        self.max_ids = max(1, int(max_ids))
+        self.stale_id_s = max(0.0, float(stale_id_s))
+        self._evict_ids()
+        self._update_stats_tooltip()
+
+    def edit_max_ids(self):
+        max_ids, ok = QInputDialog.getInt(
+            self,
+            "RX Statistics",
+            "Maximum number of IDs kept (the least recently received are removed):",
+            self.max_ids,
+            1,
+            1 << 20,
+        )
+        if ok:
+            self.set_store_settings(max_ids, self.stale_id_s)
+
+    def edit_stale_id_timeout(self):
+        stale_id_s, ok = QInputDialog.getDouble(
+            self,
+            "RX Statistics",
+            "Remove the IDs not received for this many seconds (0 = never):",
+            self.stale_id_s,
+            0.0,
+            86400.0,
+            1,
+        )
+        if ok:
+            self.set_store_settings(self.max_ids, stale_id_s)
+
+    @property
+    def timeout_factor(self):
+        return self._rx_timeouts.factor
+
+    def set_timeout_factor(self, factor):
+        monitor = self._rx_timeouts
+        monitor.factor = max(0.0, float(factor))
+        if not monitor.factor and monitor.missing:
+            # Rilevamento spento: nessun ID resta segnalato come mancante
+            keys = monitor.release_missing(self._frame_time())
+            self.rx_model.set_highlighted(keys, False)
+            if self._timeout_window is not None and self._timeout_window.isVisible():
+                self._timeout_window.refresh()
+        self._update_timeout_timer()
+        self._update_timeout_button()
+
+    def _update_timeout_timer(self):
+        # Deadline controllate ogni RX_TIMEOUT_CHECK_MS solo con il rilevamento
+        # attivo e la tabella visibile; altrimenti bastano i drain del refresh
+        if self._rx_timeouts.factor and self._table_visible():
+            if not self.timeout_timer.isActive():
+                self.timeout_timer.start(RX_TIMEOUT_CHECK_MS)
+        else:
+            self.timeout_timer.stop()
+
+    def edit_timeout_factor(self):
+        factor, ok = QInputDialog.getDouble(
+            self,
+            "RX Timeouts",
+            "An ID is missing after this many expected periods without frames\n"
+            "(period from the DBC cycle time, else learned; 0 = off):",
+            self._rx_timeouts.factor,
+            0.0,
+            1000.0,
+            1,
+        )
+        if ok:
+            self.set_timeout_factor(factor)
+
+    def set_log_settings(self, segment_mb, segment_min, compression):
+        # Valgono dal prossimo Start LOG
+        self.log_segment_mb = max(0, int(segment_mb))
+        self.log_segment_min = max(0.0, float(segment_min))
+        self.log_compression = (
+            compression if compression in RX_LOG_COMPRESSIONS else None
+        )
+        self._update_log_options()
+
+    def _update_log_options(self):
+        for action in self._log_compression_actions.actions():
+            action.setChecked(action.data() == self.log_compression)
+        split = [
+            f"every {self.log_segment_mb} MB" if self.log_segment_mb else "",
+            f"every {self.log_segment_min:g} min" if self.log_segment_min else "",
+        ]
+        split = " or ".join(part for part in split if part) or "never"
+        self.btn_log_options.setToolTip(
+            f"Log files split: {split}\n"
+            f"Compression (CSV/ASC): {self.log_compression or 'none'}\n"
+            "Applied at the next Start LOG"
+        )
+
+    def edit_log_segment_size(self):
+        segment_mb, ok = QInputDialog.getInt(
+            self,
+            "LOG",
+            "Start a new log file every this many MB on disk (0 = never):",
+            self.log_segment_mb,
+            0,
+            1 << 20,
+        )
+        if ok:
+            self.set_log_settings(
+                segment_mb, self.log_segment_min, self.log_compression
+            )
+
+    def edit_log_segment_time(self):
+        segment_min, ok = QInputDialog.getDouble(
+            self,
+            "LOG",
+            "Start a new log file every this many minutes of traffic (0 = never):",
+            self.log_segment_min,
+            0.0,
+            10080.0,
+            1,
+        )
+        if ok:
+            self.set_log_settings(
+                self.log_segment_mb, segment_min, self.log_compression
+            )
+
+    def show_timeout_events(self):
+        if self._timeout_window is None:
+            self._timeout_window = RxTimeoutEventsWindow(self)
+        self._timeout_window.refresh()
+        self._timeout_window.show()
+        self._timeout_window.raise_()
+
+    def _apply_timeout_events(self, events):
+        if not events:
+            return
+        self.rx_model.set_highlighted(
+            [event.key for event in events if event.missing], True
+        )
+        self.rx_model.set_highlighted(
+            [event.key for event in events if not event.missing], False
+        )
+        self._update_timeout_button()
+        if self._timeout_window is not None and self._timeout_window.isVisible():
+            self._timeout_window.refresh()
+
+    def _update_timeout_button(self):
+        monitor = self._rx_timeouts
+        missing = len(monitor.missing)
+        self.btn_rx_timeouts.setText(f"Timeouts ({missing})" if missing else "Timeouts")
+        self.btn_rx_timeouts.setStyleSheet(
+            "background-color: #C62828; color: white;" if missing else ""
+        )
+        detection = (
+            f"missing after {monitor.factor:g} x the expected period"
+            if monitor.factor
+            else "detection off"
+        )
+        self.btn_rx_timeouts.setToolTip(
+            f"RX timeouts: {detection}\n"
+            f"{missing} IDs missing now, {monitor.timeout_count} timeouts in total"
+        )
+
+    def _update_stats_tooltip(self):
+        stats = self._rx_stats
+        stale = (
+            f"IDs silent for {self.stale_id_s:g} s removed"
+            if self.stale_id_s
+            else "silent IDs kept"
+        )
+        self.btn_rx_stats.setToolTip(
+            f"Period statistics: dev. std over the last {self.stats_window} periods, "
+            f"first {self.stats_skip} periods of each ID ignored\n"
+            f"IDs: {len(stats)} of max {self.max_ids}, {stale}\n"
+            f"Removed: {stats.evicted_stale} silent, "
+            f"{stats.evicted_lru} over the maximum"
+        )
+
+    def export_statistics(self):
+        """Exports the period statistics and histogram of every RX ID to CSV."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export RX statistics", "", "CSV Files (*.csv)"
+        )
+        if not path:
+            return
+        self._process_rx_ring()
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(
+                    [
+                        "ID",
+                        "Name",
+                        "Count",
+                        "Period EMA (ms)",
+                        "Mean (ms)",
+                        "Min (ms)",
+                        "Max (ms)",
+                        "Std.Dev (ms)",
+                        "P50 (ms)",
+                        "P95 (ms)",
+                        "P99 (ms)",
+                        "Histogram (ms range:count)",
+                    ]
+                )
+                rows = self._rx_stats.snapshot(
+                    self._rx_stats.all_slots(), RX_PERCENTILES
+                )
+                for row in sorted(rows, key=lambda r: r["key"]):
+                    histogram = " ".join(
+                        "{:.3g}-{:.3g}:{}".format(*histogram_bin_edges(i), count)
+                        for i, count in enumerate(
+                            self._rx_stats.histogram[row["slot"]].tolist()
+                        )
+                        if count
+                    )
+                    writer.writerow(
+                        [format_rx_id(row["key"]), self._message_name(row["key"])]
+                        + [row["count"]]
+                        + [
+                            f"{value:.3f}" if value is not None else ""
+                            for value in (
+                                row["ema"],
+                                row["mean"],
+                                row["min"],
+                                row["max"],
+                                row["std"],
+                                *row["percentiles"],
+                            )
+                        ]
+                        + [histogram]
+                    )
+        except OSError as e:
+            QMessageBox.warning(self, "Export", f"Cannot write file: {e}")
+            log_exception(__file__, sys._getframe().f_lineno, e)
+
     def clear_rx_table(self):
-        self.table.setRowCount(0)
-        self._rx_buffer.clear()
+        self.rx_model.clear()
+        self._rx_ring.discard()
+        self._rx_stats.clear()
+        self._rx_timeouts.clear()
+        self._update_stats_tooltip()
+        self._update_timeout_button()
+        if self._timeout_window is not None:
+            self._timeout_window.refresh()
+
+    def update_frames(self, messages):
+        """
+        Receive thread side: accounts the busload and queues a batch of
+        can.Message objects into the RX ring, drained by refresh_table().
+        """
+        arbitration_bits = 0
+        data_bits = 0
+        for msg in messages:
+            arb, data_phase = frame_bits(len(msg.data), msg.is_fd, msg.is_extended_id)
+            arbitration_bits += arb
+            data_bits += data_phase
+
+        # aggiorna i contatori RX (arbitration parte a nominale, data parte a data-rate per FD)
+        self.busload_rx_arbitration_bits += arbitration_bits
+        self.busload_rx_data_bits += data_bits
+
+        self._rx_ring.push_messages(messages)
 
     def update_frame(
-        self, frame_id: int, data: bytes, dlc: int = None, is_fd: bool = False
+        self,
+        frame_id: int,
+        data: bytes,
+        dlc: int = None,
+        is_fd: bool = False,
+        timestamp: float = None,
+        is_extended: bool = False,
     ):
-        # Aggiorna solo il buffer, non la tabella direttamente
-
         # determina DLC se non fornito
         if dlc is None:
             dlc = len(data) if data else 0
         dlc = max(0, min(int(dlc), 64))
+        data = bytes(data[:dlc])
 
-        # heuristica extended ID
-        is_extended = isinstance(frame_id, int) and frame_id > 0x7FF
-
-        # Conteggio compatto dei bit:
-        # arbitration = SOF(1) + ID(11|29) + RTR/IDE/RES(≈3) + DLC(4)
-        # data_phase = data(8*dlc) + CRC(+delim)
-        # NOTE: ACK/EOF/IFS sono trasmessi al nominale in CAN-FD -> spostarli in arbitration_bits per is_fd
-        arbitration_bits = 1 + (29 if is_extended else 11) + 3 + 4
-        if not is_fd:
-            crc_total = 15 + 1
-            data_phase_bits = 8 * dlc + crc_total + 2 + 7 + 3
-        else:
-            crc_total = (17 + 1) if dlc <= 16 else (21 + 1)
-            data_phase_bits = 8 * dlc + crc_total
-            arbitration_bits += 2 + 7 + 3
+        arb, data_phase = frame_bits(dlc, is_fd, is_extended)
+        self.busload_rx_arbitration_bits += arb
+        self.busload_rx_data_bits += data_phase
 
-        # aggiorna i contatori RX (arbitration parte a nominale, data parte a data-rate per FD)
-        self.busload_rx_arbitration_bits += arbitration_bits
-        self.busload_rx_data_bits += data_phase_bits
-
-        now = time.time()
-        if frame_id not in self._rx_buffer:  # Nuovo frame
-            self._rx_buffer[frame_id] = {
-                "count": 1,
-                "dlc": dlc if dlc is not None else len(data),
-                "data": data,
-                "last_time": now,
-                "periods": [0],
-                "min": None,
-                "max": None,
-                "avg_period": None,
-            }
-        else:  # Frame già esistente
-            f = self._rx_buffer[frame_id]
-
-            self.log_frame_to_csv(
-                frame_id=frame_id,
-                data=f["data"],
-                dlc=f["dlc"],
-                count=f["count"],
-                # min=f["min"],
-                # max=f["max"],
-                avg_period=f["avg_period"],
-                periods=f["periods"],
+        flags = (FRAME_FLAG_FD if is_fd else 0) | (
+            FRAME_FLAG_EXTENDED if is_extended else 0
+        )
+        if not timestamp:
+            timestamp = bus_time()
+        self._rx_ring.push(timestamp, frame_id, flags, data)
+
+    def _process_rx_ring(self):
+        # GUI thread: svuota il ring ed aggiorna le statistiche per ID in blocco
+        # I periodi sono calcolati sui timestamp dei frame (hardware o monotoni),
+        # non sull'istante in cui il thread Python li ha visti
+        timestamps, ids, flags, dlcs, data = self._rx_ring.drain_arrays()
+        if len(ids):
+            self._frame_clock = (float(timestamps.max()), bus_time())
+            keys = rx_keys(ids, flags)
+            slots = self._rx_stats.update(timestamps, keys, dlcs, data)
+            if self.log_active and not self.log_paused and self._log_writer:
+                self._log_batch(timestamps, keys, flags, dlcs, data, slots)
+            self._apply_timeout_events(
+                self._rx_timeouts.frames_received(timestamps, slots)
+            )
+        self._evict_ids()
+
+        # Le deadline sono sui timestamp dei frame: prima del primo frame non
+        # c'è ancora una base dei tempi (né ID da controllare)
+        if self._frame_clock is not None:
+            now = self._frame_time()
+            self._rx_timeouts.arm(self._rx_stats.take_new_keys(), now)
+            self._apply_timeout_events(self._rx_timeouts.tick(now))
+
+        overflows = self._rx_ring.overflow_count
+        if overflows:
+            self.lbl_rx_overflow.setText(f"RX overflow: {overflows}")
+            self.lbl_rx_overflow.setToolTip(
+                f"Frames dropped because the table could not keep up "
+                f"(ring size {self._rx_ring.capacity}, peak fill {self._rx_ring.high_watermark})"
             )
 
-            f["count"] += 1
-            period = (now - f["last_time"]) * 1000
-            f["last_time"] = now
-            f["dlc"] = len(data)
-            f["data"] = data
-            f["periods"].append(period)
-
-            if f["min"] is None:  # primo aggiornamento
-                f["min"] = period
-            else:
-                f["min"] = period if period < f["min"] else f["min"]
-
-            if f["max"] is None:  # primo aggiornamento
-                f["max"] = period
-            else:
-                f["max"] = period if period > f["max"] else f["max"]
-
-            if f["avg_period"] is None:  # primo aggiornamento
-                f["avg_period"] = period
-            else:  # aggiorna l'EMA
-                f["avg_period"] = 0.1 * period + 0.9 * f["avg_period"]
-
-            if (
-                len(f["periods"]) > 20 or f["count"] < 5
-            ):  # Limita a 20 periodi per evitare overflow butta i primi 5 per calcolare la deviazione standard
-                f["periods"].pop(0)  # rimuovi il più vecchio
+    def _frame_time(self):
+        # Istante corrente nella base dei timestamp dei frame (last_time):
+        # l'ultimo frame drenato più il tempo trascorso da quel drain
+        if self._frame_clock is None:
+            return bus_time()
+        last_frame, drained_at = self._frame_clock
+        return last_frame + (bus_time() - drained_at)
+
+    def _evict_ids(self):
+        # Tiene limitata la memoria con catture lunghe (J1939, ID extended variabili)
+        stats = self._rx_stats
+        if len(stats) <= self.max_ids and not self.stale_id_s:
+            return
+        evicted = stats.evict(self._frame_time(), self.stale_id_s, self.max_ids)
+        if len(evicted):
+            self.rx_model.remove_keys(evicted.tolist())
+            self._rx_timeouts.forget(evicted)
+            self._update_stats_tooltip()
+            self._update_timeout_button()
+
+    def _table_visible(self):
+        return (
+            self.isVisible()
+            and not self.window().isMinimized()
+            and not self.table.visibleRegion().isEmpty()
+        )
 
-    def refresh_table(self):
-        for frame_id, f in self._rx_buffer.items():
-            id_str = f"0x{frame_id:03X}"
-            row = None
-            # Cerca la riga con l'ID giusto (colonna 0)
-            for r in range(self.table.rowCount()):
-                item = self.table.item(r, 0)
-                if item and item.text() == id_str:
-                    row = r
-                    break
-            if row is None:
-                # crea nuova riga
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-                self.table.setItem(row, RX_COL_0_id, QTableWidgetItem(id_str))
-            # Aggiorna sempre il nome dalla DBC (anche se già presente)
-            msg_name = ""
-            if self.dbc and hasattr(self.dbc, "db"):
-                try:
-                    msg = self.dbc.db.get_message_by_frame_id(frame_id)
-                    if msg:
-                        msg_name = msg.name
-                except Exception:
-                    pass
-
-            self.table.setItem(row, RX_COL_1_name, QTableWidgetItem(msg_name))
-            self.table.setItem(row, RX_COL_2_dlc, QTableWidgetItem(str(f["dlc"])))
-            self.table.setItem(
-                row,
-                RX_COL_3_payload,
-                QTableWidgetItem(" ".join(f"{b:02X}" for b in f["data"])),
-            )
-            self.table.setItem(row, RX_COL_4_count, QTableWidgetItem(str(f["count"])))
-            self.table.setItem(
-                row,
-                RX_COL_5_period,
-                QTableWidgetItem(f"{f['avg_period']:.1f}" if f["avg_period"] else "-"),
-            )
-            self.table.setItem(
-                row,
-                RX_COL_6_min,
-                QTableWidgetItem(f"{f['min']:.1f}" if f["min"] else "-"),
-            )
-            self.table.setItem(
-                row,
-                RX_COL_7_max,
-                QTableWidgetItem(f"{f['max']:.1f}" if f["max"] else "-"),
-            )
+    def _on_refresh_timer(self):
+        if not self._table_visible():
+            # Niente da disegnare: svuota solo il ring, le statistiche restano
+            # aggiornate e le righe modificate verranno mostrate tutte al ritorno
+            self._process_rx_ring()
+            self.refresh_timer.setInterval(RX_HIDDEN_DRAIN_MS)
+            self._update_timeout_timer()
+            return
 
-            std_dev = statistics.pstdev(f["periods"]) if len(f["periods"]) > 1 else 0.0
-            self.table.setItem(
-                row,
-                RX_COL_8_dev_std,
-                QTableWidgetItem(f"{std_dev:.1f}" if std_dev else "-"),
+        self._update_timeout_timer()
+        self._update_log_stats()
+        start = time.perf_counter()
+        updated = self.refresh_table()
+        self.refresh_cost_ms = (time.perf_counter() - start) * 1000.0
+        if not updated:
+            interval = RX_REFRESH_IDLE_MS
+        else:
+            interval = min(
+                max(self.refresh_cost_ms * RX_REFRESH_COST_FACTOR, RX_REFRESH_MIN_MS),
+                RX_REFRESH_MAX_MS,
             )
+        self.refresh_timer.setInterval(int(interval))
 
-            last_recv = QDateTime.fromSecsSinceEpoch(int(f["last_time"]))
-            self.table.setItem(
-                row,
-                RX_COL_9_last_received,
-                QTableWidgetItem(last_recv.toString(Qt.DateFormat.ISODate)),
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Recupera in un solo passo tutto ciò che è arrivato mentre era nascosta
+        self.refresh_timer.start(0)
+
+    def refresh_table(self):
+        """Drains the RX ring and updates the rows changed since the last call; returns their number."""
+        self._process_rx_ring()
+
+        # Solo gli ID ricevuti dall'ultimo refresh: gli ID fermi non costano nulla
+        rows = self._rx_stats.snapshot(self._rx_stats.take_dirty(), RX_PERCENTILES)
+        self.rx_model.set_rows(
+            (
+                row["key"],
+                [
+                    row["key"],
+                    self._message_name(row["key"]),
+                    row["dlc"],
+                    row["data"],
+                    row["count"],
+                    row["ema"],
+                    row["min"],
+                    row["max"],
+                    row["std"],
+                    *row["percentiles"],
+                    row["last_time"],
+                ],
             )
+            for row in rows
+        )
+        return len(rows)
+
+    def _message_name(self, key):
+        info = self._dbc_index.get(key)
+        return info.name if info is not None else ""
 
     def set_dbc(self, dbc):
         self.dbc = dbc
+        self._dbc_index = build_message_index(dbc)  # sostituzione atomica
+        self._rx_stats.set_cycle_times(self._dbc_cycle_times())
         # Aggiorna i nomi dei messaggi già presenti in tabella
-        for frame_id, f in self.frames.items():
-            row = f["row"]
-            msg_name = ""
-            if self.dbc and hasattr(self.dbc, "db"):
-                try:
-                    msg = self.dbc.db.get_message_by_frame_id(frame_id)
-                    if msg:
-                        msg_name = msg.name
-                except Exception:
-                    pass
-            self.table.setItem(row, RX_COL_1_name, QTableWidgetItem(msg_name))
+        self.rx_model.set_column(
+            RX_COL_1_name,
+            {
+                key: self._message_name(key)
+                for key in self._rx_stats.keys[: len(self._rx_stats)].tolist()
+            },
+        )
+
+    def _dbc_cycle_times(self):
+        # Periodo atteso (ms) degli ID che nella DBC hanno un cycle_time
+        return {
+            key: info.cycle_time
+            for key, info in self._dbc_index.items()
+            if info.cycle_time
+        }
 
     def link_csv_file(self):
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Select CSV file", "", "CSV Files (*.csv)"
+        # Il formato del log segue l'estensione: CSV (con statistiche o grezzo),
+        # trace python-can (BLF/ASC/MF4) con i timestamp originali dei frame
+        # o capture nativa a record fissi (.rxcap)
+        filters = {
+            "CSV Files (*.csv)": ".csv",
+            "CSV raw trace (*.csv)": ".csv",
+            "BLF Files (*.blf)": ".blf",
+            "ASC Files (*.asc)": ".asc",
+            "MF4 Files (*.mf4)": ".mf4",
+            "CANino capture (*.rxcap)": ".rxcap",
+        }
+        path, selected = QFileDialog.getSaveFileName(
+            self,
+            "Select log file",
+            "",
+            ";;".join(name for name, ext in filters.items() if ext in RX_LOG_SUFFIXES),
+            "CSV raw trace (*.csv)" if self.log_raw else "",
         )
         if path:
+            # Il log in corso sul file precedente viene chiuso con i frame ricevuti
+            self._process_rx_ring()
+            self._close_log_writer()
+            if os.path.splitext(path)[1].lower() not in RX_LOG_SUFFIXES:
+                path += filters.get(selected, ".csv")
             self.csv_path = path
+            self.log_raw = selected == "CSV raw trace (*.csv)"
 
             self.btn_start_log.setText("Start LOG")
             self.btn_start_log.setToolTip("Start logging to CSV")
@@ -458,59 +1043,94 @@ class ReceivedFramesWindow(QWidget):
             self.log_active = False
             self.log_paused = False
 
-    def log_frame_to_csv(self, frame_id, data, dlc, count, avg_period, periods):
-        """
-        Logs a single CAN frame to CSV, if logging is active and not paused.
-        """
-        if self.log_active and not self.log_paused and self.csv_writer:
-            try:
-                timestamp = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%f")
-                id_str = f"0x{frame_id:03X}"
-                msg_name = ""
-                if self.dbc and hasattr(self.dbc, "db"):
-                    try:
-                        msg = self.dbc.db.get_message_by_frame_id(frame_id)
-                        if msg:
-                            msg_name = msg.name
-                    except Exception:
-                        pass
-                payload_str = " ".join(f"{b:02X}" for b in data)
-                std_dev = statistics.pstdev(periods) if len(periods) > 1 else 0.0
-                self.csv_writer.writerow(
-                    [
-                        timestamp,
-                        id_str,
-                        msg_name,
-                        dlc,
-                        payload_str,
-                        count,
-                        f"{avg_period:.1f}" if avg_period else "-",
-                        f"{std_dev:.1f}" if std_dev else "-",
-                    ]
-                )
-                self.csv_file.flush()
-            except Exception as e:
-                log_exception(__file__, sys._getframe().f_lineno, e)
+    def _log_batch(self, timestamps, keys, flags, dlcs, data, slots):
+        if not self._log_writer.fmt.with_stats:
+            self._log_writer.submit(RxLogBatch(timestamps, keys, flags, dlcs, data))
+            return
+        # EMA e dev. std sono quelle dell'ID dopo l'aggiornamento del blocco;
+        # il contatore di ogni frame è il totale dell'ID meno i frame arrivati dopo
+        stats = self._rx_stats
+        unique_slots, inverse = np.unique(slots, return_inverse=True)
+        order = np.argsort(slots, kind="stable")
+        grouped = slots[order]
+        starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        sizes = np.diff(np.r_[starts, len(slots)])
+        later = np.empty(len(slots), dtype=np.int64)
+        later[order] = np.repeat(starts + sizes, sizes) - 1 - np.arange(len(slots))
+        self._log_writer.submit(
+            RxLogBatch(
+                timestamps,
+                keys,
+                flags,
+                dlcs,
+                data,
+                stats.count[slots] - later,
+                stats.ema[slots],
+                stats.window_std(unique_slots)[inverse],
+            )
+        )
+
+    def _update_log_stats(self):
+        writer = self._log_writer
+        if writer is None:
+            return
+        text = f"LOG {writer.bytes_written / 1e6:.1f} MB"
+        if writer.pending_frames:
+            text += f", queue {writer.pending_frames}"
+        if writer.dropped_frames:
+            text += f", dropped {writer.dropped_frames}"
+        self.lbl_log_stats.setText(text)
+        self.lbl_log_stats.setStyleSheet(
+            "color: #E57373;" if writer.dropped_frames or writer.write_errors else ""
+        )
+        segment = (
+            f"segment {writer.segment_index}, manifest {writer.manifest_path()}\n"
+            if writer.rotating
+            else ""
+        )
+        self.lbl_log_stats.setToolTip(
+            f"{writer.path}\n"
+            f"{segment}"
+            f"{writer.frames_written} frames, {writer.bytes_written} bytes written\n"
+            f"{writer.pending_frames} frames queued, "
+            f"{writer.dropped_frames} dropped (disk too slow), "
+            f"{writer.write_errors} write errors"
+        )
+
+    def _on_about_to_quit(self):
+        # I frame ricevuti dall'ultimo refresh vanno nel log prima di chiuderlo
+        self._process_rx_ring()
+        self._close_log_writer()
+
+    def _close_log_writer(self):
+        if self._log_writer is not None:
+            self._log_writer.stop()
+            self._update_log_stats()
+            self._log_writer = None
 
     def start_log(self):  # metodo per avviare il log e aprire il file CSV
         if not self.csv_path:
             return
         # Se il log era stoppato, pulisci il file
-        if not self.log_active or not self.csv_file:
-            self.csv_file = open(self.csv_path, "w", newline="", encoding="utf-8")
-            self.csv_writer = csv.writer(self.csv_file)
-            self.csv_writer.writerow(
-                [
-                    "Timestamp",
-                    "ID",
-                    "Name",
-                    "DLC",
-                    "Payload",
-                    "Count",
-                    "Period (ms)",
-                    "Std.Dev (ms)",
-                ]
-            )
+        if not self.log_active or not self._log_writer:
+            try:
+                writer = RxLogWriter(
+                    self.csv_path,
+                    rx_log_format(
+                        self.csv_path,
+                        self._message_name,
+                        self.log_raw,
+                        self.log_compression,
+                    ),
+                    segment_bytes=self.log_segment_mb << 20,
+                    segment_s=self.log_segment_min * 60.0,
+                )
+                writer.start()
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, "LOG", f"Cannot open file: {e}")
+                log_exception(__file__, sys._getframe().f_lineno, e)
+                return
+            self._log_writer = writer
 
         self.log_active = True
         self.log_paused = False
@@ -559,6 +1179,7 @@ class ReceivedFramesWindow(QWidget):
 
     def pause_log(self):  # metodo per mettere in pausa il log e non chiudere il file
         if self.log_active:
+            self._process_rx_ring()  # logga i frame ricevuti prima della pausa
             self.log_paused = True
 
             self.btn_start_log.setText("Resume LOG")
@@ -605,6 +1226,8 @@ class ReceivedFramesWindow(QWidget):
             # Non chiudere il file, solo mettere in pausa
 
     def stop_log(self):  # metodo per fermare il log e chiudere il file
+        # I frame ricevuti dall'ultimo refresh vanno nel log prima di chiuderlo
+        self._process_rx_ring()
         self.log_active = False
         self.log_paused = False
 
@@ -647,7 +1270,4 @@ class ReceivedFramesWindow(QWidget):
         """
         )  # Bordo e interno rosso
 
-        if self.csv_file:
-            self.csv_file.close()
-            self.csv_file = None
-            self.csv_writer = None
+        self._close_log_writer()
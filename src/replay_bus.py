@@ -0,0 +1,101 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+import time
+import can
+
+from src.utils import bus_time
+
+
+class ReplayBus(can.BusABC):
+    """
+    Read-only python-can bus that replays a trace file (BLF, ASC, CSV, TRC, ...)
+    with its original timing. Timestamps are shifted onto the live bus timebase,
+    transmitted frames are discarded.
+    """
+
+    def __init__(self, channel, speed: float = 1.0, loop: bool = True, **kwargs):
+        self.filename = str(channel)
+        self.speed = speed if speed > 0 else 1.0
+        self.loop = loop
+        self.channel_info = f"Replay: {self.filename}"
+        self._reader = None
+        self._pending = None
+        self._start_log_time = None
+        self._start_bus_time = None
+        self._offset = 0.0  # spostamento accumulato tra un giro e l'altro
+        self._last_log_time = 0.0
+        self._open_reader()
+        super().__init__(channel=channel, **kwargs)
+
+    def _open_reader(self):
+        self._reader = iter(can.LogReader(self.filename))
+
+    def _next_message(self):
+        while True:
+            try:
+                msg = next(self._reader)
+            except StopIteration:
+                if not self.loop or self._start_log_time is None:
+                    return None
+                # Ricomincia il file proseguendo la base tempi del giro precedente
+                self._offset += self._last_log_time - self._start_log_time
+                self._start_log_time = None
+                self._open_reader()
+                continue
+            if msg.is_error_frame:
+                continue
+            return msg
+
+    def _recv_internal(self, timeout):
+        if self._pending is None:
+            self._pending = self._next_message()
+            if self._pending is None:
+                if timeout:
+                    time.sleep(timeout)
+                return None, False
+
+        msg = self._pending
+        if self._start_log_time is None:
+            self._start_log_time = msg.timestamp
+            if self._start_bus_time is None:
+                self._start_bus_time = bus_time()
+
+        log_elapsed = self._offset + msg.timestamp - self._start_log_time
+        due = self._start_bus_time + log_elapsed / self.speed
+        wait = due - bus_time()
+        if wait > 0:
+            if timeout is not None and wait > timeout:
+                time.sleep(timeout)
+                return None, False
+            time.sleep(wait)
+
+        self._pending = None
+        self._last_log_time = msg.timestamp
+        msg.timestamp = due
+        msg.channel = self.filename
+        return msg, False
+
+    def send(self, msg, timeout=None):
+        pass  # il replay è in sola lettura
+
+    def shutdown(self):
+        self._reader = None
+        super().shutdown()
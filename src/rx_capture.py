@@ -0,0 +1,272 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+Native RX capture file (.rxcap): fixed-size binary records appended through
+a memory map, plus a sparse time index in a .idx sidecar file.
+
+Layout: a 64 byte header (RX_CAPTURE_HEADER) followed by RX_CAPTURE_DTYPE
+records (80 bytes: timestamp, ID, flags, DLC, 64 data bytes) in arrival
+order. Every RX_CAPTURE_INDEX_STRIDE records the index stores the running
+maximum of the timestamps, so CaptureReader.seek() finds any instant with
+two binary searches and returns NumPy views on the mapped file.
+"""
+
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from src.rx_ring_buffer import RX_RING_MAX_DATA
+
+RX_CAPTURE_SUFFIX = ".rxcap"
+RX_CAPTURE_MAGIC = b"CANINORX"
+RX_CAPTURE_VERSION = 1
+# magic, versione, dim. header, dim. record, numero di record, passo dell'indice
+RX_CAPTURE_HEADER = struct.Struct("<8sHHIQI36x")
+RX_CAPTURE_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),  # timestamp del frame (hardware se disponibile)
+        ("id", "<u4"),  # ID senza flag (11 o 29 bit)
+        ("flags", "u1"),  # FRAME_FLAG_* del ring RX
+        ("dlc", "u1"),  # byte di payload validi
+        ("reserved", "<u2"),
+        ("data", "u1", RX_RING_MAX_DATA),
+    ]
+)
+RX_CAPTURE_INDEX_DTYPE = np.dtype([("timestamp", "<f8"), ("record", "<u8")])
+RX_CAPTURE_INDEX_STRIDE = 4096  # record per voce dell'indice
+RX_CAPTURE_GROW_BYTES = 64 << 20  # il file cresce a blocchi (meno remap)
+
+
+def _index_path(path: str) -> str:
+    return path + ".idx"
+
+
+class CaptureFormat:
+    """
+    RX log format writing .rxcap files (see the module docstring); used by
+    RxLogWriter like the CSV and python-can formats. The file is extended
+    in RX_CAPTURE_GROW_BYTES steps and trimmed to the records when closed;
+    the header record count is updated at every flush, so a capture cut
+    short by a crash stays readable up to the last flush.
+    """
+
+    with_stats = False
+    compression = None  # i record restano accessibili in place: niente compressione
+    extension = ""
+
+    def __init__(self, stride: int = RX_CAPTURE_INDEX_STRIDE):
+        self.stride = stride
+        self._file = None
+        self._map = None
+        self._records = None  # vista NumPy sui record mappati
+        self._index = None
+        self._count = 0
+        self._flushed = 0  # record già sincronizzati su disco
+        self._max_timestamp = -np.inf
+
+    def open(self, path: str):
+        self._file = open(path, "w+b")
+        self._index = open(_index_path(path), "wb")
+        self._count = self._flushed = 0
+        self._max_timestamp = -np.inf
+        self._file.write(self._header())
+        self._remap(RX_CAPTURE_GROW_BYTES)
+
+    def _header(self) -> bytes:
+        return RX_CAPTURE_HEADER.pack(
+            RX_CAPTURE_MAGIC,
+            RX_CAPTURE_VERSION,
+            RX_CAPTURE_HEADER.size,
+            RX_CAPTURE_DTYPE.itemsize,
+            self._count,
+            self.stride,
+        )
+
+    def _remap(self, size: int):
+        # La mappa va chiusa prima di ridimensionare il file (Windows)
+        self._records = None
+        if self._map is not None:
+            self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        capacity = (size - RX_CAPTURE_HEADER.size) // RX_CAPTURE_DTYPE.itemsize
+        self._records = np.ndarray(
+            (capacity,), RX_CAPTURE_DTYPE, self._map, RX_CAPTURE_HEADER.size
+        )
+
+    def write(self, batch) -> int:
+        n = len(batch.keys)
+        start = self._count
+        end = start + n
+        if end > len(self._records):
+            needed = self._data_size(end)
+            grow = -(-needed // RX_CAPTURE_GROW_BYTES) * RX_CAPTURE_GROW_BYTES
+            self._remap(grow)
+
+        # Copia per campi direttamente nel file mappato
+        records = self._records[start:end]
+        records["timestamp"] = batch.timestamps
+        records["id"] = batch.keys & 0x1FFFFFFF
+        records["flags"] = batch.flags
+        records["dlc"] = batch.dlcs
+        records["data"] = batch.data
+
+        # Voci dell'indice per i record multipli di stride nel blocco
+        first = -(-start // self.stride) * self.stride
+        if first < end:
+            running = np.maximum.accumulate(batch.timestamps)
+            running = np.maximum(running, self._max_timestamp)
+            entries = np.empty(
+                len(range(first, end, self.stride)), RX_CAPTURE_INDEX_DTYPE
+            )
+            entries["record"] = np.arange(first, end, self.stride)
+            entries["timestamp"] = running[entries["record"] - start]
+            self._index.write(entries.tobytes())
+        if n:
+            self._max_timestamp = max(
+                self._max_timestamp, float(batch.timestamps.max())
+            )
+        self._count = end
+        return n * RX_CAPTURE_DTYPE.itemsize
+
+    def flush(self):
+        # Sincronizza solo le pagine dei nuovi record, poi il contatore
+        start = self._data_size(self._flushed)
+        start -= start % mmap.ALLOCATIONGRANULARITY
+        end = self._data_size(self._count)
+        if end > start:
+            self._map.flush(start, end - start)
+        self._map[: RX_CAPTURE_HEADER.size] = self._header()
+        self._map.flush(0, RX_CAPTURE_HEADER.size)
+        self._index.flush()
+        self._flushed = self._count
+
+    def _data_size(self, records: int) -> int:
+        return RX_CAPTURE_HEADER.size + records * RX_CAPTURE_DTYPE.itemsize
+
+    def size(self) -> int:
+        # Solo i record sincronizzati: quelli scritti dopo l'ultimo flush sono
+        # i byte restituiti da write(), che RxLogWriter somma a parte
+        return self._data_size(self._flushed)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._records = None
+            self._map.close()
+            self._map = None
+            # toglie lo spazio preallocato
+            self._file.truncate(self._data_size(self._count))
+            self._file.close()
+            self._index.close()
+
+    def discard(self):
+        """Closes and deletes the capture and its index (segment left empty)."""
+        path = self._file.name
+        self.close()
+        os.remove(path)
+        os.remove(_index_path(path))
+
+
+class CaptureReader:
+    """
+    Read-only access to a .rxcap file.
+
+    `records` is a NumPy structured view on the mapped file (no copy);
+    seek(t) returns the first record at or after time t in O(log n) using
+    the sparse index, which is rebuilt from the mapped timestamps when the
+    .idx file is missing or shorter than the capture.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_size, record_size, count, stride = (
+            RX_CAPTURE_HEADER.unpack_from(self._map)
+        )
+        if magic != RX_CAPTURE_MAGIC or record_size != RX_CAPTURE_DTYPE.itemsize:
+            self.close()
+            raise ValueError(f"Not a CANino capture file: {path}")
+        # Il contatore dell'header è quello dell'ultimo flush
+        count = min(count, (len(self._map) - header_size) // record_size)
+        self.version = version
+        self.stride = stride
+        self.records = np.ndarray((count,), RX_CAPTURE_DTYPE, self._map, header_size)
+        self.timestamps = self.records["timestamp"]
+        self._index_times = self._load_index()
+
+    def _load_index(self) -> np.ndarray:
+        entries = -(-len(self.records) // self.stride)
+        index = np.empty(0, RX_CAPTURE_INDEX_DTYPE)
+        if os.path.exists(_index_path(self.path)):
+            index = np.fromfile(_index_path(self.path), RX_CAPTURE_INDEX_DTYPE)
+            index = index[: min(len(index), entries)]
+        times = index["timestamp"]
+        loaded = len(times)
+        if loaded < entries:
+            # Voci mancanti (capture interrotta): massimo progressivo dei
+            # timestamp dall'ultima voce valida, preso a passo stride come
+            # fa il writer
+            start = max(loaded - 1, 0) * self.stride
+            running = np.maximum.accumulate(self.timestamps[start:])
+            if loaded:
+                running = np.maximum(running, times[-1])
+            first = self.stride if loaded else 0
+            times = np.concatenate([times, running[first :: self.stride]])
+        return times
+
+    def __len__(self):
+        return len(self.records)
+
+    def seek(self, t: float) -> int:
+        """Index of the first record with timestamp >= t (len() if none)."""
+        block = int(np.searchsorted(self._index_times, t, side="left"))
+        if block == 0:
+            return 0
+        # Tutti i record prima di (block - 1) * stride sono < t
+        start = (block - 1) * self.stride
+        end = min(block * self.stride + 1, len(self.records))
+        running = np.maximum.accumulate(self.timestamps[start:end])
+        return start + int(np.searchsorted(running, t, side="left"))
+
+    def between(self, t0: float, t1: float) -> np.ndarray:
+        """View of the records with t0 <= timestamp < t1."""
+        return self.records[self.seek(t0) : self.seek(t1)]
+
+    def close(self):
+        self.records = self.timestamps = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # viste ancora in uso: la mappa si chiude con l'ultima
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,609 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+import csv
+import gzip
+import importlib.util
+import io
+import json
+import os
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from time import monotonic
+from typing import Callable, NamedTuple, Optional
+
+import can
+import numpy as np
+
+from src.exceptions_logger import log_exception
+from src.rx_capture import RX_CAPTURE_SUFFIX, CaptureFormat
+from src.rx_ring_buffer import (
+    FRAME_FLAG_BRS,
+    FRAME_FLAG_ERROR,
+    FRAME_FLAG_EXTENDED,
+    FRAME_FLAG_FD,
+    FRAME_FLAG_REMOTE,
+)
+from src.rx_statistics import format_rx_id, rx_key_id
+
+# Il writer scrive su disco quando ha formattato almeno RX_LOG_FLUSH_BYTES
+# oppure quando sono passati RX_LOG_FLUSH_S dall'ultima scrittura
+RX_LOG_FLUSH_BYTES = 1 << 20
+RX_LOG_FLUSH_S = 1.0
+# Frame in coda oltre cui i nuovi blocchi vengono scartati (disco troppo lento)
+RX_LOG_MAX_PENDING = 1 << 20
+
+# Formati di log per estensione del file; MF4 richiede asammdf (opzionale)
+RX_LOG_TRACE_SUFFIXES = [".blf", ".asc"]
+if importlib.util.find_spec("asammdf") is not None:
+    RX_LOG_TRACE_SUFFIXES.append(".mf4")
+RX_LOG_SUFFIXES = [".csv"] + RX_LOG_TRACE_SUFFIXES + [RX_CAPTURE_SUFFIX]
+
+# Compressione in streaming dei formati testuali (CSV, ASC): nome -> estensione.
+# zstd e lz4 richiedono i pacchetti opzionali zstandard e lz4
+RX_LOG_COMPRESSIONS = {"gzip": ".gz"}
+if importlib.util.find_spec("zstandard") is not None:
+    RX_LOG_COMPRESSIONS["zstd"] = ".zst"
+if importlib.util.find_spec("lz4") is not None:
+    RX_LOG_COMPRESSIONS["lz4"] = ".lz4"
+
+# Rotazione dei file di log (0 = un solo file)
+RX_LOG_SEGMENT_MB = 0
+RX_LOG_SEGMENT_MIN = 0
+
+
+def open_compressed(path: str, compression: Optional[str]):
+    """
+    Opens a binary file for writing, compressed in streaming mode with the
+    given method of RX_LOG_COMPRESSIONS (None: plain file). flush() pushes
+    the data compressed so far to disk, so the file stays readable up to
+    the last flush even if the application dies.
+    """
+    if not compression:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"))
+    if compression == "lz4":
+        import lz4.frame
+
+        return lz4.frame.open(path, "wb")
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class RxLogBatch(NamedTuple):
+    """A block of received frames in arrival order, as NumPy arrays."""
+
+    timestamps: np.ndarray  # timestamp dei frame (hardware se il driver li fornisce)
+    keys: np.ndarray  # chiavi degli ID (vedi rx_statistics.rx_key())
+    flags: np.ndarray  # flag FRAME_FLAG_* del ring RX
+    dlcs: np.ndarray
+    data: np.ndarray  # (n, 64)
+    # Solo per i formati con with_stats
+    counts: Optional[np.ndarray] = None  # contatore dell'ID dopo ogni frame
+    emas: Optional[np.ndarray] = None  # periodo EMA dell'ID (ms, NaN se non noto)
+    std_devs: Optional[np.ndarray] = None  # dev. std della finestra dei periodi (ms)
+
+
+class TextLogFormat:
+    """
+    Base of the CSV formats: the subclasses' write(batch) formats each block
+    into one chunk of text, and the chunks are written to the file together
+    at every flush.
+    """
+
+    header = []
+    with_stats = False  # True: i blocchi devono portare counts/emas/std_devs
+
+    def __init__(self, compression: Optional[str] = None):
+        self.compression = compression
+        self.extension = RX_LOG_COMPRESSIONS[compression] if compression else ""
+        self._file = None
+        self._path = None
+        self._chunks = []
+        self._size = 0
+
+    def open(self, path: str):
+        self._file = open_compressed(path, self.compression)
+        self._path = path
+        self._chunks = []
+        out = io.StringIO()
+        csv.writer(out).writerow(self.header)
+        self._chunks.append(out.getvalue().encode("utf-8"))
+        self.flush()
+
+    def _append(self, text: str) -> int:
+        """Queues a formatted block; returns its size, written at the next flush()."""
+        chunk = text.encode("utf-8")
+        self._chunks.append(chunk)
+        return len(chunk)
+
+    def flush(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self._file.write(data)
+        self._file.flush()
+        self._size = os.path.getsize(self._path)  # byte su disco (compressi)
+
+    def size(self) -> int:
+        return self._size
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+
+    def discard(self):
+        """Closes and deletes the file (segment left empty)."""
+        self._file.close()
+        os.remove(self._path)
+
+
+class CsvStatsFormat(TextLogFormat):
+    """
+    Stats-annotated CSV rows: timestamp, ID, DBC name, DLC, payload, count,
+    period EMA and std. dev. of each frame.
+    """
+
+    header = [
+        "Timestamp",
+        "ID",
+        "Name",
+        "DLC",
+        "Payload",
+        "Count",
+        "Period (ms)",
+        "Std.Dev (ms)",
+    ]
+    with_stats = True
+
+    def __init__(
+        self, message_name: Callable[[int], str], compression: Optional[str] = None
+    ):
+        super().__init__(compression)
+        self.message_name = message_name  # chiave -> nome DBC
+        self._second = None  # cache della parte intera del timestamp
+        self._second_text = ""
+
+    def _timestamp(self, timestamp: float) -> str:
+        # Arrotondato al microsecondo come datetime, con riporto sul secondo;
+        # i frame dello stesso secondo condividono data e ora già formattate
+        second = int(timestamp)
+        micros = round((timestamp - second) * 1e6)
+        if micros >= 1_000_000:
+            second += 1
+            micros -= 1_000_000
+        if second != self._second:
+            self._second = second
+            self._second_text = datetime.fromtimestamp(second).strftime(
+                "%Y-%m-%dT%H:%M:%S"
+            )
+        return f"{self._second_text}.{micros:06d}"
+
+    def write(self, batch: RxLogBatch) -> int:
+        names = {}
+        rows = []
+        for timestamp, key, dlc, payload, count, ema, std in zip(
+            batch.timestamps.tolist(),
+            batch.keys.tolist(),
+            batch.dlcs.tolist(),
+            batch.data,
+            batch.counts.tolist(),
+            batch.emas.tolist(),
+            batch.std_devs.tolist(),
+        ):
+            name = names.get(key)
+            if name is None:
+                name = names[key] = self.message_name(key)
+            rows.append(
+                (
+                    self._timestamp(timestamp),
+                    format_rx_id(key),
+                    name,
+                    dlc,
+                    payload[:dlc].tobytes().hex(" ").upper(),
+                    count,
+                    f"{ema:.1f}" if ema == ema and ema else "-",  # NaN: non noto
+                    f"{std:.1f}" if std else "-",
+                )
+            )
+        out = io.StringIO()
+        csv.writer(out).writerows(rows)
+        return self._append(out.getvalue())
+
+
+def frame_flags_text(flags: int) -> str:
+    """FRAME_FLAG_* as letters: X extended, F FD, B BRS, R remote, E error."""
+    return "".join(
+        letter
+        for flag, letter in (
+            (FRAME_FLAG_EXTENDED, "X"),
+            (FRAME_FLAG_FD, "F"),
+            (FRAME_FLAG_BRS, "B"),
+            (FRAME_FLAG_REMOTE, "R"),
+            (FRAME_FLAG_ERROR, "E"),
+        )
+        if flags & flag
+    )
+
+
+class RawCsvFormat(TextLogFormat):
+    """
+    Raw CSV trace: one line per received frame with its own timestamp (s),
+    ID, flags (X extended, F FD, B BRS, R remote, E error), DLC and payload,
+    without DBC names or statistics.
+    """
+
+    header = ["Timestamp", "ID", "Flags", "DLC", "Payload"]
+    _FLAGS = [frame_flags_text(flags) for flags in range(256)]
+
+    def write(self, batch: RxLogBatch) -> int:
+        # Nessun campo da quotare: righe composte direttamente, senza csv.writer
+        flags_text = self._FLAGS
+        lines = [
+            f"{timestamp:.6f},{format_rx_id(key)},{flags_text[flags]},{dlc},"
+            f"{payload[:dlc].tobytes().hex(' ').upper()}\r\n"
+            for timestamp, key, flags, dlc, payload in zip(
+                batch.timestamps.tolist(),
+                batch.keys.tolist(),
+                batch.flags.tolist(),
+                batch.dlcs.tolist(),
+                batch.data,
+            )
+        ]
+        return self._append("".join(lines))
+
+
+class CanTraceFormat:
+    """
+    Binary/text trace written by the python-can writer of the file suffix
+    (BLFWriter, ASCWriter, MF4Writer), readable by Vector and ASAM tools.
+    The frames keep their own timestamps; the writer buffers and compresses
+    internally, so flush() only pushes its file buffer to disk. Only ASC,
+    a plain text stream, can also be compressed: BLF and MF4 are already
+    compressed and rewrite their header when closed.
+    """
+
+    with_stats = False
+
+    def __init__(self, compression: Optional[str] = None):
+        self.compression = compression
+        self.extension = RX_LOG_COMPRESSIONS[compression] if compression else ""
+        self._writer = None
+        self._path = None
+        self._size = 0
+
+    def open(self, path: str):
+        self._path = path
+        self._size = 0
+        if self.compression:
+            stream = io.TextIOWrapper(
+                open_compressed(path, self.compression), encoding="utf-8", newline=""
+            )
+            self._writer = can.ASCWriter(stream)
+        else:
+            self._writer = can.Logger(path)
+
+    def write(self, batch: RxLogBatch) -> int:
+        on_message = self._writer.on_message_received
+        for timestamp, key, flags, dlc, payload in zip(
+            batch.timestamps.tolist(),
+            batch.keys.tolist(),
+            batch.flags.tolist(),
+            batch.dlcs.tolist(),
+            batch.data,
+        ):
+            on_message(
+                can.Message(
+                    timestamp=timestamp,
+                    arbitration_id=rx_key_id(key),
+                    is_extended_id=bool(flags & FRAME_FLAG_EXTENDED),
+                    is_remote_frame=bool(flags & FRAME_FLAG_REMOTE),
+                    is_error_frame=bool(flags & FRAME_FLAG_ERROR),
+                    is_fd=bool(flags & FRAME_FLAG_FD),
+                    bitrate_switch=bool(flags & FRAME_FLAG_BRS),
+                    dlc=dlc,
+                    data=payload[:dlc].tobytes(),
+                )
+            )
+        return 0  # il writer decide da sé quando scrivere
+
+    def flush(self):
+        self._writer.file.flush()
+        self._size = os.path.getsize(self._path)
+
+    def size(self) -> int:
+        return self._size
+
+    def close(self):
+        self._writer.stop()
+
+    def discard(self):
+        """Closes and deletes the file (segment left empty)."""
+        self._writer.stop()
+        os.remove(self._path)
+
+
+def rx_log_format(
+    path: str,
+    message_name: Callable[[int], str],
+    raw: bool = False,
+    compression: Optional[str] = None,
+):
+    """
+    Returns the log format of a file, chosen by its suffix; `raw` selects the
+    raw CSV trace instead of the stats-annotated CSV. The compression is
+    applied to the text formats only (CSV and ASC); .rxcap is the native
+    memory-mapped capture (see rx_capture).
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".csv":
+        if raw:
+            return RawCsvFormat(compression)
+        return CsvStatsFormat(message_name, compression)
+    if suffix == ".asc":
+        return CanTraceFormat(compression)
+    if suffix == RX_CAPTURE_SUFFIX:
+        return CaptureFormat()
+    if suffix in RX_LOG_TRACE_SUFFIXES:
+        return CanTraceFormat()
+    raise ValueError(f"Unsupported log format: {suffix or path}")
+
+
+class RxLogWriter:
+    """
+    Writer thread of the RX log.
+
+    The GUI thread queues whole blocks of frames with submit(); the writer
+    thread hands them to the log format (TextLogFormat or CanTraceFormat)
+    and flushes it when at least flush_bytes are ready or flush_interval
+    seconds have passed. If the disk cannot keep up and more than
+    max_pending frames are queued, new blocks are dropped and counted
+    instead of growing the queue without limit.
+
+    With segment_bytes or segment_s the log is split into numbered files
+    (capture_0001.csv.gz, capture_0002.csv.gz, ...) closed when they reach
+    that size on disk or that span of frame timestamps; each closed segment
+    is recorded with its time range in capture.manifest.json.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fmt,
+        flush_bytes: int = RX_LOG_FLUSH_BYTES,
+        flush_interval: float = RX_LOG_FLUSH_S,
+        max_pending: int = RX_LOG_MAX_PENDING,
+        segment_bytes: int = 0,
+        segment_s: float = 0.0,
+    ):
+        self.base_path = path
+        self.fmt = fmt
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.segment_bytes = segment_bytes
+        self.segment_s = segment_s
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.segment_index = 1
+        self.path = self.segment_path(1)  # file in scrittura
+        self.segments = []  # segmenti chiusi (voci del manifest)
+        self._segment_first = None  # timestamp del primo frame del segmento
+        self._segment_last = None
+        self._segment_frames = 0
+        self._closed_bytes = 0  # byte dei segmenti già chiusi
+
+        self.pending_frames = 0  # frame in coda, non ancora formattati
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.dropped_frames = 0  # frame scartati perché la coda era piena
+        self.write_errors = 0
+
+    @property
+    def rotating(self) -> bool:
+        return bool(self.segment_bytes or self.segment_s)
+
+    def segment_path(self, index: int) -> str:
+        stem, suffix = os.path.splitext(self.base_path)
+        if self.rotating:
+            stem = f"{stem}_{index:04d}"
+        return stem + suffix + self.fmt.extension
+
+    def manifest_path(self) -> str:
+        return os.path.splitext(self.base_path)[0] + ".manifest.json"
+
+    def start(self):
+        """Opens (truncates) the file and starts the writer thread."""
+        self.fmt.open(self.path)
+        self.bytes_written = self.fmt.size()
+        if self.rotating:
+            self._write_manifest(False)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, batch: RxLogBatch) -> bool:
+        """Queues a block of frames; returns False if it was dropped."""
+        n = len(batch.keys)
+        with self._cond:
+            if not self._running:
+                return False
+            if self.pending_frames + n > self.max_pending:
+                self.dropped_frames += n
+                return False
+            self._queue.append(batch)
+            self.pending_frames += n
+            self._cond.notify()
+        return True
+
+    def stop(self):
+        """Writes everything still queued and closes the file."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _write_manifest(self, complete: bool):
+        # Scritto su un file temporaneo e poi sostituito: mai letto a metà
+        manifest = {
+            "base": os.path.basename(self.base_path),
+            "compression": self.fmt.compression,
+            "complete": complete,
+            "segments": self.segments,
+        }
+        tmp = self.manifest_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path())
+
+    def _close_segment(self):
+        self.fmt.close()  # scrive quanto resta (BLF: ultimo container)
+        size = os.path.getsize(self.path)
+        self._closed_bytes += size
+        self.bytes_written = self._closed_bytes
+        self.segments.append(
+            {
+                "file": os.path.basename(self.path),
+                "first_timestamp": self._segment_first,
+                "last_timestamp": self._segment_last,
+                "frames": self._segment_frames,
+                "bytes": size,
+            }
+        )
+        self._segment_first = self._segment_last = None
+        self._segment_frames = 0
+
+    def _rotate(self):
+        self._close_segment()
+        self._write_manifest(False)
+        self.segment_index += 1
+        self.path = self.segment_path(self.segment_index)
+        self.fmt.open(self.path)
+
+    def _segment_full(self) -> bool:
+        if self._segment_first is None:
+            return False
+        span = self._segment_last - self._segment_first
+        if self.segment_s and span >= self.segment_s:
+            return True
+        return bool(self.segment_bytes) and self.fmt.size() >= self.segment_bytes
+
+    def _run(self):
+        dirty = False  # blocchi passati al formato dopo l'ultimo flush
+        buffered = 0
+        last_flush = monotonic()
+        while True:
+            with self._cond:
+                if self._running and not self._queue:
+                    self._cond.wait(self.flush_interval)
+                batches = list(self._queue)
+                self._queue.clear()
+                running = self._running
+
+            # Formattazione e scrittura fuori dal lock: submit() non attende il disco
+            for batch in batches:
+                n = len(batch.keys)
+                try:
+                    buffered += self.fmt.write(batch)
+                    dirty = True
+                    first = float(batch.timestamps.min())
+                    last = float(batch.timestamps.max())
+                    if self._segment_first is None:
+                        self._segment_first = first
+                        self._segment_last = last
+                    else:
+                        self._segment_first = min(self._segment_first, first)
+                        self._segment_last = max(self._segment_last, last)
+                    self._segment_frames += n
+                except Exception as e:
+                    self.write_errors += 1
+                    log_exception(__file__, sys._getframe().f_lineno, e)
+                with self._cond:
+                    self.pending_frames -= n
+                self.frames_written += n
+
+                # Il segmento si chiude al blocco che ne supera durata o
+                # dimensione; quella su disco (compressa) è nota solo dopo il
+                # flush, che si anticipa quando i byte in attesa potrebbero
+                # bastare a riempirlo
+                if not self.rotating:
+                    continue
+                try:
+                    if (
+                        self.segment_bytes
+                        and dirty
+                        and self.fmt.size() + buffered >= self.segment_bytes
+                    ):
+                        self.fmt.flush()
+                        self.bytes_written = self._closed_bytes + self.fmt.size()
+                        dirty = False
+                        buffered = 0
+                        last_flush = monotonic()
+                    if self._segment_full():
+                        self._rotate()
+                        dirty = False
+                        buffered = 0
+                except Exception as e:
+                    self.write_errors += 1
+                    log_exception(__file__, sys._getframe().f_lineno, e)
+
+            now = monotonic()
+            if dirty and (
+                buffered >= self.flush_bytes or now - last_flush >= self.flush_interval
+            ):
+                try:
+                    self.fmt.flush()
+                    self.bytes_written = self._closed_bytes + self.fmt.size()
+                    # BLF/MF4 bufferizzano da sé: la loro dimensione si vede qui
+                    if self.rotating and self._segment_full():
+                        self._rotate()
+                except Exception as e:
+                    self.write_errors += 1
+                    log_exception(__file__, sys._getframe().f_lineno, e)
+                dirty = False
+                buffered = 0
+                last_flush = now
+
+            if not running:
+                try:
+                    if self._segment_frames or not self.segments:
+                        self._close_segment()
+                    else:  # segmento aperto da una rotazione e rimasto vuoto
+                        self.fmt.discard()
+                        self.bytes_written = self._closed_bytes
+                    if self.rotating:
+                        self._write_manifest(True)
+                except Exception as e:
+                    self.write_errors += 1
+                    log_exception(__file__, sys._getframe().f_lineno, e)
+                return
@@ -0,0 +1,204 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+from array import array
+
+import numpy as np
+
+RX_RING_CAPACITY = 1 << 16  # numero di slot (potenza di 2)
+RX_RING_MAX_DATA = 64  # byte di payload per slot (CAN-FD)
+
+# Flag dei frame memorizzati nel ring
+FRAME_FLAG_EXTENDED = 0x01
+FRAME_FLAG_FD = 0x02
+FRAME_FLAG_BRS = 0x04
+FRAME_FLAG_REMOTE = 0x08
+FRAME_FLAG_ERROR = 0x10
+
+
+def message_flags(msg) -> int:
+    """Packs the boolean attributes of a can.Message into ring flags."""
+    flags = 0
+    if msg.is_extended_id:
+        flags |= FRAME_FLAG_EXTENDED
+    if msg.is_fd:
+        flags |= FRAME_FLAG_FD
+    if msg.bitrate_switch:
+        flags |= FRAME_FLAG_BRS
+    if msg.is_remote_frame:
+        flags |= FRAME_FLAG_REMOTE
+    if msg.is_error_frame:
+        flags |= FRAME_FLAG_ERROR
+    return flags
+
+
+class RxRingBuffer:
+    """
+    Preallocated single-producer / single-consumer ring of received frames.
+
+    The receive thread is the only writer of ``_head`` and the GUI thread the
+    only writer of ``_tail``: each slot is filled before ``_head`` is advanced,
+    so no lock is needed. When the ring is full new frames are dropped and
+    counted in ``overflow_count``.
+    """
+
+    def __init__(self, capacity: int = RX_RING_CAPACITY):
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("Ring capacity must be a power of two")
+        self.capacity = capacity
+        self._mask = capacity - 1
+
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._ids = array("I", bytes(4 * capacity))
+        self._flags = bytearray(capacity)
+        self._dlcs = bytearray(capacity)
+        self._data = bytearray(RX_RING_MAX_DATA * capacity)
+
+        # Viste NumPy sugli stessi buffer, per drain_arrays()
+        self._np_timestamps = np.frombuffer(self._timestamps, dtype=np.float64)
+        self._np_ids = np.frombuffer(self._ids, dtype=np.uint32)
+        self._np_flags = np.frombuffer(self._flags, dtype=np.uint8)
+        self._np_dlcs = np.frombuffer(self._dlcs, dtype=np.uint8)
+        self._np_data = np.frombuffer(self._data, dtype=np.uint8).reshape(
+            capacity, RX_RING_MAX_DATA
+        )
+
+        self._head = 0  # scritto solo dal producer
+        self._tail = 0  # scritto solo dal consumer
+
+        self.overflow_count = 0  # frame scartati perché il ring era pieno
+        self.high_watermark = 0  # massimo riempimento osservato
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def push(self, timestamp: float, frame_id: int, flags: int, data: bytes) -> bool:
+        """Producer side: queues a single frame, returns False if it was dropped."""
+        head = self._head
+        if head - self._tail >= self.capacity:
+            self.overflow_count += 1
+            return False
+        slot = head & self._mask
+        size = min(len(data), RX_RING_MAX_DATA)
+        self._timestamps[slot] = timestamp
+        self._ids[slot] = frame_id
+        self._flags[slot] = flags
+        self._dlcs[slot] = size
+        offset = slot * RX_RING_MAX_DATA
+        self._data[offset : offset + size] = data[:size]
+        self._head = head + 1
+        used = head + 1 - self._tail
+        if used > self.high_watermark:
+            self.high_watermark = used
+        return True
+
+    def push_messages(self, messages):
+        """Producer side: copies a batch of can.Message objects into the ring."""
+        head = self._head
+        free = self.capacity - (head - self._tail)
+        mask = self._mask
+        timestamps = self._timestamps
+        ids = self._ids
+        flags = self._flags
+        dlcs = self._dlcs
+        data_buf = self._data
+
+        for msg in messages:
+            if free == 0:
+                self.overflow_count += 1
+                continue
+            slot = head & mask
+            data = msg.data
+            size = min(len(data), RX_RING_MAX_DATA)
+            timestamps[slot] = msg.timestamp
+            ids[slot] = msg.arbitration_id
+            flags[slot] = message_flags(msg)
+            dlcs[slot] = size
+            offset = slot * RX_RING_MAX_DATA
+            data_buf[offset : offset + size] = data[:size]
+            head += 1
+            free -= 1
+
+        self._head = head  # pubblica gli slot solo dopo averli scritti
+        used = head - self._tail
+        if used > self.high_watermark:
+            self.high_watermark = used
+
+    def drain(self, max_items: int = None):
+        """
+        Consumer side: removes the pending frames from the ring and returns them
+        as a list of (timestamp, frame_id, flags, dlc, data) tuples.
+        """
+        tail = self._tail
+        count = self._head - tail
+        if max_items is not None and count > max_items:
+            count = max_items
+
+        mask = self._mask
+        timestamps = self._timestamps
+        ids = self._ids
+        flags = self._flags
+        dlcs = self._dlcs
+        data_buf = self._data
+
+        frames = []
+        append = frames.append
+        for i in range(tail, tail + count):
+            slot = i & mask
+            size = dlcs[slot]
+            offset = slot * RX_RING_MAX_DATA
+            append(
+                (
+                    timestamps[slot],
+                    ids[slot],
+                    flags[slot],
+                    size,
+                    bytes(data_buf[offset : offset + size]),
+                )
+            )
+
+        self._tail = tail + count  # libera gli slot solo dopo averli letti
+        return frames
+
+    def drain_arrays(self, max_items: int = None):
+        """
+        Consumer side: removes the pending frames from the ring and returns
+        copies of them as NumPy arrays (timestamps, ids, flags, dlcs, data),
+        data having shape (n, RX_RING_MAX_DATA).
+        """
+        tail = self._tail
+        count = self._head - tail
+        if max_items is not None and count > max_items:
+            count = max_items
+
+        slots = (tail + np.arange(count)) & self._mask
+        frames = (
+            self._np_timestamps[slots],
+            self._np_ids[slots],
+            self._np_flags[slots],
+            self._np_dlcs[slots],
+            self._np_data[slots],
+        )
+        self._tail = tail + count  # libera gli slot solo dopo averli letti
+        return frames
+
+    def discard(self):
+        """Consumer side: drops every pending frame."""
+        self._tail = self._head
@@ -0,0 +1,505 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+import math
+
+import numpy as np
+
+from src.rx_ring_buffer import FRAME_FLAG_EXTENDED, RX_RING_MAX_DATA
+
+RX_STATS_WINDOW = 20  # periodi usati per media e deviazione standard
+RX_STATS_SKIP = 5  # primi periodi ignorati (avvio del nodo, frame accodati)
+RX_EMA_ALPHA = 0.1  # peso del nuovo periodo nella media esponenziale
+
+# Istogramma logaritmico dei periodi: da 10 us a 100 s, 20 bin per decade
+# (ogni bin è largo circa il 12%, il percentile ha un errore entro il 6%)
+RX_HIST_MIN_MS = 0.01
+RX_HIST_BINS_PER_DECADE = 20
+RX_HIST_DECADES = 7
+RX_HIST_BINS = RX_HIST_BINS_PER_DECADE * RX_HIST_DECADES
+_HIST_LOG_MIN = math.log10(RX_HIST_MIN_MS)
+# Centro geometrico di ogni bin, valore restituito per i percentili
+_HIST_CENTRES = 10 ** (
+    _HIST_LOG_MIN + (np.arange(RX_HIST_BINS) + 0.5) / RX_HIST_BINS_PER_DECADE
+)
+
+RX_STATS_INITIAL_SLOTS = 256  # slot allocati all'avvio, raddoppiati quando servono
+_SFF_ID_COUNT = 0x800  # gli ID a 11 bit hanno uno slot diretto, gli altri un dict
+
+# Chiave di un ID nel motore e nella tabella RX: gli ID a 29 bit hanno il bit 31
+# a 1, così lo 0x100 standard e lo 0x100 extended restano due righe distinte
+RX_KEY_EXTENDED = 0x80000000
+_CAN_EFF_MASK = 0x1FFFFFFF
+
+RX_STORE_MAX_IDS = 4096  # ID tenuti in memoria, oltre si rimuovono i meno recenti
+RX_STALE_ID_S = 0  # secondi senza frame dopo cui un ID viene rimosso (0 = mai)
+
+# Colonne del motore e loro valore iniziale (slot libero)
+_COLUMNS = {
+    "keys": 0,
+    "count": 0,
+    "samples": 0,
+    "dlc": 0,
+    "data": 0,
+    "last_time": 0.0,
+    "ema": np.nan,
+    "min": np.inf,
+    "max": -np.inf,
+    "periods": np.nan,
+    "window_count": 0,
+    "window_shift": np.nan,
+    "window_sum": 0.0,
+    "window_sumsq": 0.0,
+    "histogram": 0,
+    "dirty": False,
+    "cycle_time": np.nan,
+}
+
+
+def rx_key(frame_id: int, is_extended: bool) -> int:
+    return (frame_id & _CAN_EFF_MASK) | RX_KEY_EXTENDED if is_extended else frame_id
+
+
+def rx_keys(ids: np.ndarray, flags: np.ndarray) -> np.ndarray:
+    """Keys of a batch of ring frames (arrays from RxRingBuffer.drain_arrays)."""
+    extended = (flags & FRAME_FLAG_EXTENDED) != 0
+    return np.where(extended, (ids & _CAN_EFF_MASK) | RX_KEY_EXTENDED, ids).astype(
+        np.uint32
+    )
+
+
+def rx_key_id(key: int) -> int:
+    """CAN ID of a key, without the extended flag."""
+    return key & _CAN_EFF_MASK
+
+
+def rx_key_is_extended(key: int) -> bool:
+    return bool(key & RX_KEY_EXTENDED)
+
+
+def format_rx_id(key: int) -> str:
+    """ID text of a key: 3 hex digits for 11-bit IDs, 8 for 29-bit IDs."""
+    if key & RX_KEY_EXTENDED:
+        return f"0x{key & _CAN_EFF_MASK:08X}"
+    return f"0x{key:03X}"
+
+
+def histogram_bin_edges(index: int):
+    """Returns the (low, high) edges in ms of a histogram bin."""
+    low = 10 ** (_HIST_LOG_MIN + index / RX_HIST_BINS_PER_DECADE)
+    high = 10 ** (_HIST_LOG_MIN + (index + 1) / RX_HIST_BINS_PER_DECADE)
+    return low, high
+
+
+def histogram_bins(periods: np.ndarray) -> np.ndarray:
+    """Log-scale histogram bin of each period in ms."""
+    bins = (
+        np.log10(np.maximum(periods, RX_HIST_MIN_MS)) - _HIST_LOG_MIN
+    ) * RX_HIST_BINS_PER_DECADE
+    return np.minimum(bins.astype(np.intp), RX_HIST_BINS - 1)
+
+
+class RxStatsEngine:
+    """
+    Columnar (struct-of-arrays) statistics of the received IDs.
+
+    Every ID owns a dense slot; each statistic is a NumPy array indexed by
+    slot. IDs are identified by their key (see rx_key()): 11-bit IDs find
+    their slot in a direct lookup array, 29-bit IDs in a dict (searched as a
+    sorted array by lookup()). update() applies a whole batch of frames with
+    vectorized operations: count, last frame, min/max, EMA, the window of the last
+    periods and the log-scale period histogram. The window keeps running sums
+    of the periods and of their squares (shifted by the first period of the
+    ID, against cancellation), so its mean and std cost O(1) per ID. The first
+    `skip` periods of each ID are left out of the window and the histogram.
+
+    evict() bounds the store: IDs not received for a while and, above the
+    maximum number of IDs, the least recently received ones are removed and
+    the remaining slots compacted.
+    """
+
+    def __init__(
+        self,
+        window: int = RX_STATS_WINDOW,
+        skip: int = RX_STATS_SKIP,
+        alpha: float = RX_EMA_ALPHA,
+    ):
+        self.window = max(1, window)
+        self.skip = max(0, skip)
+        self.alpha = alpha
+        self._sff_slots = np.full(_SFF_ID_COUNT, -1, dtype=np.int32)
+        self._eff_slots = {}
+        self._eff_index = None  # (chiavi ordinate, slot) dei 29 bit, per lookup()
+        self._cycle_times = {}  # chiave -> periodo atteso in ms (cycle_time DBC)
+        self.new_keys = []  # ID comparsi dall'ultima take_new_keys()
+        self._allocate(RX_STATS_INITIAL_SLOTS)
+        self.size = 0  # slot in uso
+        self.evicted_stale = 0  # ID rimossi perché fermi da troppo tempo
+        self.evicted_lru = 0  # ID rimossi per stare nel numero massimo di ID
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.keys = np.zeros(capacity, dtype=np.uint32)
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.samples = np.zeros(capacity, dtype=np.int64)  # periodi misurati
+        self.dlc = np.zeros(capacity, dtype=np.uint8)
+        self.data = np.zeros((capacity, RX_RING_MAX_DATA), dtype=np.uint8)
+        self.last_time = np.zeros(capacity, dtype=np.float64)
+        self.ema = np.full(capacity, np.nan)
+        self.min = np.full(capacity, np.inf)
+        self.max = np.full(capacity, -np.inf)
+        self.periods = np.full((capacity, self.window), np.nan)  # finestra circolare
+        self._allocate_window_sums(capacity)
+        self.histogram = np.zeros((capacity, RX_HIST_BINS), dtype=np.int32)
+        self.dirty = np.zeros(capacity, dtype=bool)  # slot aggiornati dall'ultimo refresh
+        self.cycle_time = np.full(capacity, np.nan)  # periodo atteso (DBC), ms
+
+    def _allocate_window_sums(self, capacity):
+        # Somme correnti della finestra, sui periodi meno window_shift
+        self.window_count = np.zeros(capacity, dtype=np.int64)  # periodi nella finestra
+        self.window_shift = np.full(capacity, np.nan)
+        self.window_sum = np.zeros(capacity)
+        self.window_sumsq = np.zeros(capacity)
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = {name: getattr(self, name) for name in _COLUMNS}
+        self._allocate(capacity)
+        for name, array in old.items():
+            getattr(self, name)[: self.size] = array[: self.size]
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self._sff_slots.fill(-1)
+        self._eff_slots.clear()
+        self._eff_index = None
+        self._allocate(RX_STATS_INITIAL_SLOTS)
+        self.size = 0
+        self.new_keys = []
+        self.evicted_stale = 0
+        self.evicted_lru = 0
+
+    def reconfigure(self, window: int, skip: int):
+        """
+        Applies new window settings; the windows restart empty and the first
+        `skip` periods of every ID are skipped again.
+        """
+        self.window = max(1, window)
+        self.skip = max(0, skip)
+        self.periods = np.full((self.capacity, self.window), np.nan)
+        self._allocate_window_sums(self.capacity)
+        self.samples[:] = 0
+
+    def slot_of(self, key: int) -> int:
+        if key < _SFF_ID_COUNT:
+            return int(self._sff_slots[key])
+        return self._eff_slots.get(key, -1)
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Slots of the given keys, -1 for the keys not in the store."""
+        slots = np.empty(len(keys), dtype=np.intp)
+        sff = keys < _SFF_ID_COUNT
+        slots[sff] = self._sff_slots[keys[sff]]
+        if not sff.all():
+            # Ricerca binaria vettoriale sulle chiavi a 29 bit, invece del dict
+            if self._eff_index is None:
+                eff_keys = np.fromiter(self._eff_slots, dtype=np.uint32)
+                order = np.argsort(eff_keys)
+                eff_slots = np.fromiter(self._eff_slots.values(), dtype=np.intp)
+                self._eff_index = (eff_keys[order], eff_slots[order])
+            eff_keys, eff_slots = self._eff_index
+            wanted = keys[~sff]
+            pos = np.minimum(np.searchsorted(eff_keys, wanted), len(eff_keys) - 1)
+            if len(eff_keys):
+                found = eff_keys[pos] == wanted
+                slots[~sff] = np.where(found, eff_slots[pos], -1)
+            else:
+                slots[~sff] = -1
+        return slots
+
+    def set_cycle_times(self, cycle_times: dict):
+        """Sets the expected period in ms of the IDs (key -> DBC cycle_time)."""
+        self._cycle_times = dict(cycle_times)
+        for slot, key in enumerate(self.keys[: self.size].tolist()):
+            self.cycle_time[slot] = self._cycle_times.get(key, np.nan)
+
+    def expected_period(self, slots: np.ndarray) -> np.ndarray:
+        """
+        Expected period in ms: the DBC cycle_time, else the learned EMA (NaN
+        if still unknown).
+        """
+        cycle_time = self.cycle_time[slots]
+        return np.where(np.isnan(cycle_time), self.ema[slots], cycle_time)
+
+    def take_new_keys(self) -> list:
+        """Keys of the IDs added to the store since the previous call."""
+        keys = self.new_keys
+        self.new_keys = []
+        return keys
+
+    def evict(self, now: float, max_age: float, max_ids: int) -> np.ndarray:
+        """
+        Removes the IDs whose last frame is older than now - max_age (max_age
+        0: never) and then, above max_ids, the least recently received ones.
+        Returns the keys of the removed IDs; the other IDs may change slot.
+        """
+        size = self.size
+        last_time = self.last_time[:size]
+        if max_age > 0:
+            remove = last_time < now - max_age
+        else:
+            remove = np.zeros(size, dtype=bool)
+        stale = int(np.count_nonzero(remove))
+        excess = size - stale - max(0, max_ids)
+        if excess > 0:
+            candidates = np.flatnonzero(~remove)
+            oldest = np.argpartition(last_time[candidates], excess - 1)[:excess]
+            remove[candidates[oldest]] = True
+        if not remove.any():
+            return np.empty(0, dtype=np.uint32)
+
+        self.evicted_stale += stale
+        self.evicted_lru += max(0, excess)
+        removed = self.keys[:size][remove]
+
+        # Compatta gli slot rimasti in testa e riporta la coda allo stato iniziale
+        keep = ~remove
+        new_size = size - len(removed)
+        for name, fill in _COLUMNS.items():
+            array = getattr(self, name)
+            array[:new_size] = array[:size][keep]
+            array[new_size:size] = fill
+        self.size = new_size
+
+        self._sff_slots.fill(-1)
+        self._eff_slots.clear()
+        self._eff_index = None
+        for slot, key in enumerate(self.keys[:new_size].tolist()):
+            if key < _SFF_ID_COUNT:
+                self._sff_slots[key] = slot
+            else:
+                self._eff_slots[key] = slot
+        return removed
+
+    def _slots(self, ids: np.ndarray) -> np.ndarray:
+        slots = self.lookup(ids)
+        missing = slots < 0
+        if missing.any():  # nuovi ID: assegna gli slot in ordine di arrivo
+            new_ids, first = np.unique(ids[missing], return_index=True)
+            new_ids = new_ids[np.argsort(first)]
+            if self.size + len(new_ids) > self.capacity:
+                self._grow(self.size + len(new_ids))
+            for key in new_ids.tolist():
+                slot = self.size
+                self.size += 1
+                self.keys[slot] = key
+                self.cycle_time[slot] = self._cycle_times.get(key, np.nan)
+                self.new_keys.append(key)
+                if key < _SFF_ID_COUNT:
+                    self._sff_slots[key] = slot
+                else:
+                    self._eff_slots[key] = slot
+                    self._eff_index = None
+            return self._slots(ids)
+        return slots
+
+    def update(self, timestamps, ids, dlcs, data) -> np.ndarray:
+        """
+        Applies a batch of frames in arrival order: ids are the keys of the
+        frames (rx_keys()), the other arrays come from RxRingBuffer.drain_arrays.
+        Returns the slot of each frame.
+        """
+        n = len(ids)
+        if n == 0:
+            return np.empty(0, dtype=np.intp)
+        slots = self._slots(ids)
+
+        # Raggruppa i frame per slot mantenendo l'ordine di arrivo
+        order = np.argsort(slots, kind="stable")
+        s = slots[order]
+        t = timestamps[order]
+        first = np.empty(n, dtype=bool)
+        first[0] = True
+        np.not_equal(s[1:], s[:-1], out=first[1:])
+        last = np.empty(n, dtype=bool)
+        last[-1] = True
+        last[:-1] = first[1:]
+        starts = np.flatnonzero(first)
+        group_size = np.diff(np.append(starts, n))
+        rank = np.arange(n) - np.repeat(starts, group_size)
+
+        # Periodo rispetto al frame precedente dello stesso ID
+        prev = np.empty(n)
+        prev[1:] = t[:-1]
+        prev[first] = self.last_time[s[first]]
+        is_new = self.count[s] == 0  # il primo frame di un ID non ha periodo
+        valid = ~(first & is_new)
+        pv_slots = s[valid]
+        periods = (t[valid] - prev[valid]) * 1000.0
+
+        # Contatori ed ultimo frame
+        last_slots = s[last]
+        last_index = order[last]
+        self.count[last_slots] += group_size
+        self.last_time[last_slots] = t[last]
+        self.dlc[last_slots] = dlcs[last_index]
+        self.data[last_slots] = data[last_index]
+        self.dirty[last_slots] = True
+
+        if len(periods):
+            np.minimum.at(self.min, pv_slots, periods)
+            np.maximum.at(self.max, pv_slots, periods)
+
+            # EMA di k periodi in un passo: (1-a)^k * E + sum(a * (1-a)^(k-1-i) * p_i);
+            # il primo periodo di un ID inizializza la media (peso 1 invece di a)
+            a = self.alpha
+            new_group = is_new[first]
+            n_valid = group_size - new_group
+            valid_rank = rank[valid] - np.repeat(new_group, group_size)[valid]
+            k = np.repeat(n_valid, group_size)[valid]
+            weights = (1.0 - a) ** (k - 1 - valid_rank)
+            seeds = np.isnan(self.ema[pv_slots]) & (valid_rank == 0)
+            weights = np.where(seeds, weights, a * weights)
+            ema = self.ema[last_slots]
+            ema = np.where(np.isnan(ema), 0.0, ema) * (1.0 - a) ** n_valid
+            contributions = np.zeros(self.capacity)
+            np.add.at(contributions, pv_slots, weights * periods)
+            self.ema[last_slots] = np.where(
+                n_valid > 0, ema + contributions[last_slots], self.ema[last_slots]
+            )
+
+            # Finestra e istogramma: solo i periodi dopo i primi `skip` di ogni ID
+            index = self.samples[pv_slots] + valid_rank  # indice del periodo per l'ID
+            self.samples[last_slots] += n_valid
+            kept = index >= self.skip
+            if kept.any():
+                k_slots = pv_slots[kept]
+                k_periods = periods[kept]
+                np.add.at(self.histogram, (k_slots, histogram_bins(k_periods)), 1)
+                # Nella finestra circolare basta scrivere gli ultimi `window` periodi
+                k_index = index[kept]
+                recent = k_index >= self.samples[k_slots] - self.window
+                rows = k_slots[recent]
+                cols = (k_index[recent] - self.skip) % self.window
+                new = k_periods[recent]
+                self._update_window_sums(rows, self.periods[rows, cols], new)
+                self.periods[rows, cols] = new
+
+        return slots
+
+    def _update_window_sums(self, slots, old, new):
+        # Ogni cella della finestra è scritta al più una volta per batch: basta
+        # togliere il periodo sovrascritto (NaN se la cella era vuota)
+        unset = np.isnan(self.window_shift[slots])
+        self.window_shift[slots[unset]] = new[unset]
+        shift = self.window_shift[slots]
+        occupied = ~np.isnan(old)
+        d_new = new - shift
+        d_old = np.where(occupied, old - shift, 0.0)
+        np.add.at(self.window_count, slots, ~occupied)
+        np.add.at(self.window_sum, slots, d_new - d_old)
+        np.add.at(self.window_sumsq, slots, d_new * d_new - d_old * d_old)
+
+    def window_std(self, slots: np.ndarray) -> np.ndarray:
+        """Population std of the period window (0 with fewer than 2 periods)."""
+        n = self.window_count[slots]
+        mean = self.window_sum[slots] / np.maximum(n, 1)
+        var = self.window_sumsq[slots] / np.maximum(n, 1) - mean * mean
+        return np.where(n > 1, np.sqrt(np.maximum(var, 0.0)), 0.0)
+
+    def window_mean(self, slots: np.ndarray) -> np.ndarray:
+        n = self.window_count[slots]
+        mean = self.window_shift[slots] + self.window_sum[slots] / np.maximum(n, 1)
+        return np.where(n > 0, mean, np.nan)
+
+    def percentiles(self, slots: np.ndarray, fractions) -> np.ndarray:
+        """
+        Percentiles of the period histograms, shape (len(slots), len(fractions)),
+        clamped to the observed min/max; NaN for empty histograms.
+        """
+        cumulative = np.cumsum(self.histogram[slots], axis=1)
+        total = cumulative[:, -1]
+        result = np.full((len(slots), len(fractions)), np.nan)
+        for col, fraction in enumerate(fractions):
+            rank = np.maximum(1, np.ceil(fraction * total))
+            bins = np.argmax(cumulative >= rank[:, None], axis=1)
+            result[:, col] = _HIST_CENTRES[bins]
+        result = np.clip(result, self.min[slots, None], self.max[slots, None])
+        result[total == 0] = np.nan
+        return result
+
+    def take_dirty(self) -> np.ndarray:
+        """Slots updated since the previous call."""
+        slots = np.flatnonzero(self.dirty[: self.size])
+        self.dirty[slots] = False
+        return slots
+
+    def all_slots(self) -> np.ndarray:
+        return np.arange(self.size)
+
+    def snapshot(self, slots: np.ndarray, fractions=()) -> list:
+        """
+        Copies the statistics of the given slots into Python values, one dict
+        per slot (min/max/ema/percentiles are None when not measured yet).
+        """
+        std = self.window_std(slots)
+        mean = self.window_mean(slots)
+        percentiles = self.percentiles(slots, fractions) if fractions else None
+
+        def column(values):
+            return [None if not math.isfinite(v) else v for v in values.tolist()]
+
+        ema = column(self.ema[slots])
+        mins = column(self.min[slots])
+        maxs = column(self.max[slots])
+        means = column(mean)
+        rows = []
+        for i, (slot, key, count, dlc, last_time) in enumerate(
+            zip(
+                slots.tolist(),
+                self.keys[slots].tolist(),
+                self.count[slots].tolist(),
+                self.dlc[slots].tolist(),
+                self.last_time[slots].tolist(),
+            )
+        ):
+            rows.append(
+                {
+                    "slot": slot,
+                    "key": key,
+                    "count": count,
+                    "dlc": dlc,
+                    "data": self.data[slot, :dlc].tobytes(),
+                    "last_time": last_time,
+                    "ema": ema[i],
+                    "mean": means[i],
+                    "min": mins[i],
+                    "max": maxs[i],
+                    "std": float(std[i]),
+                    "percentiles": (
+                        column(percentiles[i]) if percentiles is not None else []
+                    ),
+                }
+            )
+        return rows
@@ -0,0 +1,543 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+from PySide6.QtCore import (
+    QAbstractProxyModel,
+    QAbstractTableModel,
+    QDateTime,
+    QModelIndex,
+    Qt,
+    QTimer,
+)
+from PySide6.QtGui import QColor
+
+from src.rx_statistics import format_rx_id, rx_key_id
+
+# Rx column definition (see also RX_HEADERS)
+RX_COL_0_id = 0
+RX_COL_1_name = 1
+RX_COL_2_dlc = 2
+RX_COL_3_payload = 3
+RX_COL_4_count = 4
+RX_COL_5_period = 5
+RX_COL_6_min = 6
+RX_COL_7_max = 7
+RX_COL_8_dev_std = 8
+RX_COL_9_p50 = 9
+RX_COL_10_p95 = 10
+RX_COL_11_p99 = 11
+RX_COL_12_last_received = 12
+
+RX_HEADERS = [
+    "ID",
+    "Name",
+    "DLC",
+    "Payload (0 - 7)",
+    "Count",
+    "Period (ms)",
+    "Min (ms)",
+    "Max (ms)",
+    "Dev. Std (ms)",
+    "P50 (ms)",
+    "P95 (ms)",
+    "P99 (ms)",
+    "Last Received",
+]
+
+# Colonne con valori in ms, mostrati con un decimale
+_MS_COLUMNS = (
+    RX_COL_5_period,
+    RX_COL_6_min,
+    RX_COL_7_max,
+    RX_COL_8_dev_std,
+    RX_COL_9_p50,
+    RX_COL_10_p95,
+    RX_COL_11_p99,
+)
+
+# Sfondo delle righe degli ID in timeout
+RX_MISSING_COLOR = QColor(229, 115, 115, 110)
+
+
+class RxTableModel(QAbstractTableModel):
+    """
+    RX table model: one row per ID key (see rx_statistics.rx_key()), new IDs
+    are appended and evicted IDs removed with remove_keys().
+
+    Each row holds the raw values of the columns (see RX_HEADERS); text is
+    formatted in data(), so only the visible cells are ever converted.
+    set_row() compares the new values with the stored ones and emits
+    dataChanged only for the changed span of the row. Rows set with
+    set_highlighted() are painted with RX_MISSING_COLOR.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = []  # riga -> chiave dell'ID
+        self._rows = {}  # chiave dell'ID -> riga
+        self._values = []  # riga -> lista dei valori grezzi delle colonne
+        self._highlighted = set()  # chiavi degli ID evidenziati (timeout)
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RX_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return RX_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if self._ids[index.row()] in self._highlighted:
+                return RX_MISSING_COLOR
+            return None
+        value = self._values[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._format(index.column(), value)
+        if role == Qt.ItemDataRole.UserRole:  # valore grezzo, per l'ordinamento
+            return value
+        return None
+
+    # --- API per la finestra RX ---
+
+    def row_of(self, key):
+        return self._rows.get(key)
+
+    def key_at(self, row):
+        return self._ids[row]
+
+    def value(self, row, column):
+        """Raw value of a cell (the one returned for UserRole)."""
+        return self._values[row][column]
+
+    def set_row(self, key, values):
+        """Inserts or updates the row of an ID key; values are the raw column values."""
+        self.set_rows(((key, values),))
+
+    def set_rows(self, rows):
+        """
+        Inserts or updates several rows, given as (key, values) pairs. The
+        changed cells of the existing rows are notified with a single
+        dataChanged covering all of them, the new rows with a single
+        rowsInserted at the end.
+        """
+        top = bottom = left = right = None
+        new_rows = {}  # chiave -> valori delle righe da aggiungere in fondo
+        for key, values in rows:
+            row = self._rows.get(key)
+            if row is None:
+                new_rows[key] = list(values)
+                continue
+
+            current = self._values[row]
+            first = last = None
+            for col, value in enumerate(values):
+                if current[col] != value:
+                    current[col] = value
+                    if first is None:
+                        first = col
+                    last = col
+            if first is None:
+                continue
+            if top is None:
+                top = bottom = row
+                left, right = first, last
+            else:
+                top = min(top, row)
+                bottom = max(bottom, row)
+                left = min(left, first)
+                right = max(right, last)
+        if top is not None:
+            self.dataChanged.emit(
+                self.index(top, left),
+                self.index(bottom, right),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+        if new_rows:
+            first = len(self._ids)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            for row, (key, values) in enumerate(new_rows.items(), first):
+                self._ids.append(key)
+                self._rows[key] = row
+                self._values.append(values)
+            self.endInsertRows()
+
+    def set_column(self, column, values_by_id):
+        """Updates a single column (e.g. the DBC names) for the given IDs."""
+        changed = []
+        for key, value in values_by_id.items():
+            row = self._rows.get(key)
+            if row is not None and self._values[row][column] != value:
+                self._values[row][column] = value
+                changed.append(row)
+        if changed:
+            self.dataChanged.emit(
+                self.index(min(changed), column),
+                self.index(max(changed), column),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+    def set_highlighted(self, keys, highlighted):
+        """Highlights (or restores) the rows of the given ID keys."""
+        if highlighted:
+            self._highlighted.update(keys)
+        else:
+            self._highlighted.difference_update(keys)
+        rows = [self._rows[key] for key in keys if key in self._rows]
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows), 0),
+                self.index(max(rows), len(RX_HEADERS) - 1),
+                [Qt.ItemDataRole.BackgroundRole],
+            )
+
+    def remove_keys(self, keys):
+        """Removes the rows of the given ID keys (evicted from the RX store)."""
+        rows = sorted(
+            (self._rows[key] for key in keys if key in self._rows), reverse=True
+        )
+        # Rimuove blocchi di righe contigue, dal fondo per non spostare gli altri
+        i = 0
+        while i < len(rows):
+            last = first = rows[i]
+            i += 1
+            while i < len(rows) and rows[i] == first - 1:
+                first = rows[i]
+                i += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._ids[first : last + 1]
+            del self._values[first : last + 1]
+            self.endRemoveRows()
+        if rows:
+            self._rows = {key: row for row, key in enumerate(self._ids)}
+        self._highlighted.difference_update(keys)
+
+    def clear(self):
+        self.beginResetModel()
+        self._ids.clear()
+        self._rows.clear()
+        self._values.clear()
+        self._highlighted.clear()
+        self.endResetModel()
+
+    # --- Formattazione ---
+
+    @staticmethod
+    def _format(column, value):
+        if column == RX_COL_0_id:
+            return format_rx_id(value)
+        if column == RX_COL_3_payload:
+            return " ".join(f"{b:02X}" for b in value)
+        if column in _MS_COLUMNS:
+            return f"{value:.1f}" if value else "-"
+        if column == RX_COL_12_last_received:
+            last_recv = QDateTime.fromMSecsSinceEpoch(int(value * 1000))
+            return last_recv.toString(Qt.DateFormat.ISODateWithMs)
+        return str(value)
+
+
+def _sort_key(value):
+    # Le colonne senza valore ("-") vanno in fondo all'ordinamento crescente
+    if value is None:
+        return (1, 0)
+    return (0, value)
+
+
+def parse_rx_filter(text):
+    """
+    Parses the RX table filter: "lo-hi" is an inclusive hex ID range
+    (e.g. "100-1FF", standard and extended IDs alike), anything else is a
+    case-insensitive substring of the ID ("0x1A0") or of the DBC name.
+    Returns None for an empty filter.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    lo, sep, hi = text.partition("-")
+    if sep:
+        try:
+            return (int(lo.strip(), 16), int(hi.strip(), 16))
+        except ValueError:
+            pass  # non è un intervallo, cerca il testo così com'è
+    return text.lower()
+
+
+class RxSortFilterProxyModel(QAbstractProxyModel):
+    """
+    Sort/filter proxy over RxTableModel.
+
+    The source model is never reordered: the proxy keeps its own mapping
+    (proxy row -> source row), so the row of an ID in the source model stays
+    valid across sorts and filters. Sorting uses the raw values of the source
+    with a single key function per row instead of a data() call per
+    comparison, as QSortFilterProxyModel would do; the updates of a refresh
+    tick that touch the sort column are re-sorted once, at the end of the tick.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._proxy_to_source = []  # riga proxy -> riga sorgente
+        self._source_to_proxy = []  # riga sorgente -> riga proxy (-1 se filtrata)
+        self._sort_column = -1  # -1: ordine di arrivo degli ID
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._filter = None  # vedi parse_rx_filter()
+        self._resort_pending = False
+
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            old.dataChanged.disconnect(self._on_source_data_changed)
+            old.rowsInserted.disconnect(self._on_source_rows_inserted)
+            old.rowsAboutToBeRemoved.disconnect(self._on_source_rows_removing)
+            old.rowsRemoved.disconnect(self._on_source_rows_removed)
+            old.modelAboutToBeReset.disconnect(self.beginResetModel)
+            old.modelReset.disconnect(self._on_source_reset)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.dataChanged.connect(self._on_source_data_changed)
+        model.rowsInserted.connect(self._on_source_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_source_rows_removing)
+        model.rowsRemoved.connect(self._on_source_rows_removed)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_source_reset)
+        self._rebuild()
+        self.endResetModel()
+
+    # --- QAbstractProxyModel ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._proxy_to_source)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RX_HEADERS)
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(
+            self._proxy_to_source[proxy_index.row()], proxy_index.column()
+        )
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self._source_to_proxy[source_index.row()]
+        if row < 0:
+            return QModelIndex()
+        return self.createIndex(row, source_index.column())
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return section + 1
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._resort()
+
+    # --- Filtro ---
+
+    def set_filter_text(self, text):
+        """Applies a text/ID-range filter, see parse_rx_filter()."""
+        rx_filter = parse_rx_filter(text)
+        if rx_filter == self._filter:
+            return
+        self.beginResetModel()
+        self._filter = rx_filter
+        self._rebuild()
+        self.endResetModel()
+
+    def _accepts(self, source_row):
+        rx_filter = self._filter
+        if rx_filter is None:
+            return True
+        source = self.sourceModel()
+        key = source.key_at(source_row)
+        if isinstance(rx_filter, tuple):
+            return rx_filter[0] <= rx_key_id(key) <= rx_filter[1]
+        if rx_filter in format_rx_id(key).lower():
+            return True
+        name = source.value(source_row, RX_COL_1_name)
+        return bool(name) and rx_filter in name.lower()
+
+    # --- Mapping ---
+
+    def _sorted_rows(self, rows):
+        if self._sort_column < 0:
+            return sorted(
+                rows, reverse=self._sort_order == Qt.SortOrder.DescendingOrder
+            )
+        value = self.sourceModel().value
+        column = self._sort_column
+        return sorted(
+            rows,
+            key=lambda row: _sort_key(value(row, column)),
+            reverse=self._sort_order == Qt.SortOrder.DescendingOrder,
+        )
+
+    def _rebuild(self):
+        source = self.sourceModel()
+        rows = [row for row in range(source.rowCount()) if self._accepts(row)]
+        self._proxy_to_source = self._sorted_rows(rows)
+        self._update_reverse_map()
+
+    def _update_reverse_map(self):
+        reverse = [-1] * self.sourceModel().rowCount()
+        for proxy_row, source_row in enumerate(self._proxy_to_source):
+            reverse[source_row] = proxy_row
+        self._source_to_proxy = reverse
+
+    def _resort(self):
+        self._resort_pending = False
+        new_order = self._sorted_rows(self._proxy_to_source)
+        if new_order == self._proxy_to_source:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_source_rows = self._proxy_to_source
+        self._proxy_to_source = new_order
+        self._update_reverse_map()
+
+        # Sposta gli indici persistenti (selezione) sulle nuove righe
+        old_indexes = self.persistentIndexList()
+        new_indexes = [
+            self.createIndex(
+                self._source_to_proxy[old_source_rows[index.row()]], index.column()
+            )
+            for index in old_indexes
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    # --- Segnali del modello sorgente ---
+
+    def _on_source_reset(self):
+        self._rebuild()
+        self.endResetModel()
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        # Le righe sorgente vengono solo aggiunte in fondo: quelle accettate dal
+        # filtro vanno in coda al proxy, con un solo beginInsertRows
+        self._source_to_proxy.extend([-1] * (last - first + 1))
+        accepted = [row for row in range(first, last + 1) if self._accepts(row)]
+        if not accepted:
+            return
+        start = len(self._proxy_to_source)
+        self.beginInsertRows(QModelIndex(), start, start + len(accepted) - 1)
+        self._proxy_to_source.extend(accepted)
+        for proxy_row, source_row in enumerate(accepted, start):
+            self._source_to_proxy[source_row] = proxy_row
+        self.endInsertRows()
+        if self._sort_column >= 0:
+            self._schedule_resort()
+
+    def _on_source_rows_removing(self, parent, first, last):
+        proxy_rows = sorted(
+            (
+                self._source_to_proxy[row]
+                for row in range(first, last + 1)
+                if self._source_to_proxy[row] >= 0
+            ),
+            reverse=True,
+        )
+        # Rimuove blocchi di righe proxy contigue, dal fondo; entrambe le mappe
+        # restano coerenti dentro ogni coppia begin/endRemoveRows
+        i = 0
+        while i < len(proxy_rows):
+            end = start = proxy_rows[i]
+            i += 1
+            while i < len(proxy_rows) and proxy_rows[i] == start - 1:
+                start = proxy_rows[i]
+                i += 1
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._proxy_to_source[start : end + 1]
+            self._update_reverse_map()
+            self.endRemoveRows()
+
+    def _on_source_rows_removed(self, parent, first, last):
+        # Le righe sorgente dopo il blocco rimosso scalano di posizione
+        removed = last - first + 1
+        self._proxy_to_source = [
+            row - removed if row > last else row for row in self._proxy_to_source
+        ]
+        self._update_reverse_map()
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        first_col = top_left.column()
+        last_col = bottom_right.column()
+        rows = range(top_left.row(), bottom_right.row() + 1)
+        if self._filter is not None and first_col <= RX_COL_1_name <= last_col:
+            # Il nome DBC può cambiare l'esito del filtro
+            for source_row in rows:
+                proxy_row = self._source_to_proxy[source_row]
+                if (proxy_row >= 0) != self._accepts(source_row):
+                    self._toggle_row(source_row, proxy_row)
+
+        # Un solo segnale per il blocco: la vista ridisegna solo le celle visibili
+        reverse = self._source_to_proxy
+        proxy_rows = [reverse[row] for row in rows if reverse[row] >= 0]
+        if proxy_rows:
+            self.dataChanged.emit(
+                self.createIndex(min(proxy_rows), first_col),
+                self.createIndex(max(proxy_rows), last_col),
+                roles,
+            )
+        if first_col <= self._sort_column <= last_col:
+            self._schedule_resort()
+
+    def _toggle_row(self, source_row, proxy_row):
+        if proxy_row >= 0:
+            self.beginRemoveRows(QModelIndex(), proxy_row, proxy_row)
+            del self._proxy_to_source[proxy_row]
+            self._update_reverse_map()
+            self.endRemoveRows()
+        else:
+            proxy_row = len(self._proxy_to_source)
+            self.beginInsertRows(QModelIndex(), proxy_row, proxy_row)
+            self._proxy_to_source.append(source_row)
+            self._source_to_proxy[source_row] = proxy_row
+            self.endInsertRows()
+            self._schedule_resort()
+
+    def _schedule_resort(self):
+        # Un solo riordino per tick di refresh, anche con molti dataChanged
+        if not self._resort_pending:
+            self._resort_pending = True
+            QTimer.singleShot(0, self._resort)
@@ -0,0 +1,260 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+
+from src.rx_statistics import RxStatsEngine
+
+RX_TIMEOUT_FACTOR = 3.0  # deadline = ultimo frame + N x periodo atteso (0 = spento)
+RX_TIMEOUT_MIN_S = 0.05  # deadline minima: copre la latenza di driver e ring RX
+RX_TIMEOUT_LEARN_S = 1.0  # ricontrollo degli ID di cui non si conosce ancora il periodo
+RX_TIMEOUT_MAX_EVENTS = 1000  # eventi conservati nella lista
+
+# Ruota a 256 bucket da 10 ms (2.56 s per giro); le deadline più lontane
+# restano nel loro bucket per i giri successivi
+RX_TIMEOUT_TICK_S = 0.01
+RX_TIMEOUT_WHEEL_SLOTS = 256
+
+
+class RxTimeoutEvent(NamedTuple):
+    """A missing or recovered RX ID."""
+
+    time: float  # istante dell'evento (base dei timestamp dei frame)
+    key: int  # chiave dell'ID (vedi rx_statistics.rx_key())
+    missing: bool  # True: deadline scaduta, False: l'ID è tornato
+    period_ms: float  # periodo atteso
+    silence_ms: float  # tempo dall'ultimo frame (per il ritorno: durata del buco)
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel of ID deadlines.
+
+    A deadline falls in bucket (deadline // tick) % slots together with its
+    absolute tick number; entries whose tick lies in a later round simply
+    stay in the bucket. Buckets hold NumPy arrays of keys, so advancing the
+    wheel costs a few array operations per elapsed tick, whatever the number
+    of scheduled IDs.
+    """
+
+    def __init__(
+        self, tick: float = RX_TIMEOUT_TICK_S, slots: int = RX_TIMEOUT_WHEEL_SLOTS
+    ):
+        self.tick = tick
+        self.slots = slots
+        self._buckets = [[] for _ in range(slots)]  # liste di (tick, chiavi)
+        self._current = None  # ultimo tick elaborato
+
+    def __len__(self):
+        return sum(len(keys) for bucket in self._buckets for _, keys in bucket)
+
+    def clear(self):
+        for bucket in self._buckets:
+            bucket.clear()
+        self._current = None
+
+    def schedule(self, keys: np.ndarray, deadlines: np.ndarray):
+        if not len(keys):
+            return
+        ticks = (deadlines / self.tick).astype(np.int64)
+        if self._current is None:
+            self._current = int(ticks.min()) - 1
+        ticks = np.maximum(ticks, self._current + 1)
+        # Un'append per bucket, non per ID
+        order = np.argsort(ticks % self.slots, kind="stable")
+        ticks = ticks[order]
+        keys = keys[order]
+        buckets = ticks % self.slots
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            self._buckets[int(buckets[start])].append(
+                (ticks[start:end], keys[start:end])
+            )
+
+    def remove(self, keys: np.ndarray):
+        """Drops every scheduled deadline of the given keys."""
+        for bucket in self._buckets:
+            for i, (ticks, bucket_keys) in enumerate(bucket):
+                keep = ~np.isin(bucket_keys, keys)
+                if not keep.all():
+                    bucket[i] = (ticks[keep], bucket_keys[keep])
+
+    def advance(self, now: float) -> np.ndarray:
+        """Moves the wheel to `now` and returns the keys whose deadline passed."""
+        target = int(now / self.tick)
+        if self._current is None:
+            self._current = target - 1
+        elapsed = min(target - self._current, self.slots)
+        due = []
+        for tick in range(target - elapsed + 1, target + 1):
+            bucket = self._buckets[tick % self.slots]
+            if not bucket:
+                continue
+            ticks = np.concatenate([t for t, _ in bucket])
+            keys = np.concatenate([k for _, k in bucket])
+            expired = ticks <= target
+            bucket.clear()
+            if not expired.all():
+                bucket.append((ticks[~expired], keys[~expired]))
+            due.append(keys[expired])
+        self._current = max(self._current, target)
+        return np.concatenate(due) if due else np.empty(0, dtype=np.uint32)
+
+
+class RxTimeoutMonitor:
+    """
+    Missing-frame detection for the RX IDs.
+
+    Every ID gets a deadline of factor x expected period after its last frame
+    (the DBC cycle_time, else the learned period EMA of the stats engine),
+    kept in a TimerWheel. The deadlines are re-armed lazily: frames only
+    update the engine, and when a bucket expires its IDs are checked against
+    their last frame in one vectorized step, the ones received in the
+    meantime going back into the wheel at their new deadline. IDs past their
+    deadline become missing until their next frame; both transitions are
+    recorded in `events`.
+    """
+
+    def __init__(self, stats: RxStatsEngine, factor: float = RX_TIMEOUT_FACTOR):
+        self.stats = stats
+        self.factor = factor
+        self.wheel = TimerWheel()
+        self.missing = {}  # chiave -> (ultimo frame prima del buco, periodo atteso)
+        self.events = deque(maxlen=RX_TIMEOUT_MAX_EVENTS)
+        self.timeout_count = 0  # deadline scadute in totale
+
+    def clear(self):
+        self.wheel.clear()
+        self.missing.clear()
+        self.events.clear()
+        self.timeout_count = 0
+
+    def forget(self, keys):
+        """Stops monitoring the given keys (removed from the RX store)."""
+        keys = np.asarray(keys, dtype=np.uint32)
+        self.wheel.remove(keys)
+        for key in keys.tolist():
+            self.missing.pop(key, None)
+
+    def release_missing(self, now: float) -> list:
+        """
+        Clears the missing IDs (detection turned off) and puts them back in
+        the wheel; returns their keys.
+        """
+        keys = list(self.missing)
+        self.missing.clear()
+        self.arm(keys, now)
+        return keys
+
+    def arm(self, keys, now: float):
+        """Starts monitoring new IDs; their period is checked at the first tick."""
+        if keys:
+            keys = np.asarray(keys, dtype=np.uint32)
+            self.wheel.schedule(keys, np.full(len(keys), now + RX_TIMEOUT_MIN_S))
+
+    def frames_received(self, timestamps: np.ndarray, slots: np.ndarray) -> list:
+        """
+        Checks a batch applied to the stats engine for missing IDs that are
+        back; returns their recovery events.
+        """
+        if not self.missing:
+            return []
+        stats = self.stats
+        keys = np.fromiter(self.missing, dtype=np.uint32, count=len(self.missing))
+        missing_slots = stats.lookup(keys)
+        for key in keys[missing_slots < 0].tolist():
+            del self.missing[key]  # ID rimosso dall'archivio RX
+        known = missing_slots >= 0
+        keys = keys[known]
+        missing_slots = missing_slots[known]
+        if not len(keys):
+            return []
+
+        # Tornati: l'ultimo frame non è più quello di prima del buco
+        before = np.array([self.missing[key][0] for key in keys.tolist()])
+        back = stats.last_time[missing_slots] != before
+        if not back.any():
+            return []
+        keys = keys[back]
+        back_slots = missing_slots[back]
+
+        # Istante del primo frame del blocco per ogni ID tornato
+        batch_slots, first = np.unique(slots, return_index=True)
+        pos = np.minimum(np.searchsorted(batch_slots, back_slots), len(batch_slots) - 1)
+        in_batch = batch_slots[pos] == back_slots
+        back_time = np.where(
+            in_batch, timestamps[first[pos]], stats.last_time[back_slots]
+        )
+
+        recovered = []
+        for key, t in zip(keys.tolist(), back_time.tolist()):
+            last_time, period = self.missing.pop(key)
+            recovered.append(
+                RxTimeoutEvent(t, key, False, period, (t - last_time) * 1000.0)
+            )
+        self.events.extend(recovered)
+        # La deadline vera viene calcolata al primo tick
+        self.wheel.schedule(keys, stats.last_time[back_slots] + RX_TIMEOUT_MIN_S)
+        return recovered
+
+    def tick(self, now: float) -> list:
+        """Advances the wheel to `now`; returns the events of the IDs gone missing."""
+        keys = self.wheel.advance(now)
+        if not len(keys):
+            return []
+        if self.factor <= 0:  # rilevamento spento: gli ID restano nella ruota
+            self.wheel.schedule(keys, np.full(len(keys), now + RX_TIMEOUT_LEARN_S))
+            return []
+        keys = np.unique(keys)
+        slots = self.stats.lookup(keys)
+        known = slots >= 0  # gli ID rimossi dall'archivio escono dalla ruota
+        keys = keys[known]
+        slots = slots[known]
+
+        period = self.stats.expected_period(slots)
+        last_time = self.stats.last_time[slots]
+        deadline = last_time + np.maximum(
+            self.factor * period / 1000.0, RX_TIMEOUT_MIN_S
+        )
+        unknown = np.isnan(period)
+        late = ~unknown & (deadline <= now)
+
+        # Ancora in tempo: di nuovo nella ruota alla nuova deadline
+        waiting = ~late
+        self.wheel.schedule(
+            keys[waiting],
+            np.where(unknown, now + RX_TIMEOUT_LEARN_S, deadline)[waiting],
+        )
+
+        events = [
+            RxTimeoutEvent(now, key, True, p, (now - t) * 1000.0)
+            for key, p, t in zip(
+                keys[late].tolist(), period[late].tolist(), last_time[late].tolist()
+            )
+        ]
+        for event, t in zip(events, last_time[late].tolist()):
+            self.missing[event.key] = (t, event.period_ms)
+        self.timeout_count += len(events)
+        self.events.extend(events)
+        return events
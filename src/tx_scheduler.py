@@ -0,0 +1,346 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+import heapq
+import math
+import sys
+import threading
+from array import array
+from time import perf_counter, sleep
+from typing import Callable, Optional
+
+from src.exceptions_logger import log_exception
+
+# Gli ID con deadline entro questa finestra vengono inviati nello stesso giro
+TX_BATCH_WINDOW_S = 0.0002
+# Gli ID ad alta risoluzione non vengono anticipati più di così
+TX_HIRES_BATCH_WINDOW_S = 0.00002
+
+# Modalità ad alta risoluzione: il thread dorme fino a poco prima della deadline
+# e poi fa spin. Il margine di spin copre il ritardo misurato del risveglio
+# (TX_SLEEP_OVERSHOOT_MARGIN volte), senza superare TX_SPIN_THRESHOLD_S né
+# TX_SPIN_PERIOD_FRACTION del periodo. Lo spin non può occupare più di
+# TX_SPIN_MAX_DUTY del tempo in ogni finestra di TX_SPIN_DUTY_WINDOW_S, oltre si
+# torna a dormire.
+TX_SPIN_THRESHOLD_S = 0.002
+TX_SPIN_PERIOD_FRACTION = 0.25
+TX_SLEEP_OVERSHOOT_MARGIN = 1.5
+TX_SLEEP_OVERSHOOT_INITIAL_S = 0.0005  # stima prima della prima misura
+TX_SLEEP_OVERSHOOT_DECAY = 0.99  # per risveglio: il picco misurato decade piano
+TX_SPIN_MAX_DUTY = 0.5
+TX_SPIN_DUTY_WINDOW_S = 1.0
+# Istanti di invio memorizzati per ID per misurare periodo e jitter reali
+TX_TIMING_SAMPLES = 256
+
+
+class TxTimingStats:
+    """
+    Fixed-size ring of the actual send instants of one TX job, used to report
+    the achieved period, the jitter and the missed deadlines.
+    """
+
+    def __init__(self, size: int = TX_TIMING_SAMPLES):
+        self._size = size
+        self._times = array("d", bytes(8 * size))
+        self._count = 0  # invii registrati in totale
+        self._lock = threading.Lock()
+        self.missed_deadlines = 0  # periodi saltati perché il thread era in ritardo
+        self.spin_throttled = 0  # attese in sleep per il budget CPU dello spin
+
+    def record(self, timestamp: float):
+        with self._lock:
+            self._times[self._count % self._size] = timestamp
+            self._count += 1
+
+    def add_missed(self, count: int):
+        with self._lock:
+            self.missed_deadlines += count
+
+    def add_throttled(self):
+        with self._lock:
+            self.spin_throttled += 1
+
+    def reset(self):
+        with self._lock:
+            self._count = 0
+            self.missed_deadlines = 0
+            self.spin_throttled = 0
+
+    def summary(self, nominal_period: float) -> Optional[dict]:
+        """
+        Returns the achieved timing over the last samples (values in ms), or
+        None if fewer than two frames were sent.
+        """
+        with self._lock:
+            count = self._count
+            missed = self.missed_deadlines
+            throttled = self.spin_throttled
+            if count < 2:
+                return None
+            if count <= self._size:
+                times = self._times[:count].tolist()
+            else:
+                start = count % self._size
+                times = self._times[start:].tolist() + self._times[:start].tolist()
+
+        periods = [b - a for a, b in zip(times, times[1:])]
+        n = len(periods)
+        mean = sum(periods) / n
+        std = math.sqrt(sum((p - mean) ** 2 for p in periods) / n)
+        deviations = sorted(abs(p - nominal_period) for p in periods)
+        p99 = deviations[min(n - 1, math.ceil(0.99 * n) - 1)]
+        return {
+            "samples": n,
+            "mean_ms": mean * 1000.0,
+            "std_ms": std * 1000.0,
+            "p99_jitter_ms": p99 * 1000.0,
+            "max_jitter_ms": deviations[-1] * 1000.0,
+            "missed": missed,
+            "throttled": throttled,
+        }
+
+
+class TxJob:
+    """
+    A periodic TX frame handled by the scheduler thread.
+
+    build_payload() runs on the scheduler thread and must not touch Qt widgets:
+    the GUI pushes its inputs (manual payload, slider values) into the job and
+    reads back last_payload to refresh the TX table.
+    """
+
+    def __init__(
+        self,
+        frame_id: int,
+        period_ms: float,
+        dlc: int,
+        is_fd: bool,
+        build_payload: Callable[["TxJob"], bytes],
+        high_resolution: bool = False,
+    ):
+        self.frame_id = frame_id
+        self.period = period_ms / 1000.0  # secondi
+        self.dlc = dlc
+        self.is_fd = is_fd
+        self.build_payload = build_payload
+        self.high_resolution = high_resolution  # sleep + spin per periodi sub-ms
+
+        self.manual_payload = bytes(dlc)  # payload inserito nella tabella TX
+        self.slider_values = {}  # nome segnale -> valore reale dello slider
+        self.last_payload: Optional[bytes] = None  # ultimo payload inviato
+        self.message = None  # can.Message di prepare_frame(), per send_prepared()
+        self.busload_bits = (0, 0)  # bit (arbitration, data) per frame
+        self.timing = TxTimingStats()  # periodo e jitter misurati
+
+        self.deadline = 0.0  # prossima deadline assoluta (perf_counter)
+        self._generation = 0  # invalida le entry obsolete nello heap
+
+
+class TxScheduler:
+    """
+    Dedicated TX thread: a min-heap of absolute deadlines on perf_counter.
+    Each job is rescheduled at deadline + period (no drift), and all jobs due
+    in the same tick are sent together.
+
+    Jobs flagged high_resolution are not left to the OS timer: the thread sleeps
+    until the measured wake-up overshoot before their deadline (bounded by
+    TX_SPIN_THRESHOLD_S and a fraction of the period) and then spins, within the
+    TX_SPIN_MAX_DUTY budget.
+    """
+
+    def __init__(self, send: Callable[[TxJob, bytes], None]):
+        self._send = send
+        self._jobs: dict[int, TxJob] = {}
+        self._heap: list[tuple[float, int, int, TxJob]] = []
+        self._seq = 0  # tie-breaker dello heap
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._spin_window_start = 0.0
+        self._spin_time = 0.0  # tempo di spin nella finestra corrente
+        self.spin_throttled_count = 0  # attese declassate a sleep per il budget CPU
+        self._sleep_overshoot = TX_SLEEP_OVERSHOOT_INITIAL_S  # ritardo del risveglio
+
+    @property
+    def jobs(self) -> dict[int, TxJob]:
+        return self._jobs
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def add_job(self, job: TxJob, first_deadline: Optional[float] = None):
+        with self._cond:
+            old = self._jobs.get(job.frame_id)
+            if old is not None:
+                old._generation += 1
+            self._jobs[job.frame_id] = job
+            job.deadline = (
+                first_deadline if first_deadline is not None else perf_counter()
+            )
+            self._push(job)
+            self._cond.notify()
+
+    def remove_job(self, frame_id: int):
+        with self._cond:
+            job = self._jobs.pop(frame_id, None)
+            if job is not None:
+                job._generation += 1  # la entry nello heap verrà scartata
+
+    def set_period(self, frame_id: int, period_ms: float) -> bool:
+        """Changes the period of a running job; the next deadline follows it."""
+        with self._cond:
+            job = self._jobs.get(frame_id)
+            if job is None:
+                return False
+            last_sent = job.deadline - job.period
+            job.period = period_ms / 1000.0
+            job._generation += 1
+            job.deadline = max(last_sent + job.period, perf_counter())
+            job.timing.reset()  # le statistiche si riferiscono al nuovo periodo
+            self._push(job)
+            self._cond.notify()
+            return True
+
+    def get_job(self, frame_id: int) -> Optional[TxJob]:
+        return self._jobs.get(frame_id)
+
+    def _push(self, job: TxJob):
+        self._seq += 1
+        heapq.heappush(self._heap, (job.deadline, self._seq, job._generation, job))
+
+    def _spin_allowed(self, now: float, job: TxJob) -> bool:
+        if now - self._spin_window_start >= TX_SPIN_DUTY_WINDOW_S:
+            self._spin_window_start = now
+            self._spin_time = 0.0
+        if self._spin_time < TX_SPIN_MAX_DUTY * TX_SPIN_DUTY_WINDOW_S:
+            return True
+        self.spin_throttled_count += 1
+        job.timing.add_throttled()
+        return False
+
+    def _spin_threshold(self, job: TxJob) -> float:
+        # Spin solo sulla parte in cui lo sleep del sistema è impreciso
+        return min(
+            TX_SPIN_THRESHOLD_S,
+            TX_SPIN_PERIOD_FRACTION * job.period,
+            TX_SLEEP_OVERSHOOT_MARGIN * self._sleep_overshoot,
+        )
+
+    def _sleep_before_spin(self, wake: float):
+        # Attesa prima dello spin; se scade per timeout misura il ritardo del risveglio
+        if self._cond.wait(wake - perf_counter()):
+            return  # risvegliato da notify: nessuna misura
+        late = max(0.0, perf_counter() - wake)
+        self._sleep_overshoot = max(
+            late, self._sleep_overshoot * TX_SLEEP_OVERSHOOT_DECAY
+        )
+
+    def _spin_until(self, deadline: float):
+        # Fuori dal lock; sleep(0) cede il GIL al thread della GUI ad ogni giro
+        start = perf_counter()
+        now = start
+        while now < deadline and self._running:
+            sleep(0)
+            now = perf_counter()
+        self._spin_time += now - start
+
+    def _run(self):
+        heap = self._heap
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                # Scarta in testa le entry obsolete (periodo cambiato o job rimosso)
+                while heap and heap[0][2] != heap[0][3]._generation:
+                    heapq.heappop(heap)
+                if not heap:
+                    self._cond.wait()
+                    continue
+                now = perf_counter()
+                wait = heap[0][0] - now
+                if wait > 0:
+                    job = heap[0][3]
+                    if not job.high_resolution or not self._spin_allowed(now, job):
+                        self._cond.wait(wait)
+                        continue
+                    threshold = self._spin_threshold(job)
+                    if wait > threshold:
+                        self._sleep_before_spin(heap[0][0] - threshold)
+                        continue
+                    spin_deadline = heap[0][0]
+                    due = None
+                else:
+                    due = self._pop_due(now)
+
+            if due is None:
+                self._spin_until(spin_deadline)
+                continue
+
+            # Invio fuori dal lock: la GUI può aggiornare periodi e job nel frattempo
+            for job in due:
+                try:
+                    payload = job.build_payload(job)
+                    self._send(job, payload)
+                    job.timing.record(perf_counter())
+                    job.last_payload = payload
+                except Exception as e:
+                    print(f"[Error TX ID {job.frame_id:03X}]: {e}")
+                    log_exception(__file__, sys._getframe().f_lineno, e)
+
+    def _pop_due(self, now: float) -> list:
+        # Estrae tutti gli ID scaduti (o in scadenza) nello stesso giro
+        heap = self._heap
+        due = []
+        limit = now + TX_BATCH_WINDOW_S
+        hires_limit = now + TX_HIRES_BATCH_WINDOW_S
+        while heap:
+            deadline, _, generation, job = heap[0]
+            if deadline > (hires_limit if job.high_resolution else limit):
+                break
+            heapq.heappop(heap)
+            if generation != job._generation:
+                continue  # entry obsoleta (periodo cambiato o job rimosso)
+            due.append(job)
+
+        # Riprogramma senza deriva: deadline + k * periodo, saltando i
+        # periodi già persi se il thread è rimasto indietro
+        for job in due:
+            next_deadline = job.deadline + job.period
+            if next_deadline <= now:
+                missed = int((now - job.deadline) / job.period)
+                next_deadline = job.deadline + (missed + 1) * job.period
+                job.timing.add_missed(missed)
+            job.deadline = next_deadline
+            self._push(job)
+        return due
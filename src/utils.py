@@ -1,5 +1,9 @@
 import sys
 import os
+import time
+
+# Offset tra clock monotono ed epoca, fissato una sola volta (immune agli step NTP)
+_MONOTONIC_EPOCH_OFFSET = time.time() - time.monotonic()
 
 
 def resource_path(relative_path):
@@ -10,3 +14,8 @@ def resource_path(relative_path):
         base_path = os.path.dirname(os.path.abspath(__file__))
 
     return os.path.join(base_path, relative_path)
+
+
+def bus_time():
+    """Tempo monotono espresso sulla stessa base (epoca) dei timestamp dei frame."""
+    return time.monotonic() + _MONOTONIC_EPOCH_OFFSET
@@ -0,0 +1,119 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+TX send path benchmark: sends/s of a fresh validated can.Message per frame
+(previous send_frame behaviour) against send_frame(), which looks the
+prepared message up on every call, and send_prepared() with a message held
+by the caller, the path of the TX scheduler jobs.
+
+Usage (from the repo root):
+    python tools/bench_tx.py --frames 200000 --backend virtual
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import can  # noqa: E402
+
+from src.can_interface import CANInterface, VIRTUAL_CHANNEL_PREFIX  # noqa: E402
+
+
+class _NullBus(can.BusABC):
+    """Bus that discards frames: isolates the cost of the Python send path."""
+
+    def __init__(self, channel="null", **kwargs):
+        super().__init__(channel=channel, **kwargs)
+
+    def send(self, msg, timeout=None):
+        pass
+
+    def _recv_internal(self, timeout):
+        time.sleep(timeout or 0)
+        return None, False
+
+
+def legacy_send(bus, frame_id, data, dlc, is_fd):
+    if len(data) < dlc:
+        data = data + bytes([0x00] * (dlc - len(data)))
+    elif len(data) > dlc:
+        data = data[:dlc]
+    msg = can.Message(
+        arbitration_id=frame_id,
+        data=data,
+        is_extended_id=False,
+        dlc=dlc,
+        is_fd=is_fd,
+        bitrate_switch=is_fd,
+        check=True,
+    )
+    bus.send(msg)
+
+
+def run(label, frames, send):
+    start = time.perf_counter()
+    for i in range(frames):
+        send(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {frames / elapsed:>12,.0f} sends/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--ids", type=int, default=150)
+    parser.add_argument("--backend", choices=["null", "virtual"], default="null")
+    args = parser.parse_args()
+
+    can_if = CANInterface(f"{VIRTUAL_CHANNEL_PREFIX}0", None, backend="virtual")
+    if args.backend == "null":
+        can_if.close()  # ferma il receive loop, il bus nullo non riceve nulla
+        can_if.bus = _NullBus()
+    bus = can_if.bus
+    payloads = [bytes([i & 0xFF] * 8) for i in range(args.ids)]
+    ids = [0x100 + i for i in range(args.ids)]
+    n = args.ids
+
+    print(f"backend: {args.backend}, {args.ids} IDs, {args.frames} frames")
+    run(
+        "new Message per frame",
+        args.frames,
+        lambda i: legacy_send(bus, ids[i % n], payloads[i % n], 8, False),
+    )
+    run(
+        "send_frame (cache lookup)",
+        args.frames,
+        lambda i: can_if.send_frame(ids[i % n], payloads[i % n], 8, False),
+    )
+    prepared = [can_if.prepare_frame(fid, 8) for fid in ids]
+    run(
+        "send_prepared (TX jobs)",
+        args.frames,
+        lambda i: can_if.send_prepared(prepared[i % n], payloads[i % n]),
+    )
+    can_if.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+Prints the frames of a CANino capture (.rxcap) around a given time.
+
+Usage (from the repo root):
+    python tools/rx_capture_dump.py capture.rxcap --at 1700000123.5 --count 20
+
+--at is a frame timestamp (same base as the capture); with --offset it is
+seconds from the first frame instead. Without --at the summary is printed.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.rx_capture import CaptureReader  # noqa: E402
+from src.rx_logger import frame_flags_text  # noqa: E402
+from src.rx_ring_buffer import FRAME_FLAG_EXTENDED  # noqa: E402
+from src.rx_statistics import format_rx_id, rx_key  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help=".rxcap file")
+    parser.add_argument("--at", type=float, help="time of the first frame shown")
+    parser.add_argument("--offset", action="store_true", help="--at from the start")
+    parser.add_argument("--count", type=int, default=20, help="frames to print")
+    args = parser.parse_args()
+
+    with CaptureReader(args.path) as capture:
+        records = capture.records
+        if not len(records):
+            print("empty capture")
+            return
+        first = float(capture.timestamps[0])
+        last = float(capture.timestamps[-1])
+        print(
+            f"{len(records)} frames, {first:.6f} .. {last:.6f} "
+            f"({last - first:.3f} s), index every {capture.stride} frames"
+        )
+        if args.at is None:
+            return
+
+        at = first + args.at if args.offset else args.at
+        start = time.perf_counter()
+        pos = capture.seek(at)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        print(f"seek to {at:.6f}: frame {pos} in {elapsed_us:.0f} us")
+        for record in records[pos : pos + args.count]:
+            flags = int(record["flags"])
+            key = rx_key(int(record["id"]), bool(flags & FRAME_FLAG_EXTENDED))
+            dlc = int(record["dlc"])
+            print(
+                f"{record['timestamp']:.6f}  {format_rx_id(key):>10}  "
+                f"{frame_flags_text(flags):<3} {dlc:2d}  "
+                f"{record['data'][:dlc].tobytes().hex(' ').upper()}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+TX timing accuracy report: achieved period, jitter and missed deadlines of
+the TX scheduler, standard timing against high-resolution (sleep + spin).
+
+Usage (from the repo root):
+    python tools/tx_timing_report.py --periods 0.2 0.5 1 10 --duration 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.can_interface import CANInterface, VIRTUAL_CHANNEL_PREFIX  # noqa: E402
+from src.tx_scheduler import TxJob, TxScheduler, TX_TIMING_SAMPLES  # noqa: E402
+
+
+def measure(can_if, period_ms, high_resolution, duration):
+    payload = bytes(8)
+    message = can_if.prepare_frame(0x100, 8)
+    scheduler = TxScheduler(lambda job, data: can_if.send_prepared(message, data))
+    job = TxJob(0x100, period_ms, 8, False, lambda job: payload, high_resolution)
+    scheduler.add_job(job)
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    scheduler.start()
+    time.sleep(duration)
+    scheduler.stop()
+    cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+    return job.timing.summary(job.period), cpu, scheduler.spin_throttled_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--periods", type=float, nargs="+", default=[0.2, 0.5, 1.0, 10.0]
+    )
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per run")
+    args = parser.parse_args()
+
+    can_if = CANInterface(f"{VIRTUAL_CHANNEL_PREFIX}0", None, backend="virtual")
+    print(
+        f"last {TX_TIMING_SAMPLES} sends per run, {args.duration:.1f} s per run, "
+        "times in ms"
+    )
+    print(
+        f"{'period':>8} {'mode':<6} {'mean':>8} {'std':>8} {'p99 jit':>8} "
+        f"{'max jit':>8} {'missed':>7} {'cpu':>6} {'throttled':>9}"
+    )
+    for period_ms in args.periods:
+        for high_resolution in (False, True):
+            stats, cpu, throttled = measure(
+                can_if, period_ms, high_resolution, args.duration
+            )
+            mode = "hires" if high_resolution else "std"
+            if stats is None:
+                print(f"{period_ms:>8.3f} {mode:<6} no samples")
+                continue
+            print(
+                f"{period_ms:>8.3f} {mode:<6} {stats['mean_ms']:>8.3f} "
+                f"{stats['std_ms']:>8.3f} {stats['p99_jitter_ms']:>8.3f} "
+                f"{stats['max_jitter_ms']:>8.3f} {stats['missed']:>7} "
+                f"{cpu:>6.0%} {throttled:>9}"
+            )
+    can_if.close()
+
+
+if __name__ == "__main__":
+    main()
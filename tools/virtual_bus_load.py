@@ -0,0 +1,115 @@
+# -----------------------------------------------------------------------------
+#  Project: CANinoApp
+#  Author: Nicasio Canino <nicasio.canino@phd.unipi.it>
+#  Organization: Department of Information Engineering (DII), University of Pisa
+#  Collaborators: Sergio Saponara <sergio.saponara@unipi.it>, Daniele Rossi <daniele.rossi1@unipi.it>
+#  Copyright 2025 Nicasio Canino
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""
+Synthetic traffic generator for the in-process virtual backend.
+
+Usage (from the repo root):
+    python tools/virtual_bus_load.py --rate 8000 --ids 150 --duration 10
+
+Without --rx the generated frames are only sent; with --rx the RX pipeline
+(CANInterface + ReceivedFramesWindow ring) is attached to the same virtual
+channel and the received/dropped counters are printed at the end.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import can  # noqa: E402
+
+from src.can_interface import CANInterface, VIRTUAL_CHANNEL_PREFIX  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--channel", type=int, default=0, help="virtual channel index")
+    parser.add_argument("--rate", type=float, default=8000, help="frames per second")
+    parser.add_argument("--ids", type=int, default=150, help="number of distinct IDs")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--fd", action="store_true", help="send 64 byte CAN-FD frames")
+    parser.add_argument("--rx", action="store_true", help="attach the RX pipeline")
+    args = parser.parse_args()
+
+    channel = f"{VIRTUAL_CHANNEL_PREFIX}{args.channel}"
+
+    rx_if = rx_window = app = None
+    if args.rx:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        from src.received_frames_class import ReceivedFramesWindow
+
+        app = QApplication.instance() or QApplication(sys.argv)
+        rx_window = ReceivedFramesWindow()
+        rx_if = CANInterface(channel, timing=None, backend="virtual")
+        rx_if.set_receive_batch_callback(rx_window.update_frames)
+
+    size = 64 if args.fd else 8
+    messages = [
+        can.Message(
+            arbitration_id=0x100 + i,
+            data=bytes([i & 0xFF] * size),
+            is_extended_id=False,
+            is_fd=args.fd,
+        )
+        for i in range(args.ids)
+    ]
+
+    bus = can.Bus(channel=channel, interface="virtual", receive_own_messages=False)
+    interval = 1.0 / args.rate
+    sent = 0
+    start = time.perf_counter()
+    next_due = start
+    end = start + args.duration
+    try:
+        while True:
+            now = time.perf_counter()
+            if now >= end:
+                break
+            # invia tutti i frame in ritardo rispetto alla cadenza richiesta
+            while next_due <= now:
+                bus.send(messages[sent % len(messages)])
+                sent += 1
+                next_due += interval
+            if app is not None:
+                app.processEvents()
+            time.sleep(min(0.001, max(0.0, next_due - time.perf_counter())))
+    finally:
+        elapsed = time.perf_counter() - start
+        bus.shutdown()
+
+    print(f"sent {sent} frames in {elapsed:.2f} s ({sent / elapsed:.0f} frames/s)")
+
+    if rx_window is not None:
+        time.sleep(0.2)
+        rx_window.refresh_table()
+        received = int(rx_window._rx_stats.count.sum())
+        print(
+            f"received {received} frames, ring overflow {rx_window._rx_ring.overflow_count}, "
+            f"peak ring fill {rx_window._rx_ring.high_watermark}"
+        )
+        rx_if.close()
+
+
+if __name__ == "__main__":
+    main()